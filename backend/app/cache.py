@@ -1,8 +1,11 @@
 """Cache wrapper with Redis and in-memory fallback."""
 
-import json
+import asyncio
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable, Hashable
+
+import orjson
+
 from app.config import settings
 
 # Try to import Redis, but don't fail if not available
@@ -13,14 +16,6 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 
-class DateTimeEncoder(json.JSONEncoder):
-    """JSON Encoder that handles datetime objects."""
-    def default(self, obj):
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        return super().default(obj)
-
-
 class InMemoryCache:
     """Simple in-memory cache with TTL for development."""
     
@@ -43,6 +38,12 @@ class InMemoryCache:
         expires_at = time.time() + ttl
         self._data[key] = (value, expires_at)
     
+    async def set_nx(self, key: str, value: Any, ttl: int) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+    
     async def delete(self, key: str) -> None:
         self._data.pop(key, None)
     
@@ -57,6 +58,55 @@ class InMemoryCache:
         return True
 
 
+class TTLMemo:
+    """Remember coroutine results per key for ``ttl`` seconds, in process.
+
+    Concurrent misses for one key share a single fill. A ``None`` result is
+    not remembered, so failures are retried on the next call. With
+    ``maxsize`` set, expired entries and then the oldest are dropped to
+    make room.
+    """
+
+    def __init__(self, ttl: float, maxsize: int | None = None):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._pending: dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_fill(
+        self, key: Hashable, fill: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._fill(key, fill))
+        # One caller going away must not cancel the fill the others await
+        return await asyncio.shield(pending)
+
+    async def _fill(self, key: Hashable, fill: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fill()
+        finally:
+            del self._pending[key]
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        if self._maxsize is not None and len(self._entries) >= self._maxsize:
+            self._entries = {k: v for k, v in self._entries.items() if now < v[0]}
+            while len(self._entries) >= self._maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + self._ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class Cache:
     """Cache wrapper with Redis primary and in-memory fallback."""
     
@@ -113,7 +163,7 @@ class Cache:
         value = await self._redis.get(self._make_key(key))
         if value is None:
             return None
-        return json.loads(value)
+        return orjson.loads(value)
     
     async def set(self, key: str, value: Any, ttl: int) -> None:
         """Set value in cache with TTL."""
@@ -124,9 +174,26 @@ class Cache:
             await self._fallback.set(self._make_key(key), value, ttl)
             return
         
-        serialized = json.dumps(value, cls=DateTimeEncoder)
+        # orjson encodes datetime/date/time natively, as the old encoder did
+        serialized = orjson.dumps(value)
         await self._redis.setex(self._make_key(key), ttl, serialized)
     
+    async def set_nx(self, key: str, value: Any, ttl: int) -> bool:
+        """Set value with TTL only if the key is absent.
+        
+        Returns:
+            True if this call set the key
+        """
+        if self._fallback is None and self._redis is None:
+            await self.connect()
+        
+        if self._use_fallback:
+            return await self._fallback.set_nx(self._make_key(key), value, ttl)
+        
+        return bool(
+            await self._redis.set(self._make_key(key), orjson.dumps(value), ex=ttl, nx=True)
+        )
+    
     async def delete(self, key: str) -> None:
         """Delete key from cache."""
         if self._fallback is None and self._redis is None:
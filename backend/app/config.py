@@ -56,7 +56,10 @@ class Settings(BaseSettings):
 
     # Alert system (bmkg-alert)
     db_path: str = Field(default="data/bmkg_alert.db", alias="DB_PATH")
+    sqlite_cache_kb: int = Field(default=20000, alias="SQLITE_CACHE_KB")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
     bmkg_api_url: str = Field(default="https://bmkg-restapi.vercel.app", alias="BMKG_API_URL")
+    max_concurrent_details: int = Field(default=8, alias="MAX_CONCURRENT_DETAILS")
     demo_mode: bool = Field(default=False, alias="DEMO_MODE")
 
     # Notifications
@@ -1,4 +1,5 @@
 
+import hashlib
 import secrets
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
@@ -6,21 +7,26 @@ from app.config import settings
 
 security = HTTPBasic()
 
+
+def secret_digest(value: bytes) -> bytes:
+    """Fixed-size digest of a secret, so comparisons don't depend on its length."""
+    return hashlib.blake2b(value, digest_size=32).digest()
+
+
+# Static for the process lifetime — hash once. Basic auth usernames cannot
+# contain ":", so "user:password" is an unambiguous single comparison that
+# doesn't reveal which field mismatched.
+_ADMIN_CREDENTIALS = secret_digest(
+    settings.admin_username.encode("utf8") + b":" + settings.admin_password.encode("utf8")
+)
+ADMIN_PASSWORD_DIGEST = secret_digest(settings.admin_password.encode("utf8"))
+
 def verify_admin(credentials: HTTPBasicCredentials = Depends(security)):
     """Verify admin credentials."""
-    current_username_bytes = credentials.username.encode("utf8")
-    correct_username_bytes = settings.admin_username.encode("utf8")
-    is_correct_username = secrets.compare_digest(
-        current_username_bytes, correct_username_bytes
-    )
-    
-    current_password_bytes = credentials.password.encode("utf8")
-    correct_password_bytes = settings.admin_password.encode("utf8")
-    is_correct_password = secrets.compare_digest(
-        current_password_bytes, correct_password_bytes
+    current_credentials = secret_digest(
+        credentials.username.encode("utf8") + b":" + credentials.password.encode("utf8")
     )
-    
-    if not (is_correct_username and is_correct_password):
+    if not secrets.compare_digest(current_credentials, _ADMIN_CREDENTIALS):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -2,90 +2,293 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import sqlite3
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import aiosqlite
+import orjson
 import structlog
 
+from app.config import settings
+
 logger = structlog.get_logger()
 
-_DB_INSTANCE: DatabaseManager | None = None
+
+def _convert_json(value: bytes) -> object:
+    """Decode a ``[json]``-tagged column; text that isn't JSON passes through."""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return value.decode()
+
+
+# Applied to result columns aliased ``"name [json]"`` (PARSE_COLNAMES)
+sqlite3.register_converter("json", _convert_json)
+
+# Prepared statements kept per connection, keyed on SQL text. Dynamic
+# statements (filtered listings, partial updates) vary their text, so the
+# stdlib default of 128 can evict the hot per-id lookups.
+_STATEMENT_CACHE_SIZE = 512
 
 
 class DatabaseManager:
-    """Manages async SQLite connection pool and schema initialization."""
+    """Manages a single-writer / multi-reader SQLite pool and schema initialization.
+
+    All writes go through one connection opened with ``BEGIN IMMEDIATE``
+    transactions so the write lock is taken up front (no SQLITE_BUSY on
+    lock promotion). Reads are served by a small pool of read-only
+    connections which, thanks to WAL, run concurrently with the writer.
+    """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, readers: int | None = None) -> None:
         self._db_path = db_path
-        self._connection: aiosqlite.Connection | None = None
+        self._reader_count = readers if readers is not None else (os.cpu_count() or 1)
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._tx_owner: asyncio.Task | None = None
+        # LIFO so a quiet server keeps reusing the reader with the warmest
+        # page cache instead of cycling through cold ones.
+        self._readers: asyncio.LifoQueue[aiosqlite.Connection] = asyncio.LifoQueue()
+        self._reader_conns: list[aiosqlite.Connection] = []
+        # Binary JSON storage (jsonb()) needs SQLite 3.45+
+        self.supports_jsonb = sqlite3.sqlite_version_info >= (3, 45, 0)
 
     async def connect(self) -> None:
-        """Open database connection and enable WAL mode."""
+        """Open the writer and reader connections and apply server-tuned PRAGMAs."""
         logger.info("database_connecting", path=self._db_path)
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._connection = await aiosqlite.connect(self._db_path)
-        self._connection.row_factory = aiosqlite.Row
-        await self._connection.execute("PRAGMA journal_mode=WAL")
-        await self._connection.execute("PRAGMA foreign_keys=ON")
-        logger.info("database_connected", path=self._db_path)
+        self._writer = await aiosqlite.connect(
+            self._db_path,
+            isolation_level="IMMEDIATE",
+            detect_types=sqlite3.PARSE_COLNAMES,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        self._writer.row_factory = aiosqlite.Row
+        await self._writer.execute("PRAGMA journal_mode=WAL")
+        await self._apply_pragmas(self._writer)
+        # NORMAL is durable across app crashes in WAL mode; only an OS crash
+        # can roll back the last few commits.
+        await self._writer.execute("PRAGMA synchronous=NORMAL")
+        await self._writer.execute("PRAGMA foreign_keys=ON")
+        # Default threshold, set explicitly; checkpoint() truncates on a timer
+        await self._writer.execute("PRAGMA wal_autocheckpoint=1000")
+        await self._writer.commit()
+
+        # In-memory databases are private to a connection — reads must
+        # go through the writer.
+        if self._db_path != ":memory:":
+            reader_uri = Path(self._db_path).resolve().as_uri() + "?mode=ro"
+            for _ in range(self._reader_count):
+                reader = await aiosqlite.connect(
+                    reader_uri,
+                    uri=True,
+                    detect_types=sqlite3.PARSE_COLNAMES,
+                    cached_statements=_STATEMENT_CACHE_SIZE,
+                )
+                reader.row_factory = aiosqlite.Row
+                await self._apply_pragmas(reader)
+                self._reader_conns.append(reader)
+                self._readers.put_nowait(reader)
+
+        logger.info(
+            "database_connected",
+            path=self._db_path,
+            readers=len(self._reader_conns),
+        )
+
+    @staticmethod
+    async def _apply_pragmas(conn: aiosqlite.Connection) -> None:
+        """Apply per-connection PRAGMAs shared by the writer and readers."""
+        await conn.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        # Negative value = size in KiB rather than pages
+        await conn.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_kb)}")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA mmap_size=268435456")
 
     async def init_schema(self) -> None:
         """Execute schema.sql to create tables if they don't exist."""
         schema_path = Path(__file__).parent / "schema.sql"
         schema_sql = schema_path.read_text(encoding="utf-8")
         conn = await self.get_connection()
-        await conn.executescript(schema_sql)
-        await conn.commit()
+        async with self._write_lock:
+            await conn.executescript(schema_sql)
+            await conn.commit()
         logger.info("database_schema_initialized")
 
     async def get_connection(self) -> aiosqlite.Connection:
-        """Return the active database connection."""
-        if self._connection is None:
+        """Return the writer connection."""
+        if self._writer is None:
             raise RuntimeError("Database not connected. Call connect() first.")
-        return self._connection
+        return self._writer
+
+    @asynccontextmanager
+    async def acquire_reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool.
+
+        Falls back to the writer when no reader pool is configured, or when
+        the caller is inside ``transaction()`` and must see its own writes.
+        """
+        if not self._reader_conns or self._in_transaction():
+            yield await self.get_connection()
+            return
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
 
     async def close(self) -> None:
-        """Close the database connection."""
-        if self._connection:
-            await self._connection.close()
-            self._connection = None
+        """Close all database connections."""
+        for reader in self._reader_conns:
+            await reader.close()
+        self._reader_conns.clear()
+        self._readers = asyncio.LifoQueue()
+        if self._writer:
+            # Persist planner statistics gathered during this run
+            await self._writer.execute("PRAGMA optimize")
+            await self._writer.close()
+            self._writer = None
             logger.info("database_closed")
 
+    def json_column(self, column: str) -> str:
+        """Select expression returning a JSON column as text.
+
+        Columns written with ``jsonb()`` hold binary JSON and must be
+        converted back with ``json()``; on older SQLite they are plain text.
+        """
+        if self.supports_jsonb:
+            return f"json({column}) AS {column}"
+        return column
+
+    def decoded_json_column(self, column: str) -> str:
+        """Select expression returning a JSON column already decoded.
+
+        The driver parses the value with orjson as it builds the row, so
+        callers get Python objects without a per-row decode loop.
+        """
+        expr = f"json({column})" if self.supports_jsonb else column
+        return f'{expr} AS "{column} [json]"'
+
+    async def checkpoint(self) -> None:
+        """Checkpoint the WAL into the main database and truncate the -wal file."""
+        conn = await self.get_connection()
+        async with self._write_lock:
+            cursor = await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, log_pages, checkpointed = await cursor.fetchone()
+        logger.debug(
+            "database_checkpoint",
+            busy=busy,
+            log_pages=log_pages,
+            checkpointed=checkpointed,
+        )
+
+    def _in_transaction(self) -> bool:
+        """True when the current task is inside ``transaction()``."""
+        return self._tx_owner is not None and self._tx_owner is asyncio.current_task()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a burst of writes inside one ``BEGIN IMMEDIATE ... COMMIT``.
+
+        ``execute``/``execute_many``/``execute_returning`` calls made by the
+        same task inside the block join the transaction instead of
+        committing individually.
+        Rolls back if the block raises.
+        """
+        conn = await self.get_connection()
+        async with self._write_lock:
+            self._tx_owner = asyncio.current_task()
+            try:
+                await conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    await conn.rollback()
+                    raise
+                await conn.commit()
+            finally:
+                self._tx_owner = None
+
     async def execute(
         self, query: str, params: tuple | dict | None = None
     ) -> aiosqlite.Cursor:
-        """Execute a single parameterized query."""
+        """Execute a single parameterized write.
+
+        Commits immediately unless called inside ``transaction()``.
+        """
         conn = await self.get_connection()
-        cursor = await conn.execute(query, params or ())
-        await conn.commit()
+        if self._in_transaction():
+            return await conn.execute(query, params or ())
+        async with self._write_lock:
+            cursor = await conn.execute(query, params or ())
+            await conn.commit()
         return cursor
 
+    async def execute_many(
+        self, query: str, params_seq: list[tuple] | list[dict]
+    ) -> None:
+        """Execute one prepared write for every parameter set.
+
+        All rows land in one commit (or in the enclosing ``transaction()``).
+        """
+        conn = await self.get_connection()
+        if self._in_transaction():
+            await conn.executemany(query, params_seq)
+            return
+        async with self._write_lock:
+            await conn.executemany(query, params_seq)
+            await conn.commit()
+
+    async def execute_returning(
+        self, query: str, params: tuple | dict | None = None
+    ) -> list[aiosqlite.Row]:
+        """Execute a write with a ``RETURNING`` clause and return the affected rows."""
+        conn = await self.get_connection()
+        if self._in_transaction():
+            cursor = await conn.execute(query, params or ())
+            return await cursor.fetchall()
+        async with self._write_lock:
+            cursor = await conn.execute(query, params or ())
+            rows = await cursor.fetchall()
+            await conn.commit()
+        return rows
+
     async def fetch_one(
         self, query: str, params: tuple | dict | None = None
     ) -> aiosqlite.Row | None:
-        """Execute query and return a single row."""
-        conn = await self.get_connection()
-        cursor = await conn.execute(query, params or ())
-        return await cursor.fetchone()
+        """Execute query on a reader and return a single row."""
+        async with self.acquire_reader() as conn:
+            cursor = await conn.execute(query, params or ())
+            return await cursor.fetchone()
 
     async def fetch_all(
         self, query: str, params: tuple | dict | None = None
     ) -> list[aiosqlite.Row]:
-        """Execute query and return all rows."""
-        conn = await self.get_connection()
-        cursor = await conn.execute(query, params or ())
-        return await cursor.fetchall()
-
+        """Execute query on a reader and return all rows."""
+        async with self.acquire_reader() as conn:
+            cursor = await conn.execute(query, params or ())
+            return await cursor.fetchall()
 
-def get_database() -> DatabaseManager:
-    """Get the global database manager instance."""
-    if _DB_INSTANCE is None:
-        raise RuntimeError("Database not initialized. Call init_database() first.")
-    return _DB_INSTANCE
+    async def iterate(
+        self,
+        query: str,
+        params: tuple | dict | None = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[aiosqlite.Row]:
+        """Execute query on a reader and yield rows in ``batch_size`` chunks.
 
+        The reader stays borrowed until the iteration finishes or is closed.
+        """
+        async with self.acquire_reader() as conn:
+            cursor = await conn.execute(query, params or ())
+            try:
+                while rows := await cursor.fetchmany(batch_size):
+                    for row in rows:
+                        yield row
+            finally:
+                await cursor.close()
 
-def init_database(db_path: str) -> DatabaseManager:
-    """Create and store the global database manager instance."""
-    global _DB_INSTANCE
-    _DB_INSTANCE = DatabaseManager(db_path)
-    return _DB_INSTANCE
@@ -1,11 +1,14 @@
 """Dependencies for FastAPI routes.
 
-This module provides rate limiting and singleton accessors for the
-AlertEngine and HttpBMKGClient instances initialized in the app lifespan.
+This module provides rate limiting and accessors for the DatabaseManager,
+AlertEngine and HttpBMKGClient instances the app lifespan stores on
+``app.state``.
 """
 
 from __future__ import annotations
 
+import hmac
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from slowapi import Limiter
@@ -14,8 +17,10 @@ from slowapi.util import get_remote_address
 from fastapi import HTTPException, Request
 
 from app.config import settings
+from app.core.auth import ADMIN_PASSWORD_DIGEST, secret_digest
 
 if TYPE_CHECKING:
+    from app.database import DatabaseManager
     from app.engine.worker import AlertEngine
     from app.engine.bmkg_client import HttpBMKGClient
 
@@ -27,31 +32,47 @@ limiter = Limiter(
     headers_enabled=True,
 )
 
-# Singleton holders — populated during app lifespan startup
-_engine_instance: "AlertEngine | None" = None
-_bmkg_client_instance: "HttpBMKGClient | None" = None
+# The DatabaseManager, AlertEngine and HttpBMKGClient live on ``app.state``,
+# set by the app lifespan; routes receive them through these dependencies.
 
 
-def set_engine(engine: "AlertEngine") -> None:
-    """Store the global AlertEngine instance (called at startup)."""
-    global _engine_instance
-    _engine_instance = engine
+def get_db(request: Request) -> "DatabaseManager":
+    """Return the DatabaseManager created at startup."""
+    return request.app.state.db
 
 
-def get_engine() -> "AlertEngine | None":
-    """Return the global AlertEngine instance."""
-    return _engine_instance
+def get_engine(request: Request) -> "AlertEngine | None":
+    """Return the AlertEngine instance, or None before startup."""
+    return getattr(request.app.state, "engine", None)
 
 
-def set_bmkg_client(client: "HttpBMKGClient") -> None:
-    """Store the global HttpBMKGClient instance (called at startup)."""
-    global _bmkg_client_instance
-    _bmkg_client_instance = client
+def get_bmkg_client(request: Request) -> "HttpBMKGClient | None":
+    """Return the HttpBMKGClient instance, or None before startup."""
+    return getattr(request.app.state, "bmkg_client", None)
 
 
-def get_bmkg_client() -> "HttpBMKGClient | None":
-    """Return the global HttpBMKGClient instance."""
-    return _bmkg_client_instance
+@dataclass(frozen=True, slots=True)
+class _AdminChecker:
+    """Constant-time admin credential check against a precomputed digest."""
+
+    digest: bytes  # ``secret_digest`` of the admin password
+
+    def __call__(self, request: Request) -> bool:
+        # ASGI header names are already lowercased bytes — scan them
+        # directly instead of going through the decoding Headers mapping.
+        for name, value in request.headers.raw:
+            if name == b"authorization":
+                if value.startswith(b"Bearer ") and hmac.compare_digest(
+                    secret_digest(value[7:]), self.digest
+                ):
+                    return True
+            elif name == b"x-admin-token":
+                if value and hmac.compare_digest(secret_digest(value), self.digest):
+                    return True
+        return False
+
+
+_admin_checker = _AdminChecker(digest=ADMIN_PASSWORD_DIGEST)
 
 
 def _is_admin(request: Request) -> bool:
@@ -61,14 +82,7 @@ def _is_admin(request: Request) -> bool:
     - ``Authorization: Bearer <ADMIN_PASSWORD>``
     - ``X-Admin-Token: <ADMIN_PASSWORD>``
     """
-    admin_pw = settings.admin_password
-    auth = request.headers.get("authorization", "")
-    if auth.startswith("Bearer ") and auth[7:] == admin_pw:
-        return True
-    token = request.headers.get("x-admin-token", "")
-    if token and token == admin_pw:
-        return True
-    return False
+    return _admin_checker(request)
 
 
 def require_write_allowed(request: Request) -> None:
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Protocol, runtime_checkable
 
 import httpx
 import structlog
 
+from app.config import settings
 from app.models import NowcastDetailResponse, NowcastListResponse
 
 logger = structlog.get_logger()
@@ -20,6 +22,9 @@ class BMKGClient(Protocol):
 
     async def get_nowcast_list(self) -> NowcastListResponse: ...
     async def get_nowcast_detail(self, code: str) -> NowcastDetailResponse: ...
+    async def get_nowcast_details(
+        self, codes: list[str]
+    ) -> list[NowcastDetailResponse | BaseException]: ...
     async def search_wilayah(self, query: str) -> dict[str, Any]: ...
     async def get_provinces(self) -> dict[str, Any]: ...
     async def check_health(self) -> bool: ...
@@ -30,28 +35,42 @@ class HttpBMKGClient:
 
     def __init__(self, base_url: str) -> None:
         self._base_url = base_url.rstrip("/")
-        self._client: httpx.AsyncClient | None = None
+        # One long-lived client for the app's lifetime: keep-alive pool plus
+        # HTTP/2 so concurrent detail fetches multiplex over one connection.
+        # If the server only speaks HTTP/1.1, each in-flight fetch needs its
+        # own connection, so the pool never keeps fewer idle connections than
+        # the detail-fetch concurrency cap.
+        # limits/http2 must be set on the transport when one is supplied.
+        concurrency = settings.max_concurrent_details
+        transport = httpx.AsyncHTTPTransport(
+            retries=1,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max(50, concurrency),
+                max_keepalive_connections=max(20, concurrency),
+                keepalive_expiry=60,
+            ),
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT),
+            headers={"Accept": "application/json"},
+            transport=transport,
+        )
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                base_url=self._base_url,
-                timeout=httpx.Timeout(REQUEST_TIMEOUT),
-                headers={"Accept": "application/json"},
-            )
-        return self._client
+    async def open(self) -> None:
+        """Open the underlying HTTP client (called at startup)."""
+        await self._client.__aenter__()
 
     async def close(self) -> None:
         """Close the underlying HTTP client."""
-        if self._client and not self._client.is_closed:
+        if not self._client.is_closed:
             await self._client.aclose()
-            self._client = None
 
     async def get_nowcast_list(self) -> NowcastListResponse:
         """Fetch all active nowcast warnings."""
-        client = await self._get_client()
         logger.info("bmkg_api_request", endpoint="/v1/nowcast")
-        response = await client.get("/v1/nowcast")
+        response = await self._client.get("/v1/nowcast")
         response.raise_for_status()
         data = response.json()
         logger.info(
@@ -63,35 +82,54 @@ class HttpBMKGClient:
 
     async def get_nowcast_detail(self, code: str) -> NowcastDetailResponse:
         """Fetch detail for a specific nowcast warning."""
-        client = await self._get_client()
         endpoint = f"/v1/nowcast/{code}"
         logger.debug("bmkg_api_request", endpoint=endpoint)
-        response = await client.get(endpoint)
+        response = await self._client.get(endpoint)
         response.raise_for_status()
         data = response.json()
         # The bmkg-api wraps the detail in a "data" key: {"data": {...}, "meta": {...}}
         inner = data.get("data", data)
         return NowcastDetailResponse(**inner)
 
+    async def get_nowcast_details(
+        self, codes: list[str]
+    ) -> list[NowcastDetailResponse | BaseException]:
+        """Fetch details for several warnings concurrently.
+
+        At most ``settings.max_concurrent_details`` requests are in flight. Results
+        are in ``codes`` order; a failed fetch yields its exception instead of
+        aborting the whole batch. Runs in a ``TaskGroup`` so cancelling the
+        caller cancels and awaits every outstanding fetch.
+        """
+        sem = asyncio.Semaphore(max(1, settings.max_concurrent_details))
+
+        async def one(code: str) -> NowcastDetailResponse | Exception:
+            async with sem:
+                try:
+                    return await self.get_nowcast_detail(code)
+                except Exception as exc:
+                    return exc
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(one(code)) for code in codes]
+        return [task.result() for task in tasks]
+
     async def search_wilayah(self, query: str) -> dict[str, Any]:
         """Search for Indonesian administrative areas."""
-        client = await self._get_client()
-        response = await client.get("/v1/wilayah/search", params={"q": query})
+        response = await self._client.get("/v1/wilayah/search", params={"q": query})
         response.raise_for_status()
         return response.json()
 
     async def get_provinces(self) -> dict[str, Any]:
         """Get list of all provinces."""
-        client = await self._get_client()
-        response = await client.get("/v1/wilayah/provinces")
+        response = await self._client.get("/v1/wilayah/provinces")
         response.raise_for_status()
         return response.json()
 
     async def check_health(self) -> bool:
         """Check if the BMKG API is reachable."""
         try:
-            client = await self._get_client()
-            response = await client.get("/v1/nowcast")
+            response = await self._client.get("/v1/nowcast")
             return response.status_code == 200
         except (httpx.HTTPError, Exception):
             return False
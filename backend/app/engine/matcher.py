@@ -2,15 +2,88 @@
 
 Pure functions with no I/O. Matches by comparing the kecamatan (subdistrict)
 and kabupaten (district) names against the warning description text.
+
+Location names are compiled into Aho–Corasick automata (``MatcherIndex``)
+so each warning text is scanned once regardless of how many locations are
+monitored. Without ``pyahocorasick`` the names are compiled into a single
+combined regex instead, so the scan still runs in C.
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
 from app.models import Location, MatchResult, WarningInfo
 
+# Try to import pyahocorasick, but don't fail if not available
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Joins area names into one haystack; never appears inside a name, so a
+# district pattern cannot match across two areas.
+_AREA_SEPARATOR = "\x00"
+
+
+class NameScanner:
+    """Finds which of a fixed set of lowercased names occur in a text."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = set(names) - {""}
+        self._automaton = _build_automaton(self.names)
+
+    def find_in(self, text_lower: str) -> set[str]:
+        """Return the names occurring as substrings of ``text_lower``."""
+        return _scan(self._automaton, self.names, text_lower)
+
+    def find_in_any(self, texts_lower: Iterable[str]) -> set[str]:
+        """Return the names occurring in any of ``texts_lower``."""
+        return self.find_in(_AREA_SEPARATOR.join(texts_lower))
+
+
+class MatcherIndex:
+    """Pre-compiled lookup of monitored location names.
+
+    Built once per set of enabled locations and reused for every warning
+    in a poll cycle. Holds names only, never ``Location`` objects, so a
+    reused index cannot hand back a location's stale label or province.
+    """
+
+    def __init__(self, locations: list[Location]) -> None:
+        enabled = [loc for loc in locations if loc.enabled]
+        self.fingerprint = _fingerprint(locations)
+        self._subdistricts = NameScanner(loc.subdistrict_name_lower for loc in enabled)
+        self._districts = NameScanner(loc.district_name_lower for loc in enabled)
+
+    def subdistricts_in(self, text_lower: str) -> set[str]:
+        """Return the lowercased subdistrict names occurring in ``text_lower``."""
+        return self._subdistricts.find_in(text_lower)
+
+    def districts_in(self, area_names_lower: Iterable[str]) -> set[str]:
+        """Return the lowercased district names occurring in any area name."""
+        return self._districts.find_in_any(area_names_lower)
+
+
+_cached_index: MatcherIndex | None = None
+
+
+def get_matcher_index(locations: list[Location]) -> MatcherIndex:
+    """Return a ``MatcherIndex`` for ``locations``, reusing the last one if unchanged."""
+    global _cached_index
+    fingerprint = _fingerprint(locations)
+    if _cached_index is None or _cached_index.fingerprint != fingerprint:
+        _cached_index = MatcherIndex(locations)
+    return _cached_index
+
 
 def match_locations(
-    warning: WarningInfo, locations: list[Location]
+    warning: WarningInfo,
+    locations: list[Location],
+    index: MatcherIndex | None = None,
 ) -> list[MatchResult]:
     """Match a warning against a list of monitored locations.
 
@@ -21,23 +94,24 @@ def match_locations(
     Args:
         warning: The parsed BMKG warning info.
         locations: List of enabled monitored locations.
+        index: Pre-built index for ``locations``; looked up from the
+            module cache when omitted.
 
     Returns:
         List of MatchResult for all matched locations.
     """
-    results: list[MatchResult] = []
-    description_lower = warning.description.lower()
+    if index is None:
+        index = get_matcher_index(locations)
 
-    # Build a set of area names for kabupaten fallback
-    area_names_lower = {area.name.lower() for area in warning.areas}
+    results: list[MatchResult] = []
+    found_subdistricts = index.subdistricts_in(warning.description_lower)
+    found_districts: set[str] | None = None
 
     for location in locations:
         if not location.enabled:
             continue
-
         # Primary match: kecamatan name in description
-        subdistrict = location.subdistrict_name.lower()
-        if subdistrict and _word_boundary_match(subdistrict, description_lower):
+        if location.subdistrict_name_lower in found_subdistricts:
             results.append(
                 MatchResult(
                     location=location,
@@ -47,9 +121,10 @@ def match_locations(
             )
             continue
 
-        # Fallback: district name in area names
-        district = location.district_name.lower()
-        if district and any(district in area_name for area_name in area_names_lower):
+        # Fallback: district name in area names (only scanned if needed)
+        if found_districts is None:
+            found_districts = index.districts_in(warning.area_names_lower)
+        if location.district_name_lower in found_districts:
             results.append(
                 MatchResult(
                     location=location,
@@ -61,13 +136,63 @@ def match_locations(
     return results
 
 
-def _word_boundary_match(needle: str, haystack: str) -> bool:
-    """Check if needle appears in haystack with word-boundary awareness.
+def _fingerprint(locations: list[Location]) -> int:
+    """Hash the fields the index depends on (its names, not labels etc.)."""
+    return hash(
+        tuple(
+            (loc.id, loc.enabled, loc.subdistrict_name, loc.district_name)
+            for loc in locations
+        )
+    )
+
+
+def _build_automaton(patterns: set[str]) -> ahocorasick.Automaton | None:
+    """Compile ``patterns`` into an Aho–Corasick automaton."""
+    if not AHOCORASICK_AVAILABLE or not patterns:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
 
-    The BMKG description lists kecamatan as comma-separated names.
-    We match if the needle appears as a standalone word or phrase.
+
+def _scan(
+    automaton: ahocorasick.Automaton | None, patterns: set[str], haystack: str
+) -> set[str]:
+    """Return every pattern that occurs as a substring of ``haystack``.
+
+    The BMKG description lists kecamatan as comma-separated names, so a
+    plain substring match is reliable; no word-boundary regex needed.
+    """
+    if automaton is not None:
+        return {pattern for _, pattern in automaton.iter(haystack)}
+    if not patterns:
+        return set()
+    regex, prefixes = _compile_alternation(tuple(sorted(patterns)))
+    found: set[str] = set()
+    for m in regex.finditer(haystack):
+        found |= prefixes[m.group(1)]
+    return found
+
+
+@lru_cache(maxsize=8)
+def _compile_alternation(
+    patterns: tuple[str, ...],
+) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """Compile ``patterns`` into one regex for the no-pyahocorasick path.
+
+    The zero-width lookahead tries every start position and, with the
+    alternatives ordered longest first, captures the longest pattern there.
+    Any shorter pattern starting at the same position is a prefix of it, so
+    ``prefixes`` maps each pattern to all patterns that are its prefixes —
+    giving the same result as testing every pattern with ``in``.
     """
-    # Use simple substring check — kecamatan names in the description
-    # are separated by commas and spaces, so this is reliable.
-    # We avoid regex for performance on frequently-polled data.
-    return needle in haystack
+    ordered = sorted(patterns, key=len, reverse=True)
+    regex = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    pattern_set = set(patterns)
+    prefixes = {
+        p: frozenset(p[:k] for k in range(1, len(p) + 1) if p[:k] in pattern_set)
+        for p in patterns
+    }
+    return regex, prefixes
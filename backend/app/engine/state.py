@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Any
 
+import orjson
 import structlog
 
 from app.database import DatabaseManager
@@ -12,61 +15,156 @@ from app.models import Alert, Location, MatchResult, WarningInfo
 
 logger = structlog.get_logger()
 
+# Rows come from our own schema, so models are built with model_construct
+# (no per-field validation). Only SQLite's 0/1 booleans need converting.
+_ALERT_FIELDS = tuple(Alert.model_fields)
+_LOCATION_FIELDS = tuple(Location.model_fields)
+
+
+def alert_columns(db: DatabaseManager, decoded: bool = False) -> str:
+    """Column list for selecting alerts.
+
+    ``polygon_data`` comes back as JSON text, or already parsed when
+    ``decoded`` is set (for handlers that serialize rows as they are).
+    """
+    polygon = (
+        db.decoded_json_column("polygon_data")
+        if decoded
+        else db.json_column("polygon_data")
+    )
+    return ", ".join(
+        polygon if name == "polygon_data" else name for name in _ALERT_FIELDS
+    )
+
+
+# Every locations column, in model order
+LOCATION_COLUMNS = ", ".join(_LOCATION_FIELDS)
+
+# Every notification_channels column, with ``config`` decoded by the driver
+CHANNEL_COLUMNS = (
+    'id, channel_type, enabled, config AS "config [json]", '
+    "last_success_at, last_error, created_at, updated_at"
+)
+
+
+def _alert_from_row(row: Any) -> Alert:
+    data = {k: row[k] for k in _ALERT_FIELDS}
+    data["expired_notified"] = bool(data["expired_notified"])
+    return Alert.model_construct(**data)
+
+
+def _location_from_row(row: Any) -> Location:
+    data = {k: row[k] for k in _LOCATION_FIELDS}
+    data["enabled"] = bool(data["enabled"])
+    return Location.model_construct(**data)
+
 
 class StateManager:
     """Manages alert state: dedup, insert, expiry, and active alert tracking."""
 
     def __init__(self, db: DatabaseManager) -> None:
         self._db = db
+        # Enabled locations/channels change only through the API, which calls
+        # invalidate_*(); the version guards against caching a read that
+        # raced with an invalidation.
+        self._locations: list[Location] | None = None
+        self._locations_version = 0
+        self._channels: list[dict] | None = None
+        self._channels_version = 0
+
+    def invalidate_locations(self) -> None:
+        """Drop the cached enabled locations after a locations change."""
+        self._locations = None
+        self._locations_version += 1
+
+    def invalidate_channels(self) -> None:
+        """Drop the cached enabled channels after a channels change."""
+        self._channels = None
+        self._channels_version += 1
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Group several writes into a single commit."""
+        async with self._db.transaction():
+            yield
+
+    async def checkpoint(self) -> None:
+        """Truncate the database write-ahead log."""
+        await self._db.checkpoint()
 
     async def is_duplicate(self, alert_code: str, location_id: int) -> bool:
-        """Check if we already have a non-expired alert for this code + location."""
+        """Check if we already have an alert for this code + location.
+
+        Not filtered by status: the UNIQUE(bmkg_alert_code, matched_location_id)
+        constraint spans expired rows too, and its index answers this probe
+        without touching the table.
+        """
         row = await self._db.fetch_one(
-            "SELECT id FROM alerts WHERE bmkg_alert_code = ? AND matched_location_id = ?",
+            "SELECT 1 FROM alerts WHERE bmkg_alert_code = ? AND matched_location_id = ? LIMIT 1",
             (alert_code, location_id),
         )
         return row is not None
 
-    async def store_alert(
-        self,
-        warning: WarningInfo,
-        match: MatchResult,
-        alert_code: str,
-    ) -> int:
-        """Store a new matched alert in the database. Returns the new alert ID."""
-        polygon_json = json.dumps(
-            [
-                {"name": area.name, "polygon": area.polygon}
-                for area in warning.areas
-            ]
+    async def get_dedup_keys(self, alert_codes: list[str]) -> set[tuple[str, int]]:
+        """Return the ``(code, location_id)`` pairs already stored for ``alert_codes``.
+
+        One query per poll cycle instead of an ``is_duplicate`` probe per
+        match. Like ``is_duplicate``, expired rows count too.
+        """
+        if not alert_codes:
+            return set()
+        placeholders = ", ".join("?" * len(alert_codes))
+        rows = await self._db.fetch_all(
+            "SELECT bmkg_alert_code, matched_location_id FROM alerts "
+            f"WHERE bmkg_alert_code IN ({placeholders})",
+            tuple(alert_codes),
         )
+        return {(row[0], row[1]) for row in rows}
 
-        cursor = await self._db.execute(
-            """
+    def _insert_alert_sql(self) -> str:
+        # Polygons are stored as binary JSONB where supported, JSON text
+        # otherwise. Bound as text either way: jsonb() would treat a BLOB
+        # argument as JSONB.
+        polygon_sql = "jsonb(?)" if self._db.supports_jsonb else "?"
+        return """
             INSERT INTO alerts (
                 bmkg_alert_code, event, severity, urgency, certainty,
                 headline, description, effective, expires, infographic_url,
                 polygon_data, matched_location_id, match_type, matched_text, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')
-            """,
-            (
-                alert_code,
-                warning.event,
-                warning.severity,
-                warning.urgency,
-                warning.certainty,
-                warning.headline,
-                warning.description,
-                warning.effective,
-                warning.expires,
-                warning.infographic_url,
-                polygon_json,
-                match.location.id,
-                match.match_type,
-                match.matched_text,
-            ),
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {polygon_sql}, ?, ?, ?, 'active')
+            """.format(polygon_sql=polygon_sql)
+
+    @staticmethod
+    def _alert_params(
+        warning: WarningInfo, match: MatchResult, alert_code: str
+    ) -> tuple:
+        polygon_json = orjson.dumps(
+            [
+                {"name": area.name, "polygon": area.polygon}
+                for area in warning.areas
+            ]
+        ).decode()
+        return (
+            alert_code,
+            warning.event,
+            warning.severity,
+            warning.urgency,
+            warning.certainty,
+            warning.headline,
+            warning.description,
+            warning.effective,
+            warning.expires,
+            warning.infographic_url,
+            polygon_json,
+            match.location.id,
+            match.match_type,
+            match.matched_text,
         )
-        alert_id = cursor.lastrowid or 0
+
+    @staticmethod
+    def _log_stored(
+        alert_id: int, warning: WarningInfo, match: MatchResult, alert_code: str
+    ) -> None:
         logger.info(
             "alert_stored",
             alert_id=alert_id,
@@ -76,8 +174,75 @@ class StateManager:
             location_id=match.location.id,
             match_type=match.match_type,
         )
+
+    async def store_alert(
+        self,
+        warning: WarningInfo,
+        match: MatchResult,
+        alert_code: str,
+    ) -> int:
+        """Store a new matched alert in the database. Returns the new alert ID."""
+        cursor = await self._db.execute(
+            self._insert_alert_sql(),
+            self._alert_params(warning, match, alert_code),
+        )
+        alert_id = cursor.lastrowid or 0
+        self._log_stored(alert_id, warning, match, alert_code)
         return alert_id
 
+    async def store_alerts_bulk(
+        self, pending: list[tuple[WarningInfo, MatchResult, str]]
+    ) -> list[tuple[int, WarningInfo, MatchResult]]:
+        """Store several matched alerts in one transaction.
+
+        Rows whose ``(alert_code, location)`` is already stored, e.g. by a
+        ``check_now`` racing the poll loop, are skipped rather than failing
+        the batch.
+
+        Args:
+            pending: ``(warning, match, alert_code)`` tuples to insert.
+
+        Returns:
+            ``(alert_id, warning, match)`` for each row actually inserted,
+            in ``pending`` order.
+        """
+        if not pending:
+            return []
+        codes = list(dict.fromkeys(code for _, _, code in pending))
+        placeholders = ", ".join("?" * len(codes))
+        select_keys = (
+            "SELECT id, bmkg_alert_code, matched_location_id FROM alerts "
+            f"WHERE bmkg_alert_code IN ({placeholders})"
+        )
+        async with self._db.transaction():
+            # Reads inside the transaction use the writer, so this dedup
+            # check cannot race another insert.
+            existing = {
+                (row[1], row[2]) for row in await self._db.fetch_all(select_keys, tuple(codes))
+            }
+            fresh = [
+                (w, m, code) for w, m, code in pending
+                if (code, m.location.id) not in existing
+            ]
+            if not fresh:
+                return []
+            await self._db.execute_many(
+                self._insert_alert_sql()
+                + "ON CONFLICT(bmkg_alert_code, matched_location_id) DO NOTHING",
+                [self._alert_params(w, m, code) for w, m, code in fresh],
+            )
+            # executemany leaves lastrowid unset, so read the IDs back by the
+            # UNIQUE (code, location) key.
+            rows = await self._db.fetch_all(select_keys, tuple(codes))
+        ids_by_key = {(row[1], row[2]): row[0] for row in rows}
+
+        stored: list[tuple[int, WarningInfo, MatchResult]] = []
+        for warning, match, code in fresh:
+            alert_id = ids_by_key[(code, match.location.id)]
+            stored.append((alert_id, warning, match))
+            self._log_stored(alert_id, warning, match, code)
+        return stored
+
     async def mark_expired_alerts(self) -> list[Alert]:
         """Find and mark alerts whose expires timestamp is in the past.
 
@@ -85,26 +250,23 @@ class StateManager:
         """
         now_utc = datetime.now(timezone.utc).isoformat()
 
-        # Find alerts that should be expired
-        rows = await self._db.fetch_all(
+        # Single UPDATE ... RETURNING: one statement, one commit for all rows
+        rows = await self._db.execute_returning(
             """
-            SELECT * FROM alerts
+            UPDATE alerts INDEXED BY idx_alerts_active_expiry
+            SET status = 'expired'
             WHERE status = 'active'
               AND expires != ''
               AND expires < ?
-            """,
+            RETURNING {columns}
+            """.format(columns=alert_columns(self._db)),
             (now_utc,),
         )
 
         expired_alerts: list[Alert] = []
         for row in rows:
-            alert = Alert(**dict(row))
+            alert = _alert_from_row(row)
             expired_alerts.append(alert)
-
-            await self._db.execute(
-                "UPDATE alerts SET status = 'expired' WHERE id = ?",
-                (alert.id,),
-            )
             logger.info(
                 "alert_expired",
                 alert_id=alert.id,
@@ -116,9 +278,10 @@ class StateManager:
     async def get_active_alerts(self) -> list[Alert]:
         """Return all currently active alerts."""
         rows = await self._db.fetch_all(
-            "SELECT * FROM alerts WHERE status = 'active' ORDER BY created_at DESC"
+            f"SELECT {alert_columns(self._db)} FROM alerts "
+            "WHERE status = 'active' ORDER BY created_at DESC"
         )
-        return [Alert(**dict(row)) for row in rows]
+        return [_alert_from_row(row) for row in rows]
 
     async def get_alert_count(self) -> int:
         """Count active alerts."""
@@ -149,25 +312,41 @@ class StateManager:
         )
 
     async def get_enabled_locations(self) -> list[Location]:
-        """Fetch all enabled monitored locations."""
+        """Fetch all enabled monitored locations (cached until invalidated)."""
+        if self._locations is not None:
+            return self._locations
+        version = self._locations_version
         rows = await self._db.fetch_all(
-            "SELECT * FROM locations WHERE enabled = 1"
+            f"SELECT {LOCATION_COLUMNS} FROM locations WHERE enabled = 1"
         )
-        return [Location(**dict(row)) for row in rows]
+        locations = [_location_from_row(row) for row in rows]
+        if version == self._locations_version:
+            self._locations = locations
+        return locations
 
     async def get_enabled_channels(self) -> list[dict]:
-        """Fetch all enabled notification channels."""
+        """Fetch all enabled notification channels (cached until invalidated)."""
+        if self._channels is not None:
+            return self._channels
+        version = self._channels_version
+        # Only the columns the dispatcher reads. The config is parsed whole:
+        # each sender type reads different keys (webhook needs the nested
+        # "headers" object), so one orjson parse per channel beats a
+        # json_extract per key.
         rows = await self._db.fetch_all(
-            "SELECT * FROM notification_channels WHERE enabled = 1"
+            "SELECT id, channel_type, config FROM notification_channels WHERE enabled = 1"
         )
-        result = []
-        for row in rows:
-            channel = dict(row)
-            # Parse JSON config
-            if isinstance(channel.get("config"), str):
-                channel["config"] = json.loads(channel["config"])
-            result.append(channel)
-        return result
+        channels = [
+            {
+                "id": row["id"],
+                "channel_type": row["channel_type"],
+                "config": orjson.loads(row["config"]),
+            }
+            for row in rows
+        ]
+        if version == self._channels_version:
+            self._channels = channels
+        return channels
 
     async def get_config_value(self, key: str, default: str = "") -> str:
         """Read a single config value."""
@@ -203,11 +382,10 @@ class StateManager:
         expired = [dict(row) for row in rows]
 
         if expired:
-            ids = [t["id"] for t in expired]
-            placeholders = ",".join("?" * len(ids))
-            await self._db.execute(
-                f"UPDATE trial_subscriptions SET expired_notified = 1 WHERE id IN ({placeholders})",
-                tuple(ids),
+            # One fixed statement reused per row instead of a new IN (...) per N
+            await self._db.execute_many(
+                "UPDATE trial_subscriptions SET expired_notified = 1 WHERE id = ?",
+                [(t["id"],) for t in expired],
             )
 
         return expired
@@ -13,22 +13,107 @@ Runs as an asyncio.Task in the FastAPI lifespan. On each cycle:
 from __future__ import annotations
 
 import asyncio
-import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+import orjson
 import structlog
 
 from app.config import settings
 from app.engine.bmkg_client import BMKGClient
-from app.engine.matcher import match_locations
+from app.engine.matcher import NameScanner, get_matcher_index, match_locations
 from app.engine.state import StateManager
+from app.models import WarningInfo
+from app.models.enums import SEVERITY_RANK
 from app.notifications.telegram import TelegramSender
 
 logger = structlog.get_logger()
 
-# Severity ordering for trial filtering
-_SEVERITY_ORDER = {"minor": 0, "moderate": 1, "severe": 2, "extreme": 3}
+# Severity ordering for trial filtering, keyed by the lowercase threshold
+# names trials are stored with
+_SEVERITY_ORDER = {sev.value.lower(): rank for sev, rank in SEVERITY_RANK.items()}
+
+# Seconds between WAL checkpoints run from the poll loop
+_CHECKPOINT_INTERVAL = 300
+
+# Seconds the poll_interval config value is cached between loop ticks
+_POLL_INTERVAL_TTL = 60
+
+# Concurrent Telegram sends per batch, kept under the Bot API's ~30 msg/s limit
+_TELEGRAM_CONCURRENCY = 20
+
+_telegram = TelegramSender()
+
+
+def _trial_severity(trial: dict) -> int:
+    """Minimum warning rank a trial wants; ``"all"`` maps to -1."""
+    threshold = trial.get("severity_threshold", "all")
+    if threshold == "all":
+        return -1
+    return _SEVERITY_ORDER.get(threshold.lower(), 0)
+
+
+@dataclass(frozen=True, slots=True)
+class _TrialIndex:
+    """Trial subscriptions indexed for matching against one cycle's warnings.
+
+    Built once per cycle so each warning costs two name scans, dict lookups
+    and a precomputed severity comparison.
+    """
+
+    by_sub: dict[str, list[int]]
+    by_dist: dict[str, list[int]]
+    sub_scanner: NameScanner
+    dist_scanner: NameScanner
+    # (severity threshold, location label, chat id) per trial
+    prepared: list[tuple[int, str, str]]
+
+    @classmethod
+    def build(cls, trials: list[dict]) -> _TrialIndex:
+        by_sub: dict[str, list[int]] = defaultdict(list)
+        by_dist: dict[str, list[int]] = defaultdict(list)
+        prepared: list[tuple[int, str, str]] = []
+        for i, trial in enumerate(trials):
+            by_sub[trial.get("subdistrict_name", "").lower()].append(i)
+            by_dist[trial.get("district_name", "").lower()].append(i)
+
+            trial_sev = _trial_severity(trial)
+            loc_label = trial.get("subdistrict_name", "")
+            if trial.get("district_name"):
+                loc_label += f", {trial['district_name']}"
+            prepared.append((trial_sev, loc_label, trial["telegram_chat_id"]))
+        return cls(
+            by_sub=by_sub,
+            by_dist=by_dist,
+            sub_scanner=NameScanner(by_sub),
+            dist_scanner=NameScanner(by_dist),
+            prepared=prepared,
+        )
+
+    def recipients(self, warning: WarningInfo) -> list[tuple[str, str]]:
+        """Return ``(location label, chat id)`` for trials matching ``warning``.
+
+        A trial matches when its subdistrict is in the description or its
+        district is in any area name, and the warning meets its severity
+        threshold. Results keep trial order.
+        """
+        matched: set[int] = set()
+        for name in self.sub_scanner.find_in(warning.description_lower):
+            matched.update(self.by_sub[name])
+        for name in self.dist_scanner.find_in_any(warning.area_names_lower):
+            matched.update(self.by_dist[name])
+
+        warn_sev = warning.severity_rank
+        return [
+            (loc_label, chat_id)
+            for trial_sev, loc_label, chat_id in (
+                self.prepared[i] for i in sorted(matched)
+            )
+            if warn_sev >= trial_sev
+        ]
 
 
 class AlertEngine:
@@ -48,6 +133,9 @@ class AlertEngine:
         self._last_poll: str | None = None
         self._last_poll_result: str | None = None
         self._stop_event = asyncio.Event()
+        self._last_checkpoint = time.monotonic()
+        self._poll_interval = 300
+        self._poll_interval_read_at: float | None = None
 
     @property
     def running(self) -> bool:
@@ -96,6 +184,40 @@ class AlertEngine:
         """Trigger a single poll cycle immediately. Returns summary."""
         return await self._run_poll_cycle()
 
+    def invalidate_locations(self) -> None:
+        """Re-read enabled locations on the next poll cycle."""
+        self._state.invalidate_locations()
+
+    def invalidate_channels(self) -> None:
+        """Re-read enabled notification channels on the next poll cycle."""
+        self._state.invalidate_channels()
+
+    def invalidate_poll_interval(self) -> None:
+        """Drop the cached poll interval so the next tick re-reads config."""
+        self._poll_interval_read_at = None
+
+    def invalidate_config(self) -> None:
+        """Drop every cached config value (poll interval, quiet hours)."""
+        self.invalidate_poll_interval()
+        if self._dispatcher is not None:
+            self._dispatcher.invalidate_quiet_hours()
+
+    async def _get_poll_interval(self) -> int:
+        """Return the configured poll interval, cached for ``_POLL_INTERVAL_TTL``."""
+        now = time.monotonic()
+        read_at = self._poll_interval_read_at
+        if read_at is not None and now - read_at < _POLL_INTERVAL_TTL:
+            return self._poll_interval
+        try:
+            self._poll_interval = int(
+                await self._state.get_config_value("poll_interval", "300")
+            )
+            self._poll_interval_read_at = now
+        except Exception as exc:
+            # Keep sleeping on the last known value
+            logger.error("poll_interval_read_error", error=str(exc))
+        return self._poll_interval
+
     def get_status(self) -> dict[str, Any]:
         """Return current engine status."""
         return {
@@ -106,31 +228,37 @@ class AlertEngine:
 
     async def _poll_loop(self) -> None:
         """Main polling loop."""
-        while self._running:
-            try:
-                await self._run_poll_cycle()
-            except Exception as exc:
-                logger.error("poll_cycle_error", error=str(exc), exc_info=True)
-                self._last_poll_result = f"error: {exc}"
+        # One waiter for the loop's lifetime instead of a new wait_for task
+        # and timeout handle on every tick
+        stop_wait = asyncio.ensure_future(self._stop_event.wait())
+        try:
+            while self._running:
+                try:
+                    await self._run_poll_cycle()
+                except Exception as exc:
+                    logger.error("poll_cycle_error", error=str(exc), exc_info=True)
+                    self._last_poll_result = f"error: {exc}"
 
-            # Wait for the configured interval or until stopped
-            poll_interval = int(
-                await self._state.get_config_value("poll_interval", "300")
-            )
-            try:
-                await asyncio.wait_for(
-                    self._stop_event.wait(), timeout=poll_interval
-                )
-                # If we get here, stop was called
-                break
-            except asyncio.TimeoutError:
-                # Normal timeout — continue polling
-                continue
+                if time.monotonic() - self._last_checkpoint >= _CHECKPOINT_INTERVAL:
+                    try:
+                        await self._state.checkpoint()
+                    except Exception as exc:
+                        logger.error("checkpoint_error", error=str(exc))
+                    self._last_checkpoint = time.monotonic()
+
+                # Wait for the configured interval or until stopped
+                poll_interval = await self._get_poll_interval()
+                done, _ = await asyncio.wait({stop_wait}, timeout=poll_interval)
+                if done:
+                    # stop was called
+                    break
+        finally:
+            stop_wait.cancel()
 
     async def _run_poll_cycle(self) -> dict[str, Any]:
         """Execute a single poll cycle."""
-        start_time = datetime.now(timezone.utc)
-        self._last_poll = start_time.isoformat()
+        started_ns = time.perf_counter_ns()
+        self._last_poll = datetime.now(timezone.utc).isoformat()
         summary = {
             "warnings_fetched": 0,
             "details_fetched": 0,
@@ -166,78 +294,108 @@ class AlertEngine:
                 logger.info("poll_cycle_no_locations")
                 return summary
 
+            index = get_matcher_index(locations)
+
             # 3. Get enabled channels
             channels = await self._state.get_enabled_channels()
 
-            # 4. For each warning, get detail and match
-            for item in nowcast.data:
+            # 4. Fetch every detail concurrently (once per code, shared with
+            #    trial matching below). The DB work that doesn't depend on
+            #    the details runs while the requests are in flight.
+            codes = list(dict.fromkeys(item.code for item in nowcast.data))
+            details, seen, expired, trials = await asyncio.gather(
+                self._bmkg.get_nowcast_details(codes),
+                self._state.get_dedup_keys(codes),
+                self._state.mark_expired_alerts(),
+                self._get_active_trials(),
+                return_exceptions=True,
+            )
+            if isinstance(details, BaseException):
+                raise details
+            # A failed read only costs its own step. Without dedup keys the
+            # bulk insert still skips stored alerts inside its transaction.
+            seen = self._gathered(seen, set(), "dedup_keys", summary)
+            expired = self._gathered(expired, [], "mark_expired", summary)
+            trials = self._gathered(trials, [], "active_trials", summary)
+            details_by_code = dict(zip(codes, details))
+            pending: list[tuple[Any, Any, str]] = []
+            for code, detail in details_by_code.items():
                 try:
-                    detail = await self._bmkg.get_nowcast_detail(item.code)
+                    if isinstance(detail, BaseException):
+                        raise detail
                     summary["details_fetched"] += 1
 
                     for warning in detail.warnings:
                         if warning.is_expired:
                             continue
 
-                        matches = match_locations(warning, locations)
+                        matches = match_locations(warning, locations, index)
                         summary["matches_found"] += len(matches)
 
                         for match in matches:
-                            # Dedup check
-                            if await self._state.is_duplicate(
-                                item.code, match.location.id
-                            ):
+                            key = (code, match.location.id)
+                            if key in seen:
                                 summary["duplicates_skipped"] += 1
                                 continue
-
-                            # Store alert
-                            alert_id = await self._state.store_alert(
-                                warning, match, item.code
-                            )
-                            summary["new_alerts"] += 1
-
-                            # Send notifications
-                            if channels and self._dispatcher:
-                                for channel in channels:
-                                    try:
-                                        success = await self._dispatcher.send(
-                                            alert_id=alert_id,
-                                            warning=warning,
-                                            match=match,
-                                            channel=channel,
-                                        )
-                                        if success:
-                                            summary["notifications_sent"] += 1
-                                    except Exception as send_err:
-                                        logger.error(
-                                            "notification_send_error",
-                                            channel_id=channel.get("id"),
-                                            error=str(send_err),
-                                        )
-                                        summary["errors"].append(str(send_err))
+                            seen.add(key)
+                            pending.append((warning, match, code))
 
                 except Exception as detail_err:
                     logger.error(
                         "detail_fetch_error",
-                        code=item.code,
+                        code=code,
                         error=str(detail_err),
                     )
-                    summary["errors"].append(f"{item.code}: {detail_err}")
+                    summary["errors"].append(f"{code}: {detail_err}")
 
-            # 5. Mark expired alerts
-            expired = await self._state.mark_expired_alerts()
+            # Store every new match in one commit; notifications go out
+            # after the write lock is released.
+            stored: list[tuple[int, Any, Any]] = []
+            if pending:
+                try:
+                    stored = await self._state.store_alerts_bulk(pending)
+                    summary["new_alerts"] = len(stored)
+                    # Stored meanwhile by a concurrent cycle
+                    summary["duplicates_skipped"] += len(pending) - len(stored)
+                except Exception as store_err:
+                    logger.error("alert_store_error", error=str(store_err))
+                    summary["errors"].append(f"store: {store_err}")
+
+            if stored and channels and self._dispatcher:
+                # All alerts go to all channels at once; the dispatcher
+                # coalesces them per chat where the channel supports it
+                try:
+                    batches = await self._dispatcher.send_batch(
+                        alerts=stored,
+                        channels=channels,
+                    )
+                except Exception as exc:
+                    batches = [[exc] * len(channels) for _ in stored]
+                for batch in batches:
+                    for channel, result in zip(channels, batch):
+                        if isinstance(result, Exception):
+                            logger.error(
+                                "notification_send_error",
+                                channel_id=channel.get("id"),
+                                error=str(result),
+                            )
+                            summary["errors"].append(str(result))
+                        elif result:
+                            summary["notifications_sent"] += 1
+
+            # 5. Expired alerts (marked above, alongside the detail fetch)
             summary["expired_alerts"] = len(expired)
 
             # 6. Send trial notifications
-            summary["trial_notifications"] = await self._process_trials(nowcast, summary)
+            summary["trial_notifications"] = await self._process_trials(
+                details_by_code, trials
+            )
 
-            # 7. Expire trial subscriptions
+            # 7. Expire trial subscriptions (claimed right before notifying)
             summary["trials_expired"] = await self._expire_trials()
 
             # Build result
-            duration_ms = int(
-                (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-            )
+            duration_ms = (time.perf_counter_ns() - started_ns) // 1_000_000
             self._last_poll_result = (
                 f"OK: {summary['new_alerts']} new, "
                 f"{summary['duplicates_skipped']} dupes, "
@@ -254,7 +412,7 @@ class AlertEngine:
             await self._state.log_activity(
                 "poll_completed",
                 self._last_poll_result,
-                json.dumps(summary, default=str),
+                orjson.dumps(summary, default=str).decode(),
             )
 
         except Exception as exc:
@@ -266,84 +424,77 @@ class AlertEngine:
 
         return summary
 
-    async def _process_trials(self, nowcast: Any, summary: dict) -> int:
-        """Send Telegram notifications to matching trial subscribers."""
+    @staticmethod
+    def _gathered(result: Any, default: Any, step: str, summary: dict) -> Any:
+        """Unwrap a ``return_exceptions`` gather result, logging a failure."""
+        if not isinstance(result, BaseException):
+            return result
+        if not isinstance(result, Exception):
+            raise result
+        logger.error("poll_step_error", step=step, error=str(result))
+        summary["errors"].append(f"{step}: {result}")
+        return default
+
+    async def _get_active_trials(self) -> list[dict]:
+        """Fetch active trials, or nothing when trial notifications are off."""
+        if not settings.telegram_bot_token:
+            return []
+        return await self._state.get_active_trials()
+
+    async def _process_trials(
+        self, details_by_code: dict[str, Any], trials: list[dict]
+    ) -> int:
+        """Send Telegram notifications to matching trial subscribers.
+
+        Reuses the details fetched for this poll cycle, keyed by warning
+        code; failed fetches (exception values) are skipped.
+        """
         bot_token = settings.telegram_bot_token
-        if not bot_token:
+        if not bot_token or not trials:
+            return 0
+
+        warnings = [
+            warning
+            for detail in details_by_code.values()
+            if not isinstance(detail, BaseException)
+            for warning in detail.warnings
+            if not warning.is_expired
+        ]
+        if not warnings:
             return 0
 
-        trials = await self._state.get_active_trials()
+        # Trials whose threshold is above every warning this cycle can never
+        # match; skip indexing them (and the whole pass if none are left).
+        max_sev = max(warning.severity_rank for warning in warnings)
+        trials = [trial for trial in trials if _trial_severity(trial) <= max_sev]
         if not trials:
             return 0
 
-        sent_count = 0
-        telegram = TelegramSender()
+        index = _TrialIndex.build(trials)
+        sends: list[tuple[str, str]] = []
+
+        for warning in warnings:
+            for loc_label, chat_id in index.recipients(warning):
+                msg = (
+                    f"<b>Peringatan Cuaca — {warning.event}</b>\n"
+                    f"Severity: {warning.severity}\n\n"
+                    f"Lokasi Anda: {loc_label}\n"
+                    f"Berlaku: {warning.effective or '-'}\n"
+                    f"Hingga: {warning.expires or '-'}\n\n"
+                    f"{(warning.description or '')[:300]}\n\n"
+                    f"<i>BMKG Alert — Trial Mode</i>"
+                )
 
-        for item in nowcast.data:
-            try:
-                detail = await self._bmkg.get_nowcast_detail(item.code)
-            except Exception:
-                continue
-
-            for warning in detail.warnings:
-                if warning.is_expired:
-                    continue
-
-                description_lower = warning.description.lower()
-                area_names_lower = {a.name.lower() for a in warning.areas}
-                warn_sev = _SEVERITY_ORDER.get(warning.severity.lower(), 0)
-
-                for trial in trials:
-                    # Severity filter
-                    trial_threshold = trial.get("severity_threshold", "all")
-                    if trial_threshold != "all":
-                        trial_sev = _SEVERITY_ORDER.get(trial_threshold.lower(), 0)
-                        if warn_sev < trial_sev:
-                            continue
+                sends.append((chat_id, msg))
 
-                    # Location matching
-                    sub_name = trial.get("subdistrict_name", "").lower()
-                    dist_name = trial.get("district_name", "").lower()
-                    matched = False
-
-                    if sub_name and sub_name in description_lower:
-                        matched = True
-                    elif dist_name and any(dist_name in a for a in area_names_lower):
-                        matched = True
-
-                    if not matched:
-                        continue
-
-                    # Build and send message
-                    loc_label = trial.get("subdistrict_name", "")
-                    if trial.get("district_name"):
-                        loc_label += f", {trial['district_name']}"
-
-                    msg = (
-                        f"<b>Peringatan Cuaca — {warning.event}</b>\n"
-                        f"Severity: {warning.severity}\n\n"
-                        f"Lokasi Anda: {loc_label}\n"
-                        f"Berlaku: {warning.effective or '-'}\n"
-                        f"Hingga: {warning.expires or '-'}\n\n"
-                        f"{(warning.description or '')[:300]}\n\n"
-                        f"<i>BMKG Alert — Trial Mode</i>"
-                    )
-
-                    try:
-                        ok = await telegram.send_raw(
-                            bot_token=bot_token,
-                            chat_id=trial["telegram_chat_id"],
-                            message=msg,
-                        )
-                        if ok:
-                            sent_count += 1
-                    except Exception as e:
-                        logger.error("trial_send_error", chat_id=trial["telegram_chat_id"], error=str(e))
-
-        return sent_count
+        results = await _send_telegram_batch(bot_token, sends)
+        for (chat_id, _), result in zip(sends, results):
+            if isinstance(result, Exception):
+                logger.error("trial_send_error", chat_id=chat_id, error=str(result))
+        return sum(1 for result in results if result is True)
 
     async def _expire_trials(self) -> int:
-        """Expire trial subscriptions and notify via Telegram."""
+        """Mark expired trial subscriptions and notify them via Telegram."""
         expired_trials = await self._state.expire_trials()
         if not expired_trials:
             return 0
@@ -352,25 +503,42 @@ class AlertEngine:
         if not bot_token:
             return len(expired_trials)
 
-        telegram = TelegramSender()
-        for trial in expired_trials:
-            msg = (
-                "<b>Trial BMKG Alert Berakhir</b>\n\n"
-                "Trial 24 jam Anda telah berakhir. "
-                "Terima kasih sudah mencoba BMKG Alert!\n\n"
-                "Untuk mendapatkan notifikasi secara permanen, silakan cek di "
-                "<a href=\"https://github.com/dhanyyudi/bmkg-alert\">github.com/dhanyyudi/bmkg-alert</a> "
-                "atau hubungi <a href=\"https://dhanypedia.com\">dhanypedia.com</a>\n\n"
-                "<i>BMKG Alert System</i>"
-            )
-            try:
-                await telegram.send_raw(
-                    bot_token=bot_token,
-                    chat_id=trial["telegram_chat_id"],
-                    message=msg,
-                )
-            except Exception as e:
-                logger.error("trial_expire_notify_error", chat_id=trial["telegram_chat_id"], error=str(e))
+        msg = (
+            "<b>Trial BMKG Alert Berakhir</b>\n\n"
+            "Trial 24 jam Anda telah berakhir. "
+            "Terima kasih sudah mencoba BMKG Alert!\n\n"
+            "Untuk mendapatkan notifikasi secara permanen, silakan cek di "
+            "<a href=\"https://github.com/dhanyyudi/bmkg-alert\">github.com/dhanyyudi/bmkg-alert</a> "
+            "atau hubungi <a href=\"https://dhanypedia.com\">dhanypedia.com</a>\n\n"
+            "<i>BMKG Alert System</i>"
+        )
+        sends = [(trial["telegram_chat_id"], msg) for trial in expired_trials]
+        results = await _send_telegram_batch(bot_token, sends)
+        for (chat_id, _), result in zip(sends, results):
+            if isinstance(result, Exception):
+                logger.error("trial_expire_notify_error", chat_id=chat_id, error=str(result))
 
         logger.info("trials_expired", count=len(expired_trials))
         return len(expired_trials)
+
+
+async def _send_telegram_batch(
+    bot_token: str, sends: list[tuple[str, str]]
+) -> list[bool | BaseException]:
+    """Send ``(chat_id, message)`` pairs concurrently.
+
+    At most ``_TELEGRAM_CONCURRENCY`` requests are in flight. Results are in
+    ``sends`` order; a failed send yields its exception.
+    """
+    sem = asyncio.Semaphore(_TELEGRAM_CONCURRENCY)
+
+    async def one(chat_id: str, message: str) -> bool:
+        async with sem:
+            return await _telegram.send_raw(
+                bot_token=bot_token, chat_id=chat_id, message=message
+            )
+
+    return await asyncio.gather(
+        *(one(chat_id, message) for chat_id, message in sends),
+        return_exceptions=True,
+    )
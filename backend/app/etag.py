@@ -0,0 +1,30 @@
+"""ETag handling for memoized JSON response bodies."""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a rendered response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    return any(
+        tag.strip().removeprefix("W/") in (etag, "*")
+        for tag in if_none_match.split(",")
+    )
+
+
+def etag_response(
+    request: Request, body: bytes, etag: str, headers: dict[str, str]
+) -> Response:
+    """Send a memoized body, or 304 if the client already has it."""
+    headers = {"ETag": etag, **headers}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -2,14 +2,51 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from typing import Any
 
+import orjson
 import structlog
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSONRenderer serializer backed by orjson; output stays ``str`` for PrintLogger."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
+_render_stack = structlog.processors.StackInfoRenderer(additional_ignores=[__name__])
+
+
+def _render_exc_and_stack(logger: Any, method_name: str, event_dict: dict) -> dict:
+    """Run the stack/exception renderers only for events that carry them.
+
+    Most events have neither key, so the common path is two dict lookups.
+    """
+    if "stack_info" in event_dict:
+        event_dict = _render_stack(logger, method_name, event_dict)
+    if "exc_info" in event_dict:
+        event_dict = structlog.processors.format_exc_info(
+            logger, method_name, event_dict
+        )
+    return event_dict
+
+
+_listener: logging.handlers.QueueListener | None = None
+
+
 def setup_logging(log_level: str = "info") -> None:
-    """Configure structlog with JSON output for production, pretty for dev."""
+    """Configure structlog with JSON output for production, pretty for dev.
+
+    structlog and stdlib records share one processor chain and are rendered
+    in the calling thread, then handed to a ``QueueListener`` thread that
+    does the blocking write to stdout. A burst of notification logs costs
+    the event loop a queue put per line instead of a write.
+    """
+    global _listener
     level = getattr(logging, log_level.upper(), logging.INFO)
 
     is_dev = log_level.lower() in ("debug", "info")
@@ -18,28 +55,58 @@ def setup_logging(log_level: str = "info") -> None:
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        _render_exc_and_stack,
         structlog.processors.UnicodeDecoder(),
     ]
 
     renderer = (
         structlog.dev.ConsoleRenderer()
         if is_dev
-        else structlog.processors.JSONRenderer()
+        else structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     )
 
     structlog.configure(
-        processors=[*shared_processors, renderer],
+        processors=[
+            # Drop below-level events before the rest of the chain runs
+            structlog.stdlib.filter_by_level,
+            *shared_processors,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
-    # Also configure stdlib logging for uvicorn/httpx
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=level,
+    # Renders on the queue side; the listener's handler writes the
+    # finished line as-is.
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(
+        log_queue, logging.StreamHandler(sys.stdout)
     )
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Flush queued records on interpreter exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
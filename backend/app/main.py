@@ -14,8 +14,12 @@ from slowapi.errors import RateLimitExceeded
 from app.cache import cache
 from app.config import settings
 from app.core.auth import verify_admin
-from app.dependencies import limiter, set_bmkg_client, set_engine
+from app.dependencies import limiter
 from app.http_client import close_http_client
+from app.logging_config import setup_logging
+from app.routes.responses import ORJSONResponse
+from app.notifications.client import close_notification_client
+from app.notifications.email import close_smtp_connections
 from app.routes import (
     activity as activity_router,
     alerts as alerts_router,
@@ -29,10 +33,7 @@ from app.routes import (
 from app.routers import earthquake, health, nowcast, weather, wilayah
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging(settings.log_level)
 logger = logging.getLogger(__name__)
 
 
@@ -50,16 +51,18 @@ async def lifespan(app: FastAPI):
         logger.info("Connected to Redis")
 
     # 2. Initialize SQLite database for alert management
-    from app.database import init_database
-    db = init_database(settings.db_path)
+    from app.database import DatabaseManager
+    db = DatabaseManager(settings.db_path)
     await db.connect()
     await db.init_schema()
+    app.state.db = db
     logger.info("Database initialized: %s", settings.db_path)
 
-    # 3. Create BMKG API client and store as singleton
+    # 3. Create BMKG API client
     from app.engine.bmkg_client import HttpBMKGClient
     bmkg_client = HttpBMKGClient(base_url=settings.bmkg_api_url)
-    set_bmkg_client(bmkg_client)
+    await bmkg_client.open()
+    app.state.bmkg_client = bmkg_client
     logger.info("BMKG client configured: %s", settings.bmkg_api_url)
 
     # 4. Create and start AlertEngine
@@ -73,7 +76,7 @@ async def lifespan(app: FastAPI):
         state=state,
         notification_dispatcher=dispatcher,
     )
-    set_engine(engine)
+    app.state.engine = engine
     await engine.start()
     logger.info("Alert engine started")
 
@@ -91,6 +94,8 @@ async def lifespan(app: FastAPI):
     await cache.disconnect()
     await bmkg_client.close()
     await close_http_client()
+    await close_notification_client()
+    await close_smtp_connections()
     logger.info("Cleanup complete")
 
 
@@ -131,6 +136,7 @@ app = FastAPI(
     openapi_url="/openapi.json",
     lifespan=lifespan,
     openapi_tags=TAGS_METADATA,
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter
@@ -1,62 +1,131 @@
 """Pydantic models for the BMKG API."""
 
-from app.models.earthquake import (
-    Earthquake,
-    EarthquakeWithDistance,
-    EarthquakeListMeta,
-    NearbyEarthquakeMeta,
-)
-from app.models.weather import (
-    Location as WeatherLocation,
-    ForecastEntry,
-    ForecastDay,
-    WeatherForecast,
-    CurrentWeather,
-    WeatherForecastMeta,
-)
-from app.models.wilayah import (
-    Wilayah,
-    WilayahLevel,
-    WilayahSearchResult,
-    WilayahListResponse,
-    WilayahSearchResponse,
-)
-from app.models.nowcast import (
-    Area,
-    Warning,
-    ActiveProvince,
-    NowcastDetailResponse,
-    NowcastListResponse,
-    LocationCheckResult,
-    NowcastMeta,
-)
-from app.models.enums import (
-    Severity,
-    Urgency,
-    Certainty,
-    WeatherCode,
-    WEATHER_CODE_NAMES,
-)
-from app.models.responses import (
-    Meta,
-    APIResponse,
-    ErrorResponse,
-    HealthResponse,
-    ReadinessResponse,
-)
-from app.models.alert import (
-    MonitoredLocation,
-    MonitoredLocation as Location,  # alias used by engine files
-    AlertRecord,
-    AlertRecord as Alert,           # alias used by engine/state.py
-    MatchResult,
-    WarningInfo,
-    LocationCreate,
-    LocationUpdate,
-    ChannelCreate,
-    ChannelUpdate,
-    ConfigUpdate,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# one model does not build the whole schema graph.
+_LAZY: dict[str, tuple[str, str]] = {
+    "Earthquake": ("app.models.earthquake", "Earthquake"),
+    "EarthquakeWithDistance": ("app.models.earthquake", "EarthquakeWithDistance"),
+    "EarthquakeListMeta": ("app.models.earthquake", "EarthquakeListMeta"),
+    "NearbyEarthquakeMeta": ("app.models.earthquake", "NearbyEarthquakeMeta"),
+    "WeatherLocation": ("app.models.weather", "Location"),
+    "ForecastEntry": ("app.models.weather", "ForecastEntry"),
+    "ForecastDay": ("app.models.weather", "ForecastDay"),
+    "WeatherForecast": ("app.models.weather", "WeatherForecast"),
+    "CurrentWeather": ("app.models.weather", "CurrentWeather"),
+    "WeatherForecastMeta": ("app.models.weather", "WeatherForecastMeta"),
+    "Wilayah": ("app.models.wilayah", "Wilayah"),
+    "WilayahLevel": ("app.models.wilayah", "WilayahLevel"),
+    "WilayahSearchResult": ("app.models.wilayah", "WilayahSearchResult"),
+    "WilayahListResponse": ("app.models.wilayah", "WilayahListResponse"),
+    "WilayahSearchResponse": ("app.models.wilayah", "WilayahSearchResponse"),
+    "Area": ("app.models.nowcast", "Area"),
+    "Warning": ("app.models.nowcast", "Warning"),
+    "ActiveProvince": ("app.models.nowcast", "ActiveProvince"),
+    "NowcastDetailResponse": ("app.models.nowcast", "NowcastDetailResponse"),
+    "NowcastListResponse": ("app.models.nowcast", "NowcastListResponse"),
+    "LocationCheckResult": ("app.models.nowcast", "LocationCheckResult"),
+    "NowcastMeta": ("app.models.nowcast", "NowcastMeta"),
+    "Severity": ("app.models.enums", "Severity"),
+    "Urgency": ("app.models.enums", "Urgency"),
+    "Certainty": ("app.models.enums", "Certainty"),
+    "WeatherCode": ("app.models.enums", "WeatherCode"),
+    "WEATHER_CODE_NAMES": ("app.models.enums", "WEATHER_CODE_NAMES"),
+    "Meta": ("app.models.responses", "Meta"),
+    "APIResponse": ("app.models.responses", "APIResponse"),
+    "ErrorResponse": ("app.models.responses", "ErrorResponse"),
+    "HealthResponse": ("app.models.responses", "HealthResponse"),
+    "ReadinessResponse": ("app.models.responses", "ReadinessResponse"),
+    "MonitoredLocation": ("app.models.alert", "MonitoredLocation"),
+    "Location": ("app.models.alert", "MonitoredLocation"),
+    "AlertRecord": ("app.models.alert", "AlertRecord"),
+    "Alert": ("app.models.alert", "AlertRecord"),
+    "MatchResult": ("app.models.alert", "MatchResult"),
+    "WarningInfo": ("app.models.alert", "WarningInfo"),
+    "LocationCreate": ("app.models.alert", "LocationCreate"),
+    "LocationUpdate": ("app.models.alert", "LocationUpdate"),
+    "ChannelCreate": ("app.models.alert", "ChannelCreate"),
+    "ChannelUpdate": ("app.models.alert", "ChannelUpdate"),
+    "ConfigUpdate": ("app.models.alert", "ConfigUpdate"),
+    "validate_channel_config": ("app.models.alert", "validate_channel_config"),
+}
+
+if TYPE_CHECKING:
+    from app.models.earthquake import (
+        Earthquake,
+        EarthquakeWithDistance,
+        EarthquakeListMeta,
+        NearbyEarthquakeMeta,
+    )
+    from app.models.weather import (
+        Location as WeatherLocation,
+        ForecastEntry,
+        ForecastDay,
+        WeatherForecast,
+        CurrentWeather,
+        WeatherForecastMeta,
+    )
+    from app.models.wilayah import (
+        Wilayah,
+        WilayahLevel,
+        WilayahSearchResult,
+        WilayahListResponse,
+        WilayahSearchResponse,
+    )
+    from app.models.nowcast import (
+        Area,
+        Warning,
+        ActiveProvince,
+        NowcastDetailResponse,
+        NowcastListResponse,
+        LocationCheckResult,
+        NowcastMeta,
+    )
+    from app.models.enums import (
+        Severity,
+        Urgency,
+        Certainty,
+        WeatherCode,
+        WEATHER_CODE_NAMES,
+    )
+    from app.models.responses import (
+        Meta,
+        APIResponse,
+        ErrorResponse,
+        HealthResponse,
+        ReadinessResponse,
+    )
+    from app.models.alert import (
+        MonitoredLocation,
+        MonitoredLocation as Location,  # alias used by engine files
+        AlertRecord,
+        AlertRecord as Alert,           # alias used by engine/state.py
+        MatchResult,
+        WarningInfo,
+        LocationCreate,
+        LocationUpdate,
+        ChannelCreate,
+        ChannelUpdate,
+        ConfigUpdate,
+        validate_channel_config,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     # Earthquake
@@ -109,4 +178,5 @@ __all__ = [
     "ChannelCreate",
     "ChannelUpdate",
     "ConfigUpdate",
+    "validate_channel_config",
 ]
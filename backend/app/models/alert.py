@@ -6,9 +6,10 @@ dispatcher, and CRUD routes — separate from the BMKG API data models.
 
 from __future__ import annotations
 
-from typing import Any
+from functools import cached_property
+from typing import Any, NamedTuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 # Re-export Warning as WarningInfo so engine/dispatcher can use the same type
 # without importing directly from nowcast (avoids circular deps)
@@ -18,6 +19,10 @@ from app.models.nowcast import Warning as WarningInfo  # noqa: F401
 class MonitoredLocation(BaseModel):
     """A monitored location stored in the `locations` table."""
 
+    # Frozen: instances are cached across polls and carry cached lowercased
+    # names, so an in-place edit would leave both stale.
+    model_config = ConfigDict(frozen=True)
+
     id: int = 0
     label: str | None = None
     province_code: str = ""
@@ -31,6 +36,18 @@ class MonitoredLocation(BaseModel):
     enabled: bool = True
     created_at: str | None = None
 
+    # Lowercased names for the matcher; computed once per instance and
+    # not serialized. Instances live across polls (StateManager caches them
+    # until locations change), so anything cached here must derive only
+    # from the frozen fields.
+    @cached_property
+    def subdistrict_name_lower(self) -> str:
+        return self.subdistrict_name.lower()
+
+    @cached_property
+    def district_name_lower(self) -> str:
+        return self.district_name.lower()
+
 
 class LocationCreate(BaseModel):
     """Payload for creating a new monitored location."""
@@ -56,6 +73,8 @@ class LocationUpdate(BaseModel):
 class AlertRecord(BaseModel):
     """A matched alert stored in the `alerts` table."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: int = 0
     bmkg_alert_code: str = ""
     event: str | None = None
@@ -76,14 +95,72 @@ class AlertRecord(BaseModel):
     created_at: str | None = None
 
 
-class MatchResult(BaseModel):
-    """Result of matching a BMKG warning against a monitored location."""
+class MatchResult(NamedTuple):
+    """Result of matching a BMKG warning against a monitored location.
+
+    Internal plumbing built by the matcher for every hit and never
+    validated or serialised, so a plain tuple rather than a model.
+    """
 
     location: MonitoredLocation
     match_type: str  # 'kecamatan' | 'kabupaten'
     matched_text: str
 
 
+class _ChannelConfig(BaseModel):
+    """Fields a sender needs; anything else the UI stores is kept as is."""
+
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+
+class TelegramConfig(_ChannelConfig):
+    bot_token: str
+    chat_id: str
+
+
+class DiscordConfig(_ChannelConfig):
+    webhook_url: str
+
+
+class SlackConfig(_ChannelConfig):
+    webhook_url: str
+
+
+class EmailConfig(_ChannelConfig):
+    to_email: str
+    smtp_host: str | None = None
+    smtp_port: str | None = None
+    smtp_user: str | None = None
+    smtp_password: str | None = None
+
+
+class WebhookConfig(_ChannelConfig):
+    webhook_url: str
+    headers: dict[str, str] = {}
+
+
+_CHANNEL_CONFIGS: dict[str, type[_ChannelConfig]] = {
+    "telegram": TelegramConfig,
+    "discord": DiscordConfig,
+    "slack": SlackConfig,
+    "email": EmailConfig,
+    "webhook": WebhookConfig,
+}
+
+
+def validate_channel_config(channel_type: str, config: dict[str, Any]) -> dict[str, Any]:
+    """Check a channel config against its type once, at the API boundary.
+
+    Returns the dict to store, with numbers sent for text fields (such as
+    a numeric chat ID) turned into strings. Raises ``ValueError`` for an
+    unknown type and ``pydantic.ValidationError`` for a bad config.
+    """
+    model = _CHANNEL_CONFIGS.get(channel_type)
+    if model is None:
+        raise ValueError(f"Unsupported channel type: {channel_type}")
+    return model.model_validate(config).model_dump(exclude_unset=True)
+
+
 class ChannelCreate(BaseModel):
     """Payload for creating a notification channel."""
 
@@ -91,6 +168,11 @@ class ChannelCreate(BaseModel):
     enabled: bool = False
     config: dict[str, Any]
 
+    @model_validator(mode="after")
+    def _check_config(self) -> ChannelCreate:
+        self.config = validate_channel_config(self.channel_type, self.config)
+        return self
+
 
 class ChannelUpdate(BaseModel):
     """Payload for updating a notification channel (PATCH)."""
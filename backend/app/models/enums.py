@@ -12,6 +12,15 @@ class Severity(str, Enum):
     UNKNOWN = "Unknown"
 
 
+# Ordering for severity thresholds; Unknown is unranked and treated as Minor
+SEVERITY_RANK: dict[Severity, int] = {
+    Severity.MINOR: 0,
+    Severity.MODERATE: 1,
+    Severity.SEVERE: 2,
+    Severity.EXTREME: 3,
+}
+
+
 class Urgency(str, Enum):
     """CAP urgency levels."""
     IMMEDIATE = "Immediate"
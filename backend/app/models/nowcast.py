@@ -1,9 +1,11 @@
 """Pydantic models for nowcast (weather warning) data."""
 
 from datetime import datetime
+from functools import cached_property
+
 from pydantic import BaseModel, Field, ConfigDict
 
-from app.models.enums import Severity, Urgency, Certainty
+from app.models.enums import SEVERITY_RANK, Severity, Urgency, Certainty
 
 
 class Area(BaseModel):
@@ -69,6 +71,38 @@ class Warning(BaseModel):
     areas: list[Area] = Field(default_factory=list, description="Affected areas")
     is_expired: bool = Field(..., description="Whether the warning has expired")
 
+    # Lowercased copies for location matching — computed on first use and
+    # shared by every matcher run against this warning. Not serialized.
+    @cached_property
+    def description_lower(self) -> str:
+        return self.description.lower()
+
+    @cached_property
+    def area_names_lower(self) -> tuple[str, ...]:
+        return tuple(area.name.lower() for area in self.areas)
+
+    # Integer rank for severity-threshold comparisons (Unknown ranks as Minor)
+    @cached_property
+    def severity_rank(self) -> int:
+        return SEVERITY_RANK.get(self.severity, 0)
+
+    # Description (headline when empty) truncated for notification bodies —
+    # cut once and shared by every channel the warning fans out to.
+    @cached_property
+    def summary_short(self) -> str:
+        return _truncate(self.description or self.headline, 300)
+
+    @cached_property
+    def summary_long(self) -> str:
+        return _truncate(self.description or self.headline, 500)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to ``limit`` characters, ending with an ellipsis if cut."""
+    if len(text) > limit:
+        return text[: limit - 3] + "..."
+    return text
+
 
 class ActiveProvince(BaseModel):
     """Province with active weather warnings.
@@ -0,0 +1,192 @@
+"""Shared HTTP client and retry policy for notification senders."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+# One pool for every sender so webhook and Bot API calls reuse keep-alive
+# (and, where the server supports it, HTTP/2) connections across alerts.
+_client: httpx.AsyncClient | None = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Statuses worth retrying: rate limiting and transient upstream failures.
+# Every other 4xx (bad token, blocked chat, bad payload) is final.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_MAX_ATTEMPTS = 3
+_BACKOFF_BASE = 0.5
+# Longest single wait; a Retry-After beyond this is not waited out.
+_BACKOFF_CAP = 10.0
+# Consecutive failed sends to one host that open its circuit, and how long
+# it stays open before a single probe is let through.
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending while a host's circuit is open."""
+
+
+@dataclass(slots=True)
+class _Breaker:
+    """Circuit state for one host: closed, open until a deadline, or probing."""
+
+    failures: int = 0
+    open_until: float = 0.0
+    probing: bool = False
+
+    def allow(self, now: float) -> bool:
+        if self.failures < _BREAKER_THRESHOLD:
+            return True
+        if self.probing or now < self.open_until:
+            return False
+        # Half-open: let exactly one request through
+        self.probing = True
+        return True
+
+    def succeeded(self) -> None:
+        self.failures = 0
+        self.probing = False
+
+    def failed(self, now: float) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.failures >= _BREAKER_THRESHOLD:
+            self.open_until = now + _BREAKER_COOLDOWN
+
+
+_breakers: dict[str, _Breaker] = {}
+
+
+def get_notification_client() -> httpx.AsyncClient:
+    """Return the shared notification HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            # A slow read (Bot API under load) is worth waiting for; a
+            # connect or pool wait that long means the send should fail
+            # over to the retry policy instead.
+            timeout=httpx.Timeout(15.0, connect=5.0, write=5.0, pool=5.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                # Outlive the gap between sends within a poll cycle's burst
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+async def close_notification_client() -> None:
+    """Close the shared notification HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def post_with_retry(url: str, **kwargs) -> httpx.Response:
+    """POST through the shared client, retrying transient failures.
+
+    Retries ``RETRY_STATUSES`` and transport errors (including timeouts)
+    with exponential backoff and full jitter, honouring ``Retry-After``,
+    Discord's ``X-RateLimit-Reset-After`` or Telegram's
+    ``parameters.retry_after``. Returns the last response, or
+    raises the last transport error once attempts run out.
+
+    Each host has a circuit breaker: after ``_BREAKER_THRESHOLD`` sends in
+    a row end in a transport error or 5xx, further sends raise
+    ``CircuitOpenError`` without touching the network until
+    ``_BREAKER_COOLDOWN`` has passed and a probe succeeds.
+    """
+    host = httpx.URL(url).host
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = _Breaker()
+    if not breaker.allow(time.monotonic()):
+        raise CircuitOpenError(f"circuit open for {host}")
+
+    try:
+        response = await _post_with_retry(url, **kwargs)
+    except httpx.TransportError:
+        _record_failure(host, breaker)
+        raise
+    except BaseException:
+        # Cancelled mid-send: no verdict on the host
+        breaker.probing = False
+        raise
+    if response.status_code >= 500:
+        _record_failure(host, breaker)
+    else:
+        breaker.succeeded()
+    return response
+
+
+def _record_failure(host: str, breaker: _Breaker) -> None:
+    breaker.failed(time.monotonic())
+    if breaker.failures >= _BREAKER_THRESHOLD:
+        logger.warning(
+            "notification_circuit_open",
+            host=host,
+            failures=breaker.failures,
+            cooldown=_BREAKER_COOLDOWN,
+        )
+
+
+async def _post_with_retry(url: str, **kwargs) -> httpx.Response:
+    for attempt in range(_MAX_ATTEMPTS - 1):
+        try:
+            response = await get_notification_client().post(url, **kwargs)
+        except httpx.TransportError as exc:
+            delay = _backoff(attempt)
+            logger.warning(
+                "notification_retry", attempt=attempt + 1, error=str(exc), delay=delay
+            )
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+            elif delay > _BACKOFF_CAP:
+                return response
+            logger.warning(
+                "notification_retry",
+                attempt=attempt + 1,
+                status=response.status_code,
+                delay=delay,
+            )
+        await asyncio.sleep(delay)
+    return await get_notification_client().post(url, **kwargs)
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds the server asked us to wait, if it said."""
+    # Discord's bucket reset is finer-grained than its Retry-After
+    header = response.headers.get("x-ratelimit-reset-after") or response.headers.get(
+        "retry-after"
+    )
+    if header is not None:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            return None
+    if response.status_code == 429:
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return None
+    return None
@@ -5,25 +5,20 @@ from __future__ import annotations
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 
 from app.models import MatchResult, WarningInfo
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.notifications.sent_log import SentLog
+from app.notifications.severity import severity_style
 
 logger = structlog.get_logger()
+_sent = SentLog("discord_message_sent", "discord_messages_sent")
 
-SEVERITY_COLOR = {
-    "Minor": 0x3B82F6,      # blue
-    "Moderate": 0xEAB308,    # yellow
-    "Severe": 0xEF4444,      # red
-    "Extreme": 0x1F2937,     # dark
-}
-
-SEVERITY_EMOJI = {
-    "Minor": "\U0001f535",
-    "Moderate": "\U0001f7e1",
-    "Severe": "\U0001f534",
-    "Extreme": "\u26ab",
-}
+# Shared by every payload; only ever serialised, never mutated.
+_FOOTER = {"text": "BMKG Alert System v1.0 | Sumber: BMKG (bmkg.go.id)"}
+_TRIAL_CONTENT = "\u23f3 *Mode Trial — notifikasi aktif sementara.*"
 
 
 class DiscordSender:
@@ -51,13 +46,10 @@ class DiscordSender:
     def _build_embed(
         self, warning: WarningInfo, match: MatchResult, is_trial: bool
     ) -> dict:
-        emoji = SEVERITY_EMOJI.get(warning.severity, "\u26a0\ufe0f")
+        style = severity_style(warning.severity)
         loc = match.location
-        color = SEVERITY_COLOR.get(warning.severity, 0x6B7280)
 
-        description = warning.description or warning.headline or ""
-        if len(description) > 300:
-            description = description[:297] + "..."
+        description = warning.summary_short
 
         fields = [
             {"name": "Lokasi Terpantau", "value": loc.label or loc.subdistrict_name, "inline": True},
@@ -72,11 +64,11 @@ class DiscordSender:
             )
 
         embed: dict[str, Any] = {
-            "title": f"{emoji} Peringatan Cuaca — {warning.event}",
+            "title": f"{style.emoji} Peringatan Cuaca — {warning.event}",
             "description": description,
-            "color": color,
+            "color": style.color,
             "fields": fields,
-            "footer": {"text": "BMKG Alert System v1.0 | Sumber: BMKG (bmkg.go.id)"},
+            "footer": _FOOTER,
         }
 
         if warning.infographic_url:
@@ -85,17 +77,18 @@ class DiscordSender:
         payload: dict[str, Any] = {"embeds": [embed]}
 
         if is_trial:
-            payload["content"] = "\u23f3 *Mode Trial — notifikasi aktif sementara.*"
+            payload["content"] = _TRIAL_CONTENT
 
         return payload
 
     async def _post(self, webhook_url: str, payload: dict) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(webhook_url, json=payload)
+            response = await post_with_retry(
+                webhook_url, content=orjson.dumps(payload), headers=JSON_HEADERS
+            )
 
             if response.status_code in (200, 204):
-                logger.info("discord_message_sent")
+                _sent.record()
                 return True
 
             logger.error(
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
@@ -17,6 +20,22 @@ from app.notifications.webhook import WebhookSender
 
 logger = structlog.get_logger()
 
+# Seconds the quiet-hours config is cached between sends
+_QUIET_HOURS_TTL = 60
+# Sender calls in flight at once across every fan-out (bulkhead)
+_MAX_IN_FLIGHT = 16
+
+
+@dataclass(frozen=True, slots=True)
+class _QuietHours:
+    """Parsed quiet-hours config."""
+
+    enabled: bool
+    override_severe: bool
+    start_hour: int | None
+    end_hour: int | None
+    expires_at: float
+
 
 class NotificationDispatcher:
     """Routes alert notifications to configured channel senders."""
@@ -28,6 +47,15 @@ class NotificationDispatcher:
         self._slack = SlackSender()
         self._email = EmailSender()
         self._webhook = WebhookSender()
+        self._quiet_hours: _QuietHours | None = None
+        self._in_flight = asyncio.Semaphore(_MAX_IN_FLIGHT)
+        self._senders = {
+            "telegram": self._telegram,
+            "discord": self._discord,
+            "slack": self._slack,
+            "email": self._email,
+            "webhook": self._webhook,
+        }
 
     async def send(
         self,
@@ -47,42 +75,142 @@ class NotificationDispatcher:
         Returns:
             True if notification was sent successfully.
         """
-        channel_id = channel.get("id", 0)
-        channel_type = channel.get("channel_type", "")
-        channel_config = channel.get("config", {})
+        if await self._is_quiet_hours(warning.severity):
+            await self._skip_quiet_hours(alert_id, channel)
+            return False
+        return await self._deliver(alert_id, warning, match, channel)
 
-        # Check quiet hours
+    async def send_many(
+        self,
+        alert_id: int,
+        warning: WarningInfo,
+        match: MatchResult,
+        channels: list[dict[str, Any]],
+    ) -> list[bool | BaseException]:
+        """Send one alert to several channels concurrently.
+
+        Quiet hours are checked once for the whole fan-out. At most
+        ``_MAX_IN_FLIGHT`` sender calls run at once across all fan-outs.
+
+        Args:
+            alert_id: ID of the stored alert.
+            warning: The BMKG warning details.
+            match: The matched location.
+            channels: Channel dicts with 'id', 'channel_type', 'config'.
+
+        Returns:
+            One result per channel, in ``channels`` order: True if sent, or
+            the exception raised by that delivery.
+        """
         if await self._is_quiet_hours(warning.severity):
-            logger.info(
-                "notification_skipped_quiet_hours",
-                channel_id=channel_id,
-                alert_id=alert_id,
+            for channel in channels:
+                await self._skip_quiet_hours(alert_id, channel)
+            return [False] * len(channels)
+        return await asyncio.gather(
+            *(
+                self._deliver(alert_id, warning, match, channel)
+                for channel in channels
+            ),
+            return_exceptions=True,
+        )
+
+    async def send_batch(
+        self,
+        alerts: list[tuple[int, WarningInfo, MatchResult]],
+        channels: list[dict[str, Any]],
+    ) -> list[list[bool | BaseException]]:
+        """Send several alerts to several channels.
+
+        Channels whose sender has a ``send_batch`` (Telegram) receive the
+        alerts coalesced into as few messages as fit; every other channel
+        gets each alert through ``send_many``. All sends run concurrently.
+        Quiet hours are checked per alert.
+
+        Args:
+            alerts: ``(alert_id, warning, match)`` for each stored alert.
+            channels: Channel dicts with 'id', 'channel_type', 'config'.
+
+        Returns:
+            Per alert, in ``alerts`` order, one result per channel in
+            ``channels`` order: True if sent, or the exception raised.
+        """
+        results: list[list[bool | BaseException]] = [
+            [False] * len(channels) for _ in alerts
+        ]
+        coalesced = [
+            col
+            for col, channel in enumerate(channels)
+            if len(alerts) > 1
+            and hasattr(self._senders.get(channel.get("channel_type", "")), "send_batch")
+        ]
+        single = [col for col in range(len(channels)) if col not in coalesced]
+
+        async def to_alert(row: int) -> None:
+            alert_id, warning, match = alerts[row]
+            outcomes = await self.send_many(
+                alert_id, warning, match, [channels[col] for col in single]
             )
-            await self._state.log_delivery(
-                alert_id, channel_id, "skipped_quiet_hours"
+            for col, outcome in zip(single, outcomes):
+                results[row][col] = outcome
+
+        async def to_channel(col: int) -> None:
+            channel = channels[col]
+            due: list[int] = []
+            for row, (alert_id, warning, _) in enumerate(alerts):
+                if await self._is_quiet_hours(warning.severity):
+                    await self._skip_quiet_hours(alert_id, channel)
+                else:
+                    due.append(row)
+            if not due:
+                return
+            outcomes = await self._deliver_batch(
+                [alerts[row] for row in due],
+                channel,
+                self._senders[channel["channel_type"]],
             )
-            return False
+            for row, outcome in zip(due, outcomes):
+                results[row][col] = outcome
+
+        await asyncio.gather(
+            *(to_channel(col) for col in coalesced),
+            *(to_alert(row) for row in range(len(alerts)) if single),
+        )
+        return results
+
+    async def _skip_quiet_hours(self, alert_id: int, channel: dict[str, Any]) -> None:
+        channel_id = channel.get("id", 0)
+        logger.info(
+            "notification_skipped_quiet_hours",
+            channel_id=channel_id,
+            alert_id=alert_id,
+        )
+        await self._state.log_delivery(alert_id, channel_id, "skipped_quiet_hours")
+
+    async def _deliver(
+        self,
+        alert_id: int,
+        warning: WarningInfo,
+        match: MatchResult,
+        channel: dict[str, Any],
+    ) -> bool:
+        """Route to the channel's sender and record the delivery result."""
+        channel_id = channel.get("id", 0)
+        channel_type = channel.get("channel_type", "")
+        channel_config = channel.get("config", {})
 
-        # Route to the appropriate sender
         success = False
         error_msg = ""
 
         try:
-            sender_map = {
-                "telegram": self._telegram,
-                "discord": self._discord,
-                "slack": self._slack,
-                "email": self._email,
-                "webhook": self._webhook,
-            }
-            sender = sender_map.get(channel_type)
+            sender = self._senders.get(channel_type)
 
             if sender:
-                success = await sender.send(
-                    warning=warning,
-                    match=match,
-                    channel_config=channel_config,
-                )
+                async with self._in_flight:
+                    success = await sender.send(
+                        warning=warning,
+                        match=match,
+                        channel_config=channel_config,
+                    )
             else:
                 logger.warn(
                     "unsupported_channel_type",
@@ -105,37 +233,92 @@ class NotificationDispatcher:
 
         return success
 
+    async def _deliver_batch(
+        self,
+        alerts: list[tuple[int, WarningInfo, MatchResult]],
+        channel: dict[str, Any],
+        sender: Any,
+    ) -> list[bool]:
+        """Send ``alerts`` through ``sender.send_batch`` and record each result."""
+        channel_id = channel.get("id", 0)
+        error_msg = ""
+        try:
+            async with self._in_flight:
+                sent = await sender.send_batch(
+                    [(warning, match) for _, warning, match in alerts],
+                    channel.get("config", {}),
+                )
+        except Exception as exc:
+            error_msg = str(exc)
+            logger.error(
+                "notification_dispatch_error",
+                channel_id=channel_id,
+                channel_type=channel.get("channel_type", ""),
+                error=error_msg,
+            )
+            sent = [False] * len(alerts)
+
+        for (alert_id, _, _), success in zip(alerts, sent):
+            status = "sent" if success else "failed"
+            await self._state.log_delivery(alert_id, channel_id, status, error_msg)
+        return sent
+
+    def invalidate_quiet_hours(self) -> None:
+        """Re-read the quiet-hours config on the next send."""
+        self._quiet_hours = None
+
+    async def _get_quiet_hours(self) -> _QuietHours:
+        """Return the quiet-hours config, re-read at most every ``_QUIET_HOURS_TTL``."""
+        now = time.monotonic()
+        cfg = self._quiet_hours
+        if cfg is not None and now < cfg.expires_at:
+            return cfg
+
+        get = self._state.get_config_value
+        enabled = await get("quiet_hours_enabled", "false") == "true"
+        override_severe = await get("quiet_hours_override_severe", "true") == "true"
+        start_str = await get("quiet_hours_start", "22:00")
+        end_str = await get("quiet_hours_end", "06:00")
+        try:
+            start_hour: int | None = int(start_str.split(":")[0])
+            end_hour: int | None = int(end_str.split(":")[0])
+        except (ValueError, IndexError):
+            start_hour = end_hour = None
+
+        cfg = _QuietHours(
+            enabled=enabled,
+            override_severe=override_severe,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            expires_at=now + _QUIET_HOURS_TTL,
+        )
+        self._quiet_hours = cfg
+        return cfg
+
     async def _is_quiet_hours(self, severity: str) -> bool:
         """Check if current time is within quiet hours.
 
         Severe/Extreme warnings bypass quiet hours if configured.
         """
-        enabled = await self._state.get_config_value(
-            "quiet_hours_enabled", "false"
-        )
-        if enabled != "true":
+        cfg = await self._get_quiet_hours()
+        if not cfg.enabled:
             return False
 
-        override_severe = await self._state.get_config_value(
-            "quiet_hours_override_severe", "true"
-        )
-        if override_severe == "true" and severity in ("Severe", "Extreme"):
+        if cfg.override_severe and severity in ("Severe", "Extreme"):
             return False
 
-        start_str = await self._state.get_config_value("quiet_hours_start", "22:00")
-        end_str = await self._state.get_config_value("quiet_hours_end", "06:00")
-
-        try:
-            now = datetime.now(timezone.utc).hour
-            # Convert to local Jakarta time (UTC+7)
-            local_hour = (now + 7) % 24
-            start_hour = int(start_str.split(":")[0])
-            end_hour = int(end_str.split(":")[0])
-
-            if start_hour > end_hour:
-                # Overnight: e.g., 22:00 - 06:00
-                return local_hour >= start_hour or local_hour < end_hour
-            else:
-                return start_hour <= local_hour < end_hour
-        except (ValueError, IndexError):
+        # Unparseable start/end: never quiet
+        if cfg.start_hour is None or cfg.end_hour is None:
             return False
+
+        now = datetime.now(timezone.utc).hour
+        # Convert to local Jakarta time (UTC+7)
+        local_hour = (now + 7) % 24
+        start_hour = cfg.start_hour
+        end_hour = cfg.end_hour
+
+        if start_hour > end_hour:
+            # Overnight: e.g., 22:00 - 06:00
+            return local_hour >= start_hour or local_hour < end_hour
+        else:
+            return start_hour <= local_hour < end_hour
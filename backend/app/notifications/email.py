@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import asyncio
+import base64
+from email.header import Header
+from email.utils import formataddr, parseaddr
 from typing import Any
 
 import aiosmtplib
@@ -11,15 +13,55 @@ import structlog
 
 from app.config import settings
 from app.models import MatchResult, WarningInfo
+from app.notifications.sent_log import SentLog
+from app.notifications.severity import severity_style
 
 logger = structlog.get_logger()
+_sent = SentLog("email_sent", "emails_sent")
 
-SEVERITY_COLOR = {
-    "Minor": "#3B82F6",
-    "Moderate": "#EAB308",
-    "Severe": "#EF4444",
-    "Extreme": "#1F2937",
-}
+# Open SMTP sessions keyed by (host, port, user), reused across alerts so a
+# send skips the TCP + TLS + AUTH handshake. SMTP is strictly sequential,
+# so each session has its own lock.
+_SmtpKey = tuple[str, int, str]
+_connections: dict[_SmtpKey, aiosmtplib.SMTP] = {}
+_locks: dict[_SmtpKey, asyncio.Lock] = {}
+
+# HTML body scaffolding, filled in per alert with ``str.format_map``.
+_EMAIL_TEMPLATE = """
+        <div style="font-family:sans-serif;max-width:600px;margin:0 auto;">
+            <div style="background:{color};color:white;padding:16px 20px;border-radius:8px 8px 0 0;">
+                <h2 style="margin:0;">Peringatan Cuaca — {event}</h2>
+                <p style="margin:4px 0 0;opacity:0.9;">{severity}</p>
+            </div>
+            <div style="border:1px solid #E5E7EB;border-top:none;padding:20px;border-radius:0 0 8px 8px;">
+                <table style="width:100%;font-size:14px;border-collapse:collapse;">
+                    <tr>
+                        <td style="padding:6px 0;color:#6B7280;width:120px;">Lokasi</td>
+                        <td style="padding:6px 0;font-weight:600;">{location_name}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding:6px 0;color:#6B7280;">Wilayah</td>
+                        <td style="padding:6px 0;">{subdistrict}, {district}, {province}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding:6px 0;color:#6B7280;">Berlaku</td>
+                        <td style="padding:6px 0;">{effective}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding:6px 0;color:#6B7280;">Hingga</td>
+                        <td style="padding:6px 0;">{expires}</td>
+                    </tr>
+                </table>
+                <p style="margin-top:16px;color:#374151;">{description}</p>
+                {infographic_html}
+                {trial_html}
+                <hr style="border:none;border-top:1px solid #E5E7EB;margin:16px 0;" />
+                <p style="font-size:12px;color:#9CA3AF;">
+                    Sumber: BMKG (bmkg.go.id) | BMKG Alert System v1.0
+                </p>
+            </div>
+        </div>
+        """
 
 
 class EmailSender:
@@ -67,14 +109,12 @@ class EmailSender:
         self, warning: WarningInfo, match: MatchResult, is_trial: bool
     ) -> tuple[str, str]:
         loc = match.location
-        color = SEVERITY_COLOR.get(warning.severity, "#6B7280")
+        color = severity_style(warning.severity).color_hex
         location_name = loc.label or loc.subdistrict_name
 
         subject = f"[BMKG Alert] {warning.severity}: {warning.event} — {location_name}"
 
-        description = warning.description or warning.headline or ""
-        if len(description) > 500:
-            description = description[:497] + "..."
+        description = warning.summary_long
 
         infographic_html = ""
         if warning.infographic_url:
@@ -90,41 +130,20 @@ class EmailSender:
                 'Mode Trial — notifikasi aktif sementara.</p>'
             )
 
-        html = f"""
-        <div style="font-family:sans-serif;max-width:600px;margin:0 auto;">
-            <div style="background:{color};color:white;padding:16px 20px;border-radius:8px 8px 0 0;">
-                <h2 style="margin:0;">Peringatan Cuaca — {warning.event}</h2>
-                <p style="margin:4px 0 0;opacity:0.9;">{warning.severity}</p>
-            </div>
-            <div style="border:1px solid #E5E7EB;border-top:none;padding:20px;border-radius:0 0 8px 8px;">
-                <table style="width:100%;font-size:14px;border-collapse:collapse;">
-                    <tr>
-                        <td style="padding:6px 0;color:#6B7280;width:120px;">Lokasi</td>
-                        <td style="padding:6px 0;font-weight:600;">{location_name}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding:6px 0;color:#6B7280;">Wilayah</td>
-                        <td style="padding:6px 0;">{loc.subdistrict_name}, {loc.district_name}, {loc.province_name}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding:6px 0;color:#6B7280;">Berlaku</td>
-                        <td style="padding:6px 0;">{warning.effective or '-'}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding:6px 0;color:#6B7280;">Hingga</td>
-                        <td style="padding:6px 0;">{warning.expires or '-'}</td>
-                    </tr>
-                </table>
-                <p style="margin-top:16px;color:#374151;">{description}</p>
-                {infographic_html}
-                {trial_html}
-                <hr style="border:none;border-top:1px solid #E5E7EB;margin:16px 0;" />
-                <p style="font-size:12px;color:#9CA3AF;">
-                    Sumber: BMKG (bmkg.go.id) | BMKG Alert System v1.0
-                </p>
-            </div>
-        </div>
-        """
+        html = _EMAIL_TEMPLATE.format_map({
+            "color": color,
+            "event": warning.event,
+            "severity": warning.severity,
+            "location_name": location_name,
+            "subdistrict": loc.subdistrict_name,
+            "district": loc.district_name,
+            "province": loc.province_name,
+            "effective": warning.effective or "-",
+            "expires": warning.expires or "-",
+            "description": description,
+            "infographic_html": infographic_html,
+            "trial_html": trial_html,
+        })
 
         return subject, html
 
@@ -135,27 +154,114 @@ class EmailSender:
         if smtp is None:
             smtp = self._resolve_smtp({})
         try:
-            msg = MIMEMultipart("alternative")
-            msg["From"] = smtp["from_addr"]
-            msg["To"] = to_email
-            msg["Subject"] = subject
-
-            content_type = "html" if is_html else "plain"
-            msg.attach(MIMEText(body, content_type, "utf-8"))
-
-            port = smtp["port"]
-            await aiosmtplib.send(
-                msg,
-                hostname=smtp["host"],
-                port=port,
-                username=smtp["user"],
-                password=smtp["password"],
-                use_tls=port == 465,
-                start_tls=port == 587,
+            from_addr = smtp["from_addr"]
+            message = _build_message(
+                from_addr, to_email, subject, body, "html" if is_html else "plain"
             )
+            await send_pooled(smtp, parseaddr(from_addr)[1], [to_email], message)
 
-            logger.info("email_sent", to=to_email)
+            _sent.record(to=to_email)
             return True
         except Exception as exc:
             logger.error("email_send_error", error=str(exc), to=to_email)
             return False
+
+
+def _build_message(
+    from_addr: str, to_email: str, subject: str, body: str, subtype: str
+) -> bytes:
+    """Assemble a single-part RFC 5322 message as wire bytes.
+
+    Every alert email has the same shape — a handful of headers and one
+    UTF-8 text part — so it is written directly instead of going through
+    ``email.generator``. The body is base64-encoded, which needs no
+    8BITMIME support and keeps lines short.
+    """
+    headers = (
+        f"From: {_address_header(from_addr)}\r\n"
+        f"To: {_address_header(to_email)}\r\n"
+        f"Subject: {_text_header(subject)}\r\n"
+        "MIME-Version: 1.0\r\n"
+        f'Content-Type: text/{subtype}; charset="utf-8"\r\n'
+        "Content-Transfer-Encoding: base64\r\n"
+        "\r\n"
+    )
+    encoded = base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n")
+    return headers.encode("ascii") + encoded
+
+
+def _text_header(value: str) -> str:
+    # Line breaks would end the header early; non-ASCII needs RFC 2047.
+    value = " ".join(value.splitlines())
+    if value.isascii():
+        return value
+    return Header(value, "utf-8").encode()
+
+
+def _address_header(value: str) -> str:
+    if value.isascii():
+        return " ".join(value.splitlines())
+    return formataddr(parseaddr(value), "utf-8")
+
+
+async def _connect(smtp: dict[str, Any]) -> aiosmtplib.SMTP:
+    port = smtp["port"]
+    client = aiosmtplib.SMTP(
+        hostname=smtp["host"],
+        port=port,
+        username=smtp["user"],
+        password=smtp["password"],
+        use_tls=port == 465,
+        start_tls=port == 587,
+    )
+    await client.connect()
+    return client
+
+
+async def send_pooled(
+    smtp: dict[str, Any], sender: str, recipients: list[str], message: bytes
+) -> None:
+    """Send ``message`` over the pooled session for ``smtp``, reconnecting as needed.
+
+    Servers drop idle sessions between polls; that surfaces as
+    ``SMTPServerDisconnected`` on the first command and is retried once on a
+    fresh session. Any other failure discards the session.
+    """
+    key = (smtp["host"], smtp["port"], smtp["user"])
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        client = _connections.get(key)
+        if client is not None and client.is_connected:
+            try:
+                await client.sendmail(sender, recipients, message)
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                pass
+            except Exception:
+                _discard(key)
+                raise
+        _discard(key)
+        client = await _connect(smtp)
+        _connections[key] = client
+        try:
+            await client.sendmail(sender, recipients, message)
+        except Exception:
+            _discard(key)
+            raise
+
+
+def _discard(key: _SmtpKey) -> None:
+    client = _connections.pop(key, None)
+    if client is not None:
+        client.close()
+
+
+async def close_smtp_connections() -> None:
+    """Quit every pooled SMTP session."""
+    clients = list(_connections.values())
+    _connections.clear()
+    for client in clients:
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
@@ -3,14 +3,26 @@
 from __future__ import annotations
 
 from app.models import MatchResult, WarningInfo
+from app.notifications.severity import severity_style
 
-# Severity emoji mapping
-SEVERITY_EMOJI = {
-    "Minor": "🔵",
-    "Moderate": "🟡",
-    "Severe": "🔴",
-    "Extreme": "⚫",
-}
+_SEP = "─" * 30
+
+# UTC offset (as it appears in an ISO timestamp) -> Indonesian zone label
+_TZ_LABELS = {"+07": "WIB", "+08": "WITA", "+09": "WIT"}
+
+# Static scaffolding, built once; only the per-alert fields are filled in.
+_HEADER_TEMPLATE = (
+    "{emoji} <b>Peringatan Cuaca — {event}</b>\n"
+    "\n"
+    "📍 <b>Lokasi Terpantau:</b> {label}\n"
+    "   {subdistrict}, {district}, {province}\n"
+    "\n"
+    "⚡ <b>Tingkat:</b> {severity}\n"
+    "🕐 <b>Berlaku:</b> {effective}\n"
+    "⏰ <b>Hingga:</b> {expires}"
+)
+_TRIAL_FOOTER = f"\n\n{_SEP}\n⏳ <i>Mode Trial — langganan aktif selama 7 hari.</i>"
+_ATTRIBUTION_FOOTER = f"\n\n{_SEP}\n📡 Sumber: BMKG (bmkg.go.id)\n🤖 BMKG Alert System v1.0"
 
 
 def format_telegram_message(
@@ -28,58 +40,37 @@ def format_telegram_message(
     Returns:
         HTML-formatted message string for Telegram sendMessage.
     """
-    emoji = SEVERITY_EMOJI.get(warning.severity, "⚠️")
     location = match.location
-
-    # Build header
-    lines = [
-        f"{emoji} <b>Peringatan Cuaca — {warning.event}</b>",
-        "",
-        f"📍 <b>Lokasi Terpantau:</b> {location.label or location.subdistrict_name}",
-        f"   {location.subdistrict_name}, {location.district_name}, {location.province_name}",
-        "",
-        f"⚡ <b>Tingkat:</b> {warning.severity}",
-        f"🕐 <b>Berlaku:</b> {_format_time(warning.effective)}",
-        f"⏰ <b>Hingga:</b> {_format_time(warning.expires)}",
+    parts = [
+        _HEADER_TEMPLATE.format_map({
+            "emoji": severity_style(warning.severity).emoji,
+            "event": warning.event,
+            "label": location.label or location.subdistrict_name,
+            "subdistrict": location.subdistrict_name,
+            "district": location.district_name,
+            "province": location.province_name,
+            "severity": warning.severity,
+            "effective": _format_time(warning.effective),
+            "expires": _format_time(warning.expires),
+        })
     ]
 
     # Add description (truncated for Telegram)
     if warning.description:
-        desc = warning.description
-        if len(desc) > 500:
-            desc = desc[:497] + "..."
-        lines.extend(["", f"📝 {desc}"])
-
-    # Add match info
-    lines.extend([
-        "",
-        f"🔍 <i>Cocok: {match.match_type} — {match.matched_text}</i>",
-    ])
-
-    # Add infographic link
+        parts.append(f"\n\n📝 {warning.summary_long}")
+
+    parts.append(f"\n\n🔍 <i>Cocok: {match.match_type} — {match.matched_text}</i>")
+
     if warning.infographic_url:
-        lines.extend([
-            "",
-            f"🗺️ <a href=\"{warning.infographic_url}\">Lihat Infografis BMKG</a>",
-        ])
+        parts.append(
+            f"\n\n🗺️ <a href=\"{warning.infographic_url}\">Lihat Infografis BMKG</a>"
+        )
 
-    # Trial mode footer
     if is_trial:
-        lines.extend([
-            "",
-            "─" * 30,
-            "⏳ <i>Mode Trial — langganan aktif selama 7 hari.</i>",
-        ])
-
-    # Attribution
-    lines.extend([
-        "",
-        "─" * 30,
-        "📡 Sumber: BMKG (bmkg.go.id)",
-        "🤖 BMKG Alert System v1.0",
-    ])
+        parts.append(_TRIAL_FOOTER)
 
-    return "\n".join(lines)
+    parts.append(_ATTRIBUTION_FOOTER)
+    return "".join(parts)
 
 
 def format_expiry_message(
@@ -100,28 +91,18 @@ def format_expiry_message(
 
 
 def _format_time(iso_str) -> str:
-    """Format ISO timestamp to a human-readable Indonesian time string."""
+    """Format ISO timestamp to a human-readable Indonesian time string.
+
+    BMKG timestamps have the fixed shape ``YYYY-MM-DDTHH:MM:SS+HH:MM``, so
+    the date, time and offset are read at fixed positions:
+    ``"2026-02-17T19:55:00+07:00"`` becomes ``"2026-02-17 19:55 WIB"``.
+    Anything else is returned unchanged.
+    """
     if not iso_str:
         return "-"
     # Accept datetime objects as well as ISO strings
-    if hasattr(iso_str, 'isoformat'):
-        iso_str = iso_str.isoformat()
-    # Parse and format — the BMKG API already includes timezone offset
-    # We just clean it up for display
-    try:
-        # Remove the timezone offset for cleaner display
-        # Input: "2026-02-17T19:55:00+07:00"
-        if "T" in iso_str:
-            date_part, time_part = iso_str.split("T")
-            # Get time without timezone
-            time_clean = time_part[:5]  # "19:55"
-            # Determine timezone label
-            tz_label = "WIB"
-            if "+08" in time_part:
-                tz_label = "WITA"
-            elif "+09" in time_part:
-                tz_label = "WIT"
-            return f"{date_part} {time_clean} {tz_label}"
-    except (ValueError, IndexError):
-        pass
-    return iso_str
+    if hasattr(iso_str, "isoformat"):
+        iso_str = iso_str.isoformat(timespec="seconds")
+    if len(iso_str) < 16 or iso_str[10] != "T":
+        return iso_str
+    return f"{iso_str[:10]} {iso_str[11:16]} {_TZ_LABELS.get(iso_str[19:22], 'WIB')}"
@@ -0,0 +1,57 @@
+"""Aggregated success logging for notification senders."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Seconds a summary window stays open after its first send
+_WINDOW = 1.0
+
+
+class SentLog:
+    """Counts successful sends and logs one summary record per window.
+
+    A fan-out can hit the same sender hundreds of times in a burst, so the
+    info-level record carries a ``count`` instead of repeating per message.
+    Per-message details still go out at debug level; failures are logged
+    individually by the senders.
+    """
+
+    def __init__(self, event: str, summary_event: str) -> None:
+        self._event = event
+        self._summary_event = summary_event
+        self._count = 0
+        self._opened_at = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def record(self, **fields: Any) -> None:
+        """Count one successful send."""
+        logger.debug(self._event, **fields)
+        now = time.monotonic()
+        if self._count and now - self._opened_at >= _WINDOW:
+            # The scheduled flush never ran (e.g. its loop has gone away).
+            self.flush()
+        if not self._count:
+            self._opened_at = now
+            self._timer = asyncio.get_running_loop().call_later(_WINDOW, self.flush)
+        self._count += 1
+
+    def flush(self) -> None:
+        """Log the pending count, if any, and start a new window."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._count:
+            return
+        logger.info(
+            self._summary_event,
+            count=self._count,
+            window_ms=round((time.monotonic() - self._opened_at) * 1000),
+        )
+        self._count = 0
@@ -0,0 +1,34 @@
+"""Per-severity presentation shared by the notification senders."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class SeverityStyle:
+    """Colour and emoji used to render one severity level."""
+
+    color: int
+    color_hex: str
+    emoji: str
+    slack_emoji: str
+
+
+def _style(color: int, emoji: str, slack_emoji: str) -> SeverityStyle:
+    return SeverityStyle(color, f"#{color:06X}", emoji, slack_emoji)
+
+
+SEVERITY_STYLE: dict[str, SeverityStyle] = {
+    "Minor": _style(0x3B82F6, "🔵", ":large_blue_circle:"),       # blue
+    "Moderate": _style(0xEAB308, "🟡", ":large_yellow_circle:"),  # yellow
+    "Severe": _style(0xEF4444, "🔴", ":red_circle:"),             # red
+    "Extreme": _style(0x1F2937, "⚫", ":black_circle:"),          # dark
+}
+
+DEFAULT_STYLE = _style(0x6B7280, "⚠️", ":warning:")
+
+
+def severity_style(severity: str) -> SeverityStyle:
+    """Return the style for ``severity``, falling back to a neutral grey."""
+    return SEVERITY_STYLE.get(severity, DEFAULT_STYLE)
@@ -5,17 +5,25 @@ from __future__ import annotations
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 
 from app.models import MatchResult, WarningInfo
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.notifications.sent_log import SentLog
+from app.notifications.severity import severity_style
 
 logger = structlog.get_logger()
-
-SEVERITY_EMOJI = {
-    "Minor": ":large_blue_circle:",
-    "Moderate": ":large_yellow_circle:",
-    "Severe": ":red_circle:",
-    "Extreme": ":black_circle:",
+_sent = SentLog("slack_message_sent", "slack_messages_sent")
+
+# Static blocks shared by every payload; they are only ever serialised,
+# never mutated.
+_SOURCE_ELEMENT = {"type": "mrkdwn", "text": "Sumber: BMKG (bmkg.go.id) | BMKG Alert v1.0"}
+_TRIAL_BLOCK = {
+    "type": "context",
+    "elements": [
+        {"type": "mrkdwn", "text": ":hourglass: _Mode Trial — notifikasi aktif sementara._"},
+    ],
 }
 
 
@@ -44,12 +52,10 @@ class SlackSender:
     def _build_blocks(
         self, warning: WarningInfo, match: MatchResult, is_trial: bool
     ) -> dict:
-        emoji = SEVERITY_EMOJI.get(warning.severity, ":warning:")
+        emoji = severity_style(warning.severity).slack_emoji
         loc = match.location
 
-        description = warning.description or warning.headline or ""
-        if len(description) > 300:
-            description = description[:297] + "..."
+        description = warning.summary_short
 
         blocks: list[dict[str, Any]] = [
             {
@@ -90,27 +96,23 @@ class SlackSender:
             "type": "context",
             "elements": [
                 {"type": "mrkdwn", "text": f"Match: {match.match_type} — {match.matched_text}"},
-                {"type": "mrkdwn", "text": "Sumber: BMKG (bmkg.go.id) | BMKG Alert v1.0"},
+                _SOURCE_ELEMENT,
             ],
         })
 
         if is_trial:
-            blocks.append({
-                "type": "context",
-                "elements": [
-                    {"type": "mrkdwn", "text": ":hourglass: _Mode Trial — notifikasi aktif sementara._"},
-                ],
-            })
+            blocks.append(_TRIAL_BLOCK)
 
         return {"blocks": blocks}
 
     async def _post(self, webhook_url: str, payload: dict) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(webhook_url, json=payload)
+            response = await post_with_retry(
+                webhook_url, content=orjson.dumps(payload), headers=JSON_HEADERS
+            )
 
             if response.status_code == 200:
-                logger.info("slack_message_sent")
+                _sent.record()
                 return True
 
             logger.error(
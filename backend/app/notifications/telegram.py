@@ -2,18 +2,48 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 
 from app.models import MatchResult, WarningInfo
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.notifications.sent_log import SentLog
 from app.notifications.formatter import format_telegram_message
 
 logger = structlog.get_logger()
+_sent = SentLog("telegram_message_sent", "telegram_messages_sent")
 
 TELEGRAM_API_BASE = "https://api.telegram.org"
 
+# sendMessage text limit, in UTF-16 code units
+MAX_MESSAGE_LENGTH = 4096
+_BATCH_SEPARATOR = "\n\n"
+
+
+def _is_ok(body: bytes) -> bool:
+    """Whether a Bot API response body reports ``"ok": true``.
+
+    Successful replies echo the whole sent Message; Telegram emits them
+    compact with ``ok`` first, so the prefix settles it without decoding.
+    """
+    if body.startswith(b'{"ok":true'):
+        return True
+    try:
+        result = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return False
+    return isinstance(result, dict) and result.get("ok") is True
+
+
+@lru_cache(maxsize=256)
+def _send_url(bot_token: str) -> str:
+    """sendMessage endpoint for a bot; channels keep one token for life."""
+    return f"{TELEGRAM_API_BASE}/bot{bot_token}/sendMessage"
+
 
 class TelegramSender:
     """Sends alert messages via Telegram Bot API."""
@@ -51,6 +81,38 @@ class TelegramSender:
 
         return await self._send_message(bot_token, chat_id, message)
 
+    async def send_batch(
+        self,
+        items: list[tuple[WarningInfo, MatchResult]],
+        channel_config: dict[str, Any],
+    ) -> list[bool]:
+        """Send several alerts to one chat in as few messages as fit.
+
+        Formatted alerts are joined whole — never split — into messages up
+        to ``MAX_MESSAGE_LENGTH``, easing Telegram's per-chat rate limit
+        during a storm.
+
+        Returns:
+            One result per item: whether the message carrying it was sent.
+        """
+        bot_token = channel_config.get("bot_token", "")
+        chat_id = channel_config.get("chat_id", "")
+
+        if not bot_token or not chat_id:
+            logger.error(
+                "telegram_missing_config",
+                has_token=bool(bot_token),
+                has_chat_id=bool(chat_id),
+            )
+            return [False] * len(items)
+
+        messages = [format_telegram_message(warning, match) for warning, match in items]
+        results: list[bool] = []
+        for chunk in pack_messages(messages):
+            ok = await self._send_message(bot_token, chat_id, _BATCH_SEPARATOR.join(chunk))
+            results.extend([ok] * len(chunk))
+        return results
+
     async def send_raw(
         self,
         bot_token: str,
@@ -67,7 +129,7 @@ class TelegramSender:
         text: str,
     ) -> bool:
         """Call Telegram Bot API sendMessage endpoint."""
-        url = f"{TELEGRAM_API_BASE}/bot{bot_token}/sendMessage"
+        url = _send_url(bot_token)
         payload = {
             "chat_id": chat_id,
             "text": text,
@@ -76,17 +138,13 @@ class TelegramSender:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(url, json=payload)
-
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("ok"):
-                    logger.info(
-                        "telegram_message_sent",
-                        chat_id=chat_id,
-                    )
-                    return True
+            response = await post_with_retry(
+                url, content=orjson.dumps(payload), headers=JSON_HEADERS
+            )
+
+            if response.status_code == 200 and _is_ok(response.content):
+                _sent.record(chat_id=chat_id)
+                return True
 
             logger.error(
                 "telegram_api_error",
@@ -103,3 +161,26 @@ class TelegramSender:
                 chat_id=chat_id,
             )
             return False
+
+
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def pack_messages(messages: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[list[str]]:
+    """Group ``messages`` greedily, in order, so each joined group fits ``limit``.
+
+    A message longer than ``limit`` on its own gets a group to itself.
+    """
+    groups: list[list[str]] = []
+    size = 0
+    sep = _utf16_len(_BATCH_SEPARATOR)
+    for message in messages:
+        length = _utf16_len(message)
+        if groups and size + sep + length <= limit:
+            groups[-1].append(message)
+            size += sep + length
+        else:
+            groups.append([message])
+            size = length
+    return groups
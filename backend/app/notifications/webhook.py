@@ -5,11 +5,15 @@ from __future__ import annotations
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 
 from app.models import MatchResult, WarningInfo
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.notifications.sent_log import SentLog
 
 logger = structlog.get_logger()
+_sent = SentLog("webhook_sent", "webhooks_sent")
 
 
 class WebhookSender:
@@ -69,16 +73,16 @@ class WebhookSender:
         self, webhook_url: str, payload: dict, headers: dict
     ) -> bool:
         try:
-            request_headers = {"Content-Type": "application/json"}
-            request_headers.update(headers)
+            request_headers = {**JSON_HEADERS, **headers}
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    webhook_url, json=payload, headers=request_headers
-                )
+            response = await post_with_retry(
+                webhook_url,
+                content=orjson.dumps(payload),
+                headers=request_headers,
+            )
 
             if 200 <= response.status_code < 300:
-                logger.info("webhook_sent", url=webhook_url, status=response.status_code)
+                _sent.record(url=webhook_url, status=response.status_code)
                 return True
 
             logger.error(
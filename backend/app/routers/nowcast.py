@@ -1,20 +1,26 @@
 """Nowcast (weather warnings) API routes."""
 
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import orjson
 from fastapi import APIRouter, Query, Request, Depends, HTTPException, Response
 from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.dependencies import limiter
+from app.etag import etag_response
+from app.models.enums import Certainty, Severity, Urgency
 from app.models.nowcast import (
     ActiveProvince,
+    Area,
     Warning,
     LocationCheckResult,
     NowcastDetailResponse,
     NowcastMeta,
 )
 from app.models.responses import APIResponse
-from app.services.nowcast_service import nowcast_service
+from app.services.nowcast_service import JSON_OPTIONS, RenderedBody, nowcast_service
 from app.core.auth import verify_admin
 
 router = APIRouter(
@@ -23,15 +29,18 @@ router = APIRouter(
 )
 
 
-def serialize_warning(warning: Warning) -> dict:
-    """Serialize warning to dict for API response."""
-    data = warning.model_dump(mode='json')
-    # Ensure datetime fields are properly formatted
-    if warning.effective:
-        data['effective'] = warning.effective.isoformat() if warning.effective.tzinfo else warning.effective.isoformat() + "+00:00"
-    if warning.expires:
-        data['expires'] = warning.expires.isoformat() if warning.expires.tzinfo else warning.expires.isoformat() + "+00:00"
-    return data
+def rendered_response(
+    request: Request,
+    rendered: RenderedBody,
+    from_cache: bool,
+    ttl: int,
+) -> Response:
+    """Send a memoized body, or 304 if the client already has it."""
+    return etag_response(request, rendered.body, rendered.etag, {
+        "Cache-Control": f"public, max-age={ttl}",
+        "X-Cache": "HIT" if from_cache else "MISS",
+        "X-Cache-TTL": str(ttl),
+    })
 
 
 @router.get("", response_model=APIResponse[list[ActiveProvince]])
@@ -48,26 +57,25 @@ async def get_active_provinces(
     **Query Parameters:**
     - `lang`: Language code - "id" (Indonesian) or "en" (English). Default: "id"
     """
-    try:
+    async def build():
         provinces, from_cache, ttl = await nowcast_service.get_active_provinces(lang)
-        
         response_data = {
-            "data": [p.model_dump(mode='json') for p in provinces],
+            "data": [p.model_dump() for p in provinces],
             "meta": {
                 "count": len(provinces),
-                "fetched_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "fetched_at": await nowcast_service.rss_fetched_at(lang),
                 "cache_ttl": ttl,
                 "language": lang,
             },
             "attribution": "BMKG (Badan Meteorologi, Klimatologi, dan Geofisika)",
         }
-        
-        headers = {
-            "X-Cache": "HIT" if from_cache else "MISS",
-            "X-Cache-TTL": str(ttl),
-        }
-        
-        return JSONResponse(content=response_data, headers=headers)
+        return response_data, from_cache, ttl
+    
+    try:
+        rendered, from_cache, ttl = await nowcast_service.get_rendered(
+            ("provinces", lang), build
+        )
+        return rendered_response(request, rendered, from_cache, ttl)
         
     except Exception as e:
         return JSONResponse(
@@ -94,26 +102,25 @@ async def get_all_active_warnings(
     **Query Parameters:**
     - `lang`: Language code - "id" (Indonesian) or "en" (English). Default: "id"
     """
-    try:
+    async def build():
         warnings, from_cache, ttl = await nowcast_service.get_all_warnings(lang)
-        
         response_data = {
-            "data": [serialize_warning(w) for w in warnings],
+            "data": [w.model_dump() for w in warnings],
             "meta": {
                 "count": len(warnings),
-                "fetched_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "fetched_at": await nowcast_service.rss_fetched_at(lang),
                 "cache_ttl": ttl,
                 "language": lang,
             },
             "attribution": "BMKG (Badan Meteorologi, Klimatologi, dan Geofisika)",
         }
-        
-        headers = {
-            "X-Cache": "HIT" if from_cache else "MISS",
-            "X-Cache-TTL": str(ttl),
-        }
-        
-        return JSONResponse(content=response_data, headers=headers)
+        return response_data, from_cache, ttl
+    
+    try:
+        rendered, from_cache, ttl = await nowcast_service.get_rendered(
+            ("active", lang), build
+        )
+        return rendered_response(request, rendered, from_cache, ttl)
         
     except Exception as e:
         return JSONResponse(
@@ -144,41 +151,43 @@ async def get_warning_detail(
     **Query Parameters:**
     - `lang`: Language code - "id" (Indonesian) or "en" (English). Default: "id"
     """
-    try:
+    async def build():
         warning, region_name, from_cache, ttl = await nowcast_service.get_warning_detail(
             alert_code, lang
         )
-        
         if warning is None:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "error": "not_found",
-                    "message": f"Alert '{alert_code}' not found or no longer active",
-                    "status": 404,
-                },
-            )
-        
+            return None, from_cache, ttl
         response_data = {
             "data": {
                 "province": region_name,
-                "warnings": [serialize_warning(warning)],
+                "warnings": [warning.model_dump()],
             },
             "meta": {
                 "count": 1,
-                "fetched_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "fetched_at": await nowcast_service.cap_fetched_at(alert_code, lang),
                 "cache_ttl": ttl,
                 "language": lang,
             },
             "attribution": "BMKG (Badan Meteorologi, Klimatologi, dan Geofisika)",
         }
+        return response_data, from_cache, ttl
+    
+    try:
+        rendered, from_cache, ttl = await nowcast_service.get_rendered(
+            ("detail", alert_code, lang), build
+        )
         
-        headers = {
-            "X-Cache": "HIT" if from_cache else "MISS",
-            "X-Cache-TTL": str(ttl),
-        }
+        if rendered is None:
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "error": "not_found",
+                    "message": f"Alert '{alert_code}' not found or no longer active",
+                    "status": 404,
+                },
+            )
         
-        return JSONResponse(content=response_data, headers=headers)
+        return rendered_response(request, rendered, from_cache, ttl)
         
     except Exception as e:
         return JSONResponse(
@@ -225,11 +234,11 @@ async def check_location_warnings(
         result, from_cache, ttl = await nowcast_service.check_location(location.strip(), lang)
         
         response_data = {
-            "data": result.model_dump(mode='json'),
+            "data": result.model_dump(),
             "meta": {
                 "location": location.strip(),
                 "checked_provinces": len(result.warnings),
-                "fetched_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "fetched_at": await nowcast_service.rss_fetched_at(lang),
                 "cache_ttl": ttl,
                 "language": lang,
             },
@@ -241,7 +250,11 @@ async def check_location_warnings(
             "X-Cache-TTL": str(ttl),
         }
         
-        return JSONResponse(content=response_data, headers=headers)
+        return Response(
+            content=orjson.dumps(response_data, option=JSON_OPTIONS),
+            media_type="application/json",
+            headers=headers,
+        )
         
     except Exception as e:
         return JSONResponse(
@@ -254,6 +267,62 @@ async def check_location_warnings(
         )
 
 
+@dataclass(frozen=True, slots=True)
+class _SimTemplate:
+    """Fixed content of one simulated warning scenario."""
+
+    suffix: str
+    event: str
+    severity: Severity
+    urgency: Urgency
+    certainty: Certainty
+    duration: timedelta
+    headline: str
+    description: str
+    area_name: str
+    polygon: tuple[tuple[float, float], ...]
+
+
+_SIM_TEMPLATES = {
+    "heavy_rain": _SimTemplate(
+        suffix="RAIN",
+        event="Hujan Lebat (Simulasi)",
+        severity=Severity.SEVERE,
+        urgency=Urgency.IMMEDIATE,
+        certainty=Certainty.LIKELY,
+        duration=timedelta(hours=1),
+        headline="Hujan Lebat di Jakarta Pusat",
+        description="Ini adalah simulasi peringatan dini cuaca untuk pengujian sistem.",
+        area_name="Kec. Gambir, Jakarta Pusat",
+        polygon=((-6.16, 106.81), (-6.16, 106.83), (-6.18, 106.83), (-6.18, 106.81)),
+    ),
+    "earthquake": _SimTemplate(
+        suffix="QUAKE",
+        event="Gempa Bumi (Simulasi)",
+        severity=Severity.EXTREME,
+        urgency=Urgency.IMMEDIATE,
+        certainty=Certainty.OBSERVED,
+        duration=timedelta(hours=1),
+        headline="Gempa Bumi 5.0 SR",
+        description="Ini adalah simulasi gempa bumi.",
+        area_name="Kec. Menteng, Jakarta Pusat",
+        polygon=((-6.18, 106.82), (-6.18, 106.84), (-6.20, 106.84), (-6.20, 106.82)),
+    ),
+    "flood": _SimTemplate(
+        suffix="FLOOD",
+        event="Banjir (Simulasi)",
+        severity=Severity.MODERATE,
+        urgency=Urgency.EXPECTED,
+        certainty=Certainty.POSSIBLE,
+        duration=timedelta(hours=3),
+        headline="Banjir di Bantul",
+        description="Ini adalah simulasi banjir.",
+        area_name="Kec. Bantul, DIY",
+        polygon=((-7.87, 110.30), (-7.87, 110.35), (-7.92, 110.35), (-7.92, 110.30)),
+    ),
+}
+
+
 @router.post("/simulate")
 @limiter.limit(settings.rate_limit_authenticated)
 async def simulate_warning(
@@ -267,74 +336,28 @@ async def simulate_warning(
     Injects a fake warning into the system for testing purposes.
     Requires Admin Authentication.
     """
-    from datetime import datetime, timedelta, timezone
-    from app.models.nowcast import Warning, Area
-    from app.models.enums import Severity, Urgency, Certainty
-    
     sim_type = payload.get("type", "heavy_rain")
+    # Unknown types fall back to the flood scenario
+    template = _SIM_TEMPLATES.get(sim_type, _SIM_TEMPLATES["flood"])
     
     # Generate fake warning based on type
     timestamp = int(datetime.now().timestamp())
     serialized_time = datetime.now(timezone.utc)
     
-    if sim_type == "heavy_rain":
-        warning = Warning(
-            identifier=f"SIM-{timestamp}-RAIN",
-            event="Hujan Lebat (Simulasi)",
-            severity=Severity.SEVERE,
-            urgency=Urgency.IMMEDIATE,
-            certainty=Certainty.LIKELY,
-            effective=serialized_time,
-            expires=serialized_time + timedelta(hours=1),
-            headline=f"SIMULASI: Hujan Lebat di Jakarta Pusat (ID: {timestamp})",
-            description="Ini adalah simulasi peringatan dini cuaca untuk pengujian sistem.",
-            sender="BMKG-Simulator",
-            areas=[
-                Area(name="Kec. Gambir, Jakarta Pusat", polygon=[
-                     [-6.16, 106.81], [-6.16, 106.83], [-6.18, 106.83], [-6.18, 106.81]
-                ])
-            ],
-            is_expired=False
-        )
-    elif sim_type == "earthquake":
-         warning = Warning(
-            identifier=f"SIM-{timestamp}-QUAKE",
-            event="Gempa Bumi (Simulasi)",
-            severity=Severity.EXTREME,
-            urgency=Urgency.IMMEDIATE,
-            certainty=Certainty.OBSERVED,
-            effective=serialized_time,
-            expires=serialized_time + timedelta(hours=1),
-            headline=f"SIMULASI: Gempa Bumi 5.0 SR (ID: {timestamp})",
-            description="Ini adalah simulasi gempa bumi.",
-            sender="BMKG-Simulator",
-            areas=[
-                Area(name="Kec. Menteng, Jakarta Pusat", polygon=[
-                     [-6.18, 106.82], [-6.18, 106.84], [-6.20, 106.84], [-6.20, 106.82]
-                ])
-            ],
-            is_expired=False
-        )
-    else:
-        # Default Flood
-        warning = Warning(
-            identifier=f"SIM-{timestamp}-FLOOD",
-            event="Banjir (Simulasi)",
-            severity=Severity.MODERATE,
-            urgency=Urgency.EXPECTED,
-            certainty=Certainty.POSSIBLE,
-            effective=serialized_time,
-            expires=serialized_time + timedelta(hours=3),
-            headline=f"SIMULASI: Banjir di Bantul (ID: {timestamp})",
-            description="Ini adalah simulasi banjir.",
-            sender="BMKG-Simulator",
-            areas=[
-                Area(name="Kec. Bantul, DIY", polygon=[
-                     [-7.87, 110.30], [-7.87, 110.35], [-7.92, 110.35], [-7.92, 110.30]
-                ])
-            ],
-            is_expired=False
-        )
+    warning = Warning(
+        identifier=f"SIM-{timestamp}-{template.suffix}",
+        event=template.event,
+        severity=template.severity,
+        urgency=template.urgency,
+        certainty=template.certainty,
+        effective=serialized_time,
+        expires=serialized_time + template.duration,
+        headline=f"SIMULASI: {template.headline} (ID: {timestamp})",
+        description=template.description,
+        sender="BMKG-Simulator",
+        areas=[Area(name=template.area_name, polygon=template.polygon)],
+        is_expired=False
+    )
         
     await nowcast_service.inject_warning(warning)
     return {"status": "ok", "message": f"Simulated {sim_type} warning injected", "id": warning.identifier}
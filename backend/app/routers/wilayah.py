@@ -1,11 +1,15 @@
 """Wilayah (region) API routes."""
 
 from datetime import datetime, timezone
-from fastapi import APIRouter, Query, Request, Depends, HTTPException
+
+import orjson
+from fastapi import APIRouter, Query, Request, Depends, HTTPException, Response
 from fastapi.responses import JSONResponse
 
+from app.cache import TTLMemo
 from app.config import settings
 from app.dependencies import limiter
+from app.etag import body_etag, etag_response
 from app.models.wilayah import Wilayah, WilayahSearchResult
 from app.services.wilayah_service import wilayah_service
 
@@ -15,6 +19,26 @@ router = APIRouter(
 )
 
 
+# The dataset is static for the life of the process; the TTLs only bound
+# how long clients may reuse a response without revalidating.
+_PROVINCES_TTL = 86400
+_SEARCH_TTL = 600
+_provinces_memo = TTLMemo(ttl=_PROVINCES_TTL)
+_search_memo = TTLMemo(ttl=_SEARCH_TTL, maxsize=2048)
+
+
+def _render(payload: dict) -> tuple[bytes, str]:
+    """Encode a response body once, with its ETag."""
+    body = orjson.dumps(payload)
+    return body, body_etag(body)
+
+
+def _cached_response(request: Request, rendered: tuple[bytes, str], max_age: int) -> Response:
+    """Send a memoized body, or 304 if the client already has it."""
+    body, etag = rendered
+    return etag_response(request, body, etag, {"Cache-Control": f"public, max-age={max_age}"})
+
+
 def _serialize_wilayah(w: Wilayah) -> dict:
     """Serialize wilayah to dict."""
     return {
@@ -43,19 +67,20 @@ async def get_provinces(
     
     Returns a list of all Indonesian provinces based on Permendagri 72/2019.
     """
-    try:
+    async def build() -> tuple[bytes, str]:
         provinces = wilayah_service.get_provinces()
-        
-        response_data = {
+        return _render({
             "data": [_serialize_wilayah(p) for p in provinces],
             "meta": {
                 "fetched_at": datetime.now(timezone.utc).isoformat() + "Z",
                 "count": len(provinces),
             },
             "attribution": "Permendagri 72/2019",
-        }
-        
-        return JSONResponse(content=response_data)
+        })
+
+    try:
+        rendered = await _provinces_memo.get_or_fill("provinces", build)
+        return _cached_response(request, rendered, _PROVINCES_TTL)
         
     except Exception as e:
         return JSONResponse(
@@ -227,10 +252,9 @@ async def search_wilayah(
     Case-insensitive search across all administrative levels.
     Returns results with full hierarchical paths.
     """
-    try:
+    async def build() -> tuple[bytes, str]:
         results = wilayah_service.search(q, limit=limit)
-        
-        response_data = {
+        return _render({
             "data": [_serialize_search_result(r) for r in results],
             "meta": {
                 "fetched_at": datetime.now(timezone.utc).isoformat() + "Z",
@@ -239,9 +263,12 @@ async def search_wilayah(
                 "limit": limit,
             },
             "attribution": "Permendagri 72/2019",
-        }
-        
-        return JSONResponse(content=response_data)
+        })
+
+    try:
+        # Search is case-insensitive, but the body echoes the query as sent
+        rendered = await _search_memo.get_or_fill((q, limit), build)
+        return _cached_response(request, rendered, _SEARCH_TTL)
         
     except Exception as e:
         return JSONResponse(
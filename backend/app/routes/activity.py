@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 
-from app.database import get_database
+from app.database import DatabaseManager
+from app.dependencies import get_db
+from app.routes.responses import ORJSONResponse
 
 router = APIRouter(prefix="/activity", tags=["activity"])
 
 
 @router.get("")
-async def get_activity(limit: int = Query(50, ge=1, le=200)):
+async def get_activity(
+    limit: int = Query(50, ge=1, le=200),
+    db: DatabaseManager = Depends(get_db),
+):
     """Get recent activity log entries."""
-    db = get_database()
     rows = await db.fetch_all(
-        "SELECT * FROM activity_log ORDER BY created_at DESC LIMIT ?",
+        "SELECT id, event_type, message, details, created_at FROM activity_log "
+        "ORDER BY created_at DESC LIMIT ?",
         (limit,),
     )
-    return {"data": [dict(row) for row in rows]}
+    return ORJSONResponse({"data": [dict(row) for row in rows]})
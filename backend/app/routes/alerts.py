@@ -2,119 +2,139 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import AsyncIterator
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.database import get_database
+from app.database import DatabaseManager
+from app.dependencies import get_db
+from app.engine.state import alert_columns
+from app.routes.responses import ORJSONResponse
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
 
+def _ndjson_response(
+    db: DatabaseManager, query: str, params: tuple = ()
+) -> StreamingResponse:
+    """Stream query rows as newline-delimited JSON, one alert per line."""
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for row in db.iterate(query, params):
+            yield orjson.dumps(dict(row)) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("")
 async def list_alerts(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: DatabaseManager = Depends(get_db),
 ):
-    """List alerts with pagination."""
-    db = get_database()
+    """List alerts with pagination.
 
+    ``format=ndjson`` streams the page as one alert per line, without the
+    pagination envelope.
+    """
     where = ""
     params: list = []
     if status:
         where = "WHERE status = ?"
         params.append(status)
 
-    # Get total count
-    count_row = await db.fetch_one(
-        f"SELECT COUNT(*) as cnt FROM alerts {where}", tuple(params)
-    )
-    total = count_row["cnt"] if count_row else 0
-
-    # Get page
     offset = (page - 1) * page_size
-    params.extend([page_size, offset])
+    if format == "ndjson":
+        return _ndjson_response(
+            db,
+            f"SELECT {alert_columns(db, decoded=True)} FROM alerts {where} "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (*params, page_size, offset),
+        )
+
+    # Get page; every row carries the total from an uncorrelated scalar
+    # subquery, which SQLite evaluates once. (COUNT(*) OVER () would
+    # materialize and sort the whole table instead of walking the index.)
     rows = await db.fetch_all(
-        f"SELECT * FROM alerts {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
-        tuple(params),
+        f"SELECT {alert_columns(db, decoded=True)}, "
+        f"(SELECT COUNT(*) FROM alerts {where}) AS total_count "
+        f"FROM alerts {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+        (*params, *params, page_size, offset),
     )
+    if rows:
+        total = rows[0]["total_count"]
+    elif page == 1:
+        total = 0
+    else:
+        # Past the last page there is no row to carry the count
+        count_row = await db.fetch_one(
+            f"SELECT COUNT(*) as cnt FROM alerts {where}", tuple(params)
+        )
+        total = count_row["cnt"] if count_row else 0
 
     alerts = []
     for row in rows:
         alert = dict(row)
-        if alert.get("polygon_data"):
-            try:
-                alert["polygon_data"] = json.loads(alert["polygon_data"])
-            except (json.JSONDecodeError, TypeError):
-                pass
+        del alert["total_count"]
         alerts.append(alert)
 
-    return {
+    return ORJSONResponse({
         "data": alerts,
         "total": total,
         "page": page,
         "page_size": page_size,
-    }
+    })
 
 
 @router.get("/active")
-async def get_active_alerts():
-    """Get all currently active alerts."""
-    db = get_database()
-    rows = await db.fetch_all(
-        "SELECT * FROM alerts WHERE status = 'active' ORDER BY created_at DESC"
+async def get_active_alerts(
+    format: Literal["json", "ndjson"] = "json",
+    db: DatabaseManager = Depends(get_db),
+):
+    """Get all currently active alerts.
+
+    ``format=ndjson`` streams them as one alert per line.
+    """
+    query = (
+        f"SELECT {alert_columns(db, decoded=True)} FROM alerts "
+        "WHERE status = 'active' ORDER BY created_at DESC"
     )
-    alerts = []
-    for row in rows:
-        alert = dict(row)
-        if alert.get("polygon_data"):
-            try:
-                alert["polygon_data"] = json.loads(alert["polygon_data"])
-            except (json.JSONDecodeError, TypeError):
-                pass
-        alerts.append(alert)
-    return {"data": alerts, "count": len(alerts)}
+    if format == "ndjson":
+        return _ndjson_response(db, query)
+    alerts = [dict(row) for row in await db.fetch_all(query)]
+    return ORJSONResponse({"data": alerts, "count": len(alerts)})
 
 
 @router.get("/stats")
-async def get_alert_stats():
+async def get_alert_stats(db: DatabaseManager = Depends(get_db)):
     """Get alert statistics."""
-    db = get_database()
-
-    total_row = await db.fetch_one("SELECT COUNT(*) as cnt FROM alerts")
-    month_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM alerts WHERE created_at >= date('now', 'start of month')"
-    )
-    locations_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM locations WHERE enabled = 1"
-    )
-    channels_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM notification_channels WHERE enabled = 1"
+    row = await db.fetch_one(
+        "SELECT"
+        " (SELECT COUNT(*) FROM alerts) AS total_alerts,"
+        " (SELECT COUNT(*) FROM alerts"
+        "  WHERE created_at >= date('now', 'start of month')) AS alerts_this_month,"
+        " (SELECT COUNT(*) FROM locations WHERE enabled = 1) AS monitored_locations,"
+        " (SELECT COUNT(*) FROM notification_channels WHERE enabled = 1)"
+        "  AS active_channels"
     )
-
-    return {
-        "total_alerts": total_row["cnt"] if total_row else 0,
-        "alerts_this_month": month_row["cnt"] if month_row else 0,
-        "monitored_locations": locations_row["cnt"] if locations_row else 0,
-        "active_channels": channels_row["cnt"] if channels_row else 0,
-    }
+    return dict(row)
 
 
 @router.get("/{alert_id}")
-async def get_alert(alert_id: int):
+async def get_alert(alert_id: int, db: DatabaseManager = Depends(get_db)):
     """Get a specific alert with delivery log."""
-    db = get_database()
-    row = await db.fetch_one("SELECT * FROM alerts WHERE id = ?", (alert_id,))
+    row = await db.fetch_one(
+        f"SELECT {alert_columns(db, decoded=True)} FROM alerts WHERE id = ?", (alert_id,)
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Alert not found")
 
     alert = dict(row)
-    if alert.get("polygon_data"):
-        try:
-            alert["polygon_data"] = json.loads(alert["polygon_data"])
-        except (json.JSONDecodeError, TypeError):
-            pass
 
     # Get deliveries
     deliveries = await db.fetch_all(
@@ -122,7 +142,7 @@ async def get_alert(alert_id: int):
         (alert_id,),
     )
 
-    return {
+    return ORJSONResponse({
         "data": alert,
         "deliveries": [dict(d) for d in deliveries],
-    }
+    })
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.config import settings
+from app.core.auth import ADMIN_PASSWORD_DIGEST, secret_digest
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -24,6 +25,7 @@ async def admin_login(body: LoginRequest):
     The frontend stores the password and sends it as
     ``X-Admin-Token`` on subsequent requests.
     """
-    if not secrets.compare_digest(body.password, settings.admin_password):
+    supplied = secret_digest(body.password.encode("utf8"))
+    if not secrets.compare_digest(supplied, ADMIN_PASSWORD_DIGEST):
         raise HTTPException(status_code=401, detail="Invalid password")
     return {"authenticated": True, "demo_mode": settings.demo_mode}
@@ -2,197 +2,235 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
 
-from app.database import get_database
-from app.dependencies import require_write_allowed
-from app.models import ChannelCreate, ChannelUpdate
+from app.database import DatabaseManager
+from app.dependencies import get_db, get_engine, require_write_allowed
+from app.engine.state import CHANNEL_COLUMNS
+from app.engine.worker import AlertEngine
+from app.models import ChannelCreate, ChannelUpdate, validate_channel_config
 from app.notifications.telegram import TelegramSender
 from app.notifications.discord import DiscordSender
 from app.notifications.slack import SlackSender
 from app.notifications.email import EmailSender
 from app.notifications.webhook import WebhookSender
+from app.routes.responses import ORJSONResponse
 
 router = APIRouter(prefix="/channels", tags=["channels"])
 
+_TEST_TEXT = (
+    "Test Notifikasi BMKG Alert\n\n"
+    "Ini adalah pesan test. Jika Anda melihat pesan ini, "
+    "konfigurasi berhasil!\n\n"
+    "BMKG Alert System v1.0"
+)
+_TELEGRAM_TEST = (
+    "\U0001f9ea <b>Test Notifikasi BMKG Alert</b>\n\n"
+    "Ini adalah pesan test. Jika Anda melihat pesan ini, "
+    "konfigurasi Telegram berhasil!\n\n"
+    "\U0001f4e1 BMKG Alert System v1.0"
+)
+_DISCORD_TEST = f"\U0001f9ea **{_TEST_TEXT}**"
+_SLACK_TEST = f"\U0001f9ea {_TEST_TEXT}"
+_WEBHOOK_TEST = {"type": "test", "source": "bmkg-alert", "message": _TEST_TEXT}
+
+_telegram = TelegramSender()
+_discord = DiscordSender()
+_slack = SlackSender()
+_email = EmailSender()
+_webhook = WebhookSender()
+
+
+async def _test_telegram(config: dict[str, Any]) -> bool:
+    return await _telegram.send_raw(
+        bot_token=config.get("bot_token", ""),
+        chat_id=config.get("chat_id", ""),
+        message=_TELEGRAM_TEST,
+    )
+
+
+async def _test_discord(config: dict[str, Any]) -> bool:
+    return await _discord.send_raw(
+        webhook_url=config.get("webhook_url", ""), message=_DISCORD_TEST
+    )
+
+
+async def _test_slack(config: dict[str, Any]) -> bool:
+    return await _slack.send_raw(
+        webhook_url=config.get("webhook_url", ""), message=_SLACK_TEST
+    )
+
+
+async def _test_email(config: dict[str, Any]) -> bool:
+    return await _email.send_raw(
+        to_email=config.get("to_email", ""),
+        subject="[BMKG Alert] Test Notification",
+        body=_TEST_TEXT,
+        channel_config=config,
+    )
+
+
+async def _test_webhook(config: dict[str, Any]) -> bool:
+    return await _webhook.send_raw(
+        webhook_url=config.get("webhook_url", ""),
+        payload=_WEBHOOK_TEST,
+        headers=config.get("headers", {}),
+    )
+
+
+# channel_type -> test send; a new channel type only needs an entry here
+_TEST_SENDS: dict[str, Callable[[dict[str, Any]], Awaitable[bool]]] = {
+    "telegram": _test_telegram,
+    "discord": _test_discord,
+    "slack": _test_slack,
+    "email": _test_email,
+    "webhook": _test_webhook,
+}
+
 
 @router.get("")
-async def list_channels():
+async def list_channels(db: DatabaseManager = Depends(get_db)):
     """List all notification channels."""
-    db = get_database()
     rows = await db.fetch_all(
-        "SELECT * FROM notification_channels ORDER BY created_at DESC"
+        f"SELECT {CHANNEL_COLUMNS} FROM notification_channels ORDER BY created_at DESC"
     )
-    result = []
-    for row in rows:
-        channel = dict(row)
-        if isinstance(channel.get("config"), str):
-            channel["config"] = json.loads(channel["config"])
-        result.append(channel)
-    return {"data": result}
+    return ORJSONResponse({"data": [dict(row) for row in rows]})
 
 
 @router.post("", status_code=201, dependencies=[Depends(require_write_allowed)])
-async def create_channel(body: ChannelCreate):
+async def create_channel(
+    body: ChannelCreate,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Add a new notification channel."""
-    db = get_database()
-    config_json = json.dumps(body.config)
+    config_json = orjson.dumps(body.config).decode()
 
-    cursor = await db.execute(
-        """
+    (row,) = await db.execute_returning(
+        f"""
         INSERT INTO notification_channels (channel_type, enabled, config)
         VALUES (?, ?, ?)
+        RETURNING {CHANNEL_COLUMNS}
         """,
         (body.channel_type, 1 if body.enabled else 0, config_json),
     )
-    channel_id = cursor.lastrowid
-    row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
-    )
-    channel = dict(row)
-    channel["config"] = json.loads(channel["config"])
-    return {"data": channel}
+    if engine is not None:
+        engine.invalidate_channels()
+    return ORJSONResponse({"data": dict(row)}, status_code=201)
 
 
 @router.get("/{channel_id}")
-async def get_channel(channel_id: int):
+async def get_channel(channel_id: int, db: DatabaseManager = Depends(get_db)):
     """Get a specific channel."""
-    db = get_database()
     row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
+        f"SELECT {CHANNEL_COLUMNS} FROM notification_channels WHERE id = ?",
+        (channel_id,),
     )
     if not row:
         raise HTTPException(status_code=404, detail="Channel not found")
-    channel = dict(row)
-    if isinstance(channel.get("config"), str):
-        channel["config"] = json.loads(channel["config"])
-    return {"data": channel}
+    return ORJSONResponse({"data": dict(row)})
 
 
 @router.patch("/{channel_id}", dependencies=[Depends(require_write_allowed)])
-async def update_channel(channel_id: int, body: ChannelUpdate):
+async def update_channel(
+    channel_id: int,
+    body: ChannelUpdate,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Update a channel's enabled status or config."""
-    db = get_database()
-    row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Channel not found")
-
     updates = []
     params = []
     if body.enabled is not None:
         updates.append("enabled = ?")
         params.append(1 if body.enabled else 0)
     if body.config is not None:
+        # The config is checked against the channel's stored type
+        current = await db.fetch_one(
+            "SELECT channel_type FROM notification_channels WHERE id = ?", (channel_id,)
+        )
+        if current is None:
+            raise HTTPException(status_code=404, detail="Channel not found")
+        try:
+            config = validate_channel_config(current["channel_type"], body.config)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=422, detail=exc.errors(include_url=False, include_context=False)
+            ) from None
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from None
         updates.append("config = ?")
-        params.append(json.dumps(body.config))
+        params.append(orjson.dumps(config).decode())
 
     if updates:
         updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(channel_id)
         set_clause = ", ".join(updates)
-        await db.execute(
-            f"UPDATE notification_channels SET {set_clause} WHERE id = ?",
+        rows = await db.execute_returning(
+            f"UPDATE notification_channels SET {set_clause} WHERE id = ? "
+            f"RETURNING {CHANNEL_COLUMNS}",
             tuple(params),
         )
+        row = rows[0] if rows else None
+        if row is not None and engine is not None:
+            engine.invalidate_channels()
+    else:
+        row = await db.fetch_one(
+            f"SELECT {CHANNEL_COLUMNS} FROM notification_channels WHERE id = ?",
+            (channel_id,),
+        )
 
-    row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
-    )
-    channel = dict(row)
-    if isinstance(channel.get("config"), str):
-        channel["config"] = json.loads(channel["config"])
-    return {"data": channel}
+    if row is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return ORJSONResponse({"data": dict(row)})
 
 
 @router.delete("/{channel_id}", dependencies=[Depends(require_write_allowed)])
-async def delete_channel(channel_id: int):
+async def delete_channel(
+    channel_id: int,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Delete a notification channel."""
-    db = get_database()
     row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
+        "SELECT id FROM notification_channels WHERE id = ?", (channel_id,)
     )
     if not row:
         raise HTTPException(status_code=404, detail="Channel not found")
     await db.execute(
         "DELETE FROM notification_channels WHERE id = ?", (channel_id,)
     )
+    if engine is not None:
+        engine.invalidate_channels()
     return {"status": "deleted", "id": channel_id}
 
 
 @router.post("/{channel_id}/test", dependencies=[Depends(require_write_allowed)])
-async def test_channel(channel_id: int):
+async def test_channel(channel_id: int, db: DatabaseManager = Depends(get_db)):
     """Send a test notification through a channel."""
-    db = get_database()
     row = await db.fetch_one(
-        "SELECT * FROM notification_channels WHERE id = ?", (channel_id,)
+        f"SELECT {CHANNEL_COLUMNS} FROM notification_channels WHERE id = ?",
+        (channel_id,),
     )
     if not row:
         raise HTTPException(status_code=404, detail="Channel not found")
 
     channel = dict(row)
-    if isinstance(channel.get("config"), str):
-        channel["config"] = json.loads(channel["config"])
-
     channel_type = channel["channel_type"]
     config = channel["config"]
 
-    success = False
-    test_text = (
-        "Test Notifikasi BMKG Alert\n\n"
-        "Ini adalah pesan test. Jika Anda melihat pesan ini, "
-        "konfigurasi berhasil!\n\n"
-        "BMKG Alert System v1.0"
-    )
-
-    if channel_type == "telegram":
-        sender = TelegramSender()
-        telegram_msg = (
-            "\U0001f9ea <b>Test Notifikasi BMKG Alert</b>\n\n"
-            "Ini adalah pesan test. Jika Anda melihat pesan ini, "
-            "konfigurasi Telegram berhasil!\n\n"
-            "\U0001f4e1 BMKG Alert System v1.0"
-        )
-        success = await sender.send_raw(
-            bot_token=config.get("bot_token", ""),
-            chat_id=config.get("chat_id", ""),
-            message=telegram_msg,
-        )
-    elif channel_type == "discord":
-        sender = DiscordSender()
-        success = await sender.send_raw(
-            webhook_url=config.get("webhook_url", ""),
-            message=f"\U0001f9ea **{test_text}**",
-        )
-    elif channel_type == "slack":
-        sender = SlackSender()
-        success = await sender.send_raw(
-            webhook_url=config.get("webhook_url", ""),
-            message=f"\U0001f9ea {test_text}",
-        )
-    elif channel_type == "email":
-        sender = EmailSender()
-        success = await sender.send_raw(
-            to_email=config.get("to_email", ""),
-            subject="[BMKG Alert] Test Notification",
-            body=test_text,
-            channel_config=config,
-        )
-    elif channel_type == "webhook":
-        sender = WebhookSender()
-        success = await sender.send_raw(
-            webhook_url=config.get("webhook_url", ""),
-            payload={"type": "test", "source": "bmkg-alert", "message": test_text},
-            headers=config.get("headers", {}),
-        )
-    else:
+    send_test = _TEST_SENDS.get(channel_type)
+    if send_test is None:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported channel type: {channel_type}",
         )
+    success = await send_test(config)
 
     if success:
         await db.execute(
@@ -2,106 +2,113 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 
 from fastapi import APIRouter, Depends
 
-from app.database import get_database
-from app.dependencies import require_write_allowed
+from app.database import DatabaseManager
+from app.dependencies import get_db, get_engine, require_write_allowed
+from app.engine.state import CHANNEL_COLUMNS, LOCATION_COLUMNS
+from app.engine.worker import AlertEngine
 from app.models import ConfigUpdate
+from app.routes.responses import ORJSONResponse
 
 router = APIRouter(prefix="/config", tags=["config"])
 
+_UPSERT_CONFIG = """
+    INSERT INTO config (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+"""
+
+# Values restored by /config/reset (schema.sql seeds the same on first run)
+_DEFAULTS = {
+    "setup_completed": "false",
+    "bmkg_api_url": "https://bmkg-restapi.vercel.app",
+    "poll_interval": "300",
+    "severity_threshold": "all",
+    "quiet_hours_enabled": "false",
+    "quiet_hours_start": "22:00",
+    "quiet_hours_end": "06:00",
+    "quiet_hours_override_severe": "true",
+    "notification_language": "id",
+}
+
+
+async def _upsert_config(db: DatabaseManager, values: dict) -> None:
+    """Write every key in one executemany and one commit."""
+    if values:
+        await db.execute_many(_UPSERT_CONFIG, list(values.items()))
+
 
 @router.get("")
-async def get_config():
+async def get_config(db: DatabaseManager = Depends(get_db)):
     """Get all configuration values."""
-    db = get_database()
     rows = await db.fetch_all("SELECT key, value FROM config ORDER BY key")
     config = {row["key"]: row["value"] for row in rows}
     return {"data": config}
 
 
 @router.put("", dependencies=[Depends(require_write_allowed)])
-async def update_config(body: ConfigUpdate):
+async def update_config(
+    body: ConfigUpdate,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Update configuration values."""
-    db = get_database()
-    for key, value in body.settings.items():
-        await db.execute(
-            """
-            INSERT INTO config (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP
-            """,
-            (key, value, value),
-        )
-    # Return updated config
-    rows = await db.fetch_all("SELECT key, value FROM config ORDER BY key")
+    if not body.settings:
+        return await get_config(db)
+
+    # The snapshot is read from a reader while the writer upserts; the
+    # written values are merged over it either way.
+    rows, _ = await asyncio.gather(
+        db.fetch_all("SELECT key, value FROM config"),
+        _upsert_config(db, body.settings),
+    )
+    if engine is not None:
+        engine.invalidate_config()
     config = {row["key"]: row["value"] for row in rows}
-    return {"data": config}
+    config.update(body.settings)
+    return {"data": dict(sorted(config.items()))}
 
 
 @router.post("/export")
-async def export_config():
+async def export_config(db: DatabaseManager = Depends(get_db)):
     """Export full configuration as JSON."""
-    db = get_database()
-
-    config_rows = await db.fetch_all("SELECT key, value FROM config")
-    location_rows = await db.fetch_all("SELECT * FROM locations")
-    channel_rows = await db.fetch_all("SELECT * FROM notification_channels")
+    config_rows, location_rows, channel_rows = await asyncio.gather(
+        db.fetch_all("SELECT key, value FROM config"),
+        db.fetch_all(f"SELECT {LOCATION_COLUMNS} FROM locations"),
+        db.fetch_all(f"SELECT {CHANNEL_COLUMNS} FROM notification_channels"),
+    )
 
-    channels = []
-    for row in channel_rows:
-        channel = dict(row)
-        if isinstance(channel.get("config"), str):
-            channel["config"] = json.loads(channel["config"])
-        channels.append(channel)
-
-    return {
+    return ORJSONResponse({
         "config": {row["key"]: row["value"] for row in config_rows},
         "locations": [dict(row) for row in location_rows],
-        "channels": channels,
-    }
+        "channels": [dict(row) for row in channel_rows],
+    })
 
 
 @router.post("/import", dependencies=[Depends(require_write_allowed)])
-async def import_config(data: dict):
+async def import_config(
+    data: dict,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Import configuration from JSON export."""
-    db = get_database()
-
     if "config" in data:
-        for key, value in data["config"].items():
-            await db.execute(
-                """
-                INSERT INTO config (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP
-                """,
-                (key, value, value),
-            )
+        await _upsert_config(db, data["config"])
+        if engine is not None:
+            engine.invalidate_config()
 
     return {"status": "imported"}
 
 
 @router.post("/reset", dependencies=[Depends(require_write_allowed)])
-async def reset_config():
+async def reset_config(
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Reset configuration to defaults."""
-    db = get_database()
-    defaults = {
-        "setup_completed": "false",
-        "bmkg_api_url": "https://bmkg-restapi.vercel.app",
-        "poll_interval": "300",
-        "severity_threshold": "all",
-        "quiet_hours_enabled": "false",
-        "quiet_hours_start": "22:00",
-        "quiet_hours_end": "06:00",
-        "quiet_hours_override_severe": "true",
-        "notification_language": "id",
-    }
-    for key, value in defaults.items():
-        await db.execute(
-            """
-            INSERT INTO config (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP
-            """,
-            (key, value, value),
-        )
-    return {"data": defaults}
+    await _upsert_config(db, _DEFAULTS)
+    if engine is not None:
+        engine.invalidate_config()
+    return {"data": dict(_DEFAULTS)}
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.config import settings
 from app.dependencies import get_engine, require_write_allowed
+from app.engine.worker import AlertEngine
 
 router = APIRouter(prefix="/engine", tags=["engine"])
 
+# Last rendered status and the values it was rendered from. The dashboard
+# polls far more often than the engine's state changes.
+_rendered_status: tuple[tuple, bytes] = ((), b"")
+
+
+def _status_body(status: dict) -> bytes:
+    global _rendered_status
+    key = tuple(status.items())
+    if key != _rendered_status[0]:
+        _rendered_status = (key, orjson.dumps(status))
+    return _rendered_status[1]
+
 
 @router.post("/start", dependencies=[Depends(require_write_allowed)])
-async def start_engine():
+async def start_engine(engine: AlertEngine | None = Depends(get_engine)):
     """Start the alert polling engine."""
-    engine = get_engine()
     if engine is None:
         raise HTTPException(status_code=503, detail="Engine not initialized")
     await engine.start()
@@ -21,9 +34,8 @@ async def start_engine():
 
 
 @router.post("/stop", dependencies=[Depends(require_write_allowed)])
-async def stop_engine():
+async def stop_engine(engine: AlertEngine | None = Depends(get_engine)):
     """Stop the alert polling engine."""
-    engine = get_engine()
     if engine is None:
         raise HTTPException(status_code=503, detail="Engine not initialized")
     await engine.stop()
@@ -31,9 +43,8 @@ async def stop_engine():
 
 
 @router.post("/check-now", dependencies=[Depends(require_write_allowed)])
-async def check_now():
+async def check_now(engine: AlertEngine | None = Depends(get_engine)):
     """Trigger a single poll cycle immediately."""
-    engine = get_engine()
     if engine is None:
         raise HTTPException(status_code=503, detail="Engine not initialized")
     result = await engine.check_now()
@@ -41,9 +52,18 @@ async def check_now():
 
 
 @router.get("/status")
-async def get_status():
-    """Get the current engine status."""
-    engine = get_engine()
+async def get_status(engine: AlertEngine | None = Depends(get_engine)):
+    """Get the current engine status.
+
+    Polled by the dashboard and uptime checks, so the body is re-encoded
+    only when the status changes; it only holds strings, bools and None.
+    """
     if engine is None:
-        return {"running": False, "message": "Engine not initialized", "demo_mode": settings.demo_mode}
-    return {**engine.get_status(), "demo_mode": settings.demo_mode}
+        status = {
+            "running": False,
+            "message": "Engine not initialized",
+            "demo_mode": settings.demo_mode,
+        }
+    else:
+        status = {**engine.get_status(), "demo_mode": settings.demo_mode}
+    return Response(content=_status_body(status), media_type="application/json")
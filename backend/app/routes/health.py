@@ -2,51 +2,73 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.cache import TTLMemo
 from app.config import get_settings
-from app.database import get_database
-from app.dependencies import get_bmkg_client, get_engine
+from app.database import DatabaseManager
+from app.dependencies import get_bmkg_client, get_db, get_engine
+from app.engine.bmkg_client import HttpBMKGClient
+from app.engine.worker import AlertEngine
 
 router = APIRouter(tags=["health"])
 
 _start_time: float = time.time()
 
+# Longest the health check waits on the BMKG probe before reporting it unreachable
+_BMKG_PROBE_TIMEOUT = 2.0
+
+# The dashboard polls /health; upstream reachability and the counts are
+# stable well beyond its refresh interval.
+_probe_memo = TTLMemo(ttl=30.0)
+_counts_memo = TTLMemo(ttl=5.0)
+
+
+async def _probe_bmkg(bmkg_client: HttpBMKGClient) -> bool:
+    try:
+        return await asyncio.wait_for(bmkg_client.check_health(), _BMKG_PROBE_TIMEOUT)
+    except Exception:
+        return False
+
+
+async def _bmkg_reachable(bmkg_client: HttpBMKGClient | None) -> bool:
+    if bmkg_client is None:
+        return False
+    return await _probe_memo.get_or_fill(bmkg_client, lambda: _probe_bmkg(bmkg_client))
+
+
+async def _count_rows(db: DatabaseManager) -> tuple:
+    """Run the health counts concurrently across the reader pool."""
+    return await asyncio.gather(
+        db.fetch_one("SELECT COUNT(*) as cnt FROM locations WHERE enabled = 1"),
+        db.fetch_all("SELECT channel_type FROM notification_channels WHERE enabled = 1"),
+        db.fetch_one("SELECT COUNT(*) as cnt FROM alerts WHERE status = 'active'"),
+        db.fetch_one(
+            "SELECT COUNT(*) as cnt FROM trial_subscriptions WHERE expires_at > datetime('now')"
+        ),
+    )
+
 
 @router.get("/health")
-async def health_check():
+async def health_check(
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+    bmkg_client: HttpBMKGClient | None = Depends(get_bmkg_client),
+):
     """Full health check with component status."""
     settings = get_settings()
-    db = get_database()
 
     # Engine status
-    engine = get_engine()
     engine_status = engine.get_status() if engine else {"running": False}
 
-    # BMKG API status
-    bmkg_client = get_bmkg_client()
-    bmkg_ok = False
-    if bmkg_client:
-        try:
-            bmkg_ok = await bmkg_client.check_health()
-        except Exception:
-            bmkg_ok = False
-
-    # Counts
-    locations_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM locations WHERE enabled = 1"
-    )
-    channels_rows = await db.fetch_all(
-        "SELECT channel_type FROM notification_channels WHERE enabled = 1"
-    )
-    active_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM alerts WHERE status = 'active'"
-    )
-    trials_row = await db.fetch_one(
-        "SELECT COUNT(*) as cnt FROM trial_subscriptions WHERE expires_at > datetime('now')"
+    bmkg_ok, counts = await asyncio.gather(
+        _bmkg_reachable(bmkg_client),
+        _counts_memo.get_or_fill(db, lambda: _count_rows(db)),
     )
+    locations_row, channels_rows, active_row, trials_row = counts
 
     return {
         "status": "healthy",
@@ -4,26 +4,32 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.database import get_database
-from app.dependencies import require_write_allowed
+from app.database import DatabaseManager
+from app.dependencies import get_db, get_engine, require_write_allowed
+from app.engine.state import LOCATION_COLUMNS
+from app.engine.worker import AlertEngine
 from app.models import LocationCreate, LocationUpdate
+from app.routes.responses import ORJSONResponse
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
 
 @router.get("")
-async def list_locations():
+async def list_locations(db: DatabaseManager = Depends(get_db)):
     """List all monitored locations."""
-    db = get_database()
-    rows = await db.fetch_all("SELECT * FROM locations ORDER BY created_at DESC")
-    return {"data": [dict(row) for row in rows]}
+    rows = await db.fetch_all(
+        f"SELECT {LOCATION_COLUMNS} FROM locations ORDER BY created_at DESC"
+    )
+    return ORJSONResponse({"data": [dict(row) for row in rows]})
 
 
 @router.post("", status_code=201, dependencies=[Depends(require_write_allowed)])
-async def create_location(body: LocationCreate):
+async def create_location(
+    body: LocationCreate,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Add a new monitored location."""
-    db = get_database()
-
     # Check for duplicate subdistrict_code
     existing = await db.fetch_one(
         "SELECT id FROM locations WHERE subdistrict_code = ?",
@@ -35,13 +41,14 @@ async def create_location(body: LocationCreate):
             detail=f"Location with subdistrict_code {body.subdistrict_code} already exists",
         )
 
-    cursor = await db.execute(
-        """
+    (row,) = await db.execute_returning(
+        f"""
         INSERT INTO locations (
             label, province_code, province_name, district_code,
             district_name, subdistrict_code, subdistrict_name,
             latitude, longitude
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING {LOCATION_COLUMNS}
         """,
         (
             body.label,
@@ -55,29 +62,30 @@ async def create_location(body: LocationCreate):
             body.longitude,
         ),
     )
-    location_id = cursor.lastrowid
-    row = await db.fetch_one("SELECT * FROM locations WHERE id = ?", (location_id,))
+    if engine is not None:
+        engine.invalidate_locations()
     return {"data": dict(row)}
 
 
 @router.get("/{location_id}")
-async def get_location(location_id: int):
+async def get_location(location_id: int, db: DatabaseManager = Depends(get_db)):
     """Get a specific location."""
-    db = get_database()
-    row = await db.fetch_one("SELECT * FROM locations WHERE id = ?", (location_id,))
+    row = await db.fetch_one(
+        f"SELECT {LOCATION_COLUMNS} FROM locations WHERE id = ?", (location_id,)
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Location not found")
     return {"data": dict(row)}
 
 
 @router.patch("/{location_id}", dependencies=[Depends(require_write_allowed)])
-async def update_location(location_id: int, body: LocationUpdate):
+async def update_location(
+    location_id: int,
+    body: LocationUpdate,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Update a location's label or enabled status."""
-    db = get_database()
-    row = await db.fetch_one("SELECT * FROM locations WHERE id = ?", (location_id,))
-    if not row:
-        raise HTTPException(status_code=404, detail="Location not found")
-
     updates = {}
     if body.label is not None:
         updates["label"] = body.label
@@ -87,21 +95,34 @@ async def update_location(location_id: int, body: LocationUpdate):
     if updates:
         set_clause = ", ".join(f"{k} = ?" for k in updates)
         values = list(updates.values()) + [location_id]
-        await db.execute(
-            f"UPDATE locations SET {set_clause} WHERE id = ?",
+        rows = await db.execute_returning(
+            f"UPDATE locations SET {set_clause} WHERE id = ? RETURNING {LOCATION_COLUMNS}",
             tuple(values),
         )
+        row = rows[0] if rows else None
+        if row is not None and engine is not None:
+            engine.invalidate_locations()
+    else:
+        row = await db.fetch_one(
+            f"SELECT {LOCATION_COLUMNS} FROM locations WHERE id = ?", (location_id,)
+        )
 
-    row = await db.fetch_one("SELECT * FROM locations WHERE id = ?", (location_id,))
+    if row is None:
+        raise HTTPException(status_code=404, detail="Location not found")
     return {"data": dict(row)}
 
 
 @router.delete("/{location_id}", dependencies=[Depends(require_write_allowed)])
-async def delete_location(location_id: int):
+async def delete_location(
+    location_id: int,
+    db: DatabaseManager = Depends(get_db),
+    engine: AlertEngine | None = Depends(get_engine),
+):
     """Delete a monitored location."""
-    db = get_database()
-    row = await db.fetch_one("SELECT * FROM locations WHERE id = ?", (location_id,))
+    row = await db.fetch_one("SELECT id FROM locations WHERE id = ?", (location_id,))
     if not row:
         raise HTTPException(status_code=404, detail="Location not found")
     await db.execute("DELETE FROM locations WHERE id = ?", (location_id,))
+    if engine is not None:
+        engine.invalidate_locations()
     return {"status": "deleted", "id": location_id}
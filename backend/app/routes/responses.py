@@ -0,0 +1,27 @@
+"""Response classes shared by the alert-system routes."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson.
+
+    Returned directly from a handler, it bypasses FastAPI's recursive
+    ``jsonable_encoder`` pass — the dominant cost for row lists carrying
+    alert polygons.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
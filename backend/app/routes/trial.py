@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import re
 from datetime import datetime, timedelta, timezone
 
-import httpx
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 
 import structlog
 
+from app.cache import TTLMemo
 from app.config import settings
-from app.database import get_database
-from app.notifications.telegram import TelegramSender
+from app.database import DatabaseManager
+from app.dependencies import get_db
+from app.notifications.client import get_notification_client
+from app.notifications.telegram import TELEGRAM_API_BASE, TelegramSender
 
 logger = structlog.get_logger()
 
@@ -21,6 +24,34 @@ router = APIRouter(prefix="/trial", tags=["trial"])
 TRIAL_DURATION_HOURS = 24
 MAX_REGISTRATIONS_PER_IP = 5
 
+_CONFIRM_TEMPLATE = (
+    "<b>Trial BMKG Alert Aktif!</b>\n\n"
+    "Lokasi: {location_label}\n"
+    "Severity: {severity_min}\n"
+    f"Berlaku: {TRIAL_DURATION_HOURS} jam\n\n"
+    "Anda akan menerima notifikasi peringatan cuaca BMKG "
+    "untuk lokasi ini selama masa trial.\n\n"
+    "<i>BMKG Alert System</i>"
+)
+_CANCEL_MSG = (
+    "<b>Trial BMKG Alert Dihentikan</b>\n\n"
+    "Trial Anda telah dihentikan. "
+    "Terima kasih sudah mencoba BMKG Alert!\n\n"
+    "Untuk mendapatkan notifikasi secara permanen, silakan cek di "
+    "<a href=\"https://github.com/dhanyyudi/bmkg-alert\">github.com/dhanyyudi/bmkg-alert</a> "
+    "atau hubungi <a href=\"https://dhanypedia.com\">dhanypedia.com</a>\n\n"
+    "<i>BMKG Alert System</i>"
+)
+_TEST_MSG = (
+    "✅ <b>Pesan Tes — BMKG Alert</b>\n\n"
+    "Bot berhasil menghubungi Anda! Anda akan menerima notifikasi peringatan "
+    "cuaca BMKG secara otomatis ketika ada peringatan untuk lokasi yang dipilih.\n\n"
+    "<i>BMKG Alert System</i>"
+)
+
+# getMe answers change only when the bot is renamed; keyed on the token
+_bot_info_memo = TTLMemo(ttl=300.0)
+
 
 # ── Models ────────────────────────────────────────────────────────────────────
 
@@ -35,10 +66,17 @@ class TrialRegister(BaseModel):
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+# First X-Forwarded-For entry, only when it looks like an IPv4/IPv6 address
+_FORWARDED_FOR = re.compile(r"\s*([0-9A-Fa-f.:]{2,45})\s*(?:,|$)")
+_FORWARDED_FOR_MAX = 256
+
+
 def _client_ip(request: Request) -> str:
-    forwarded = request.headers.get("x-forwarded-for", "")
+    forwarded = request.headers.get("x-forwarded-for", "")[:_FORWARDED_FOR_MAX]
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        match = _FORWARDED_FOR.match(forwarded)
+        if match:
+            return match.group(1)
     return request.client.host if request.client else "unknown"
 
 
@@ -55,40 +93,48 @@ async def _send_trial_message(chat_id: str, text: str) -> bool:
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.post("/register")
-async def register_trial(body: TrialRegister, request: Request):
-    """Register a 24-hour Telegram trial subscription."""
-    db = get_database()
-
+async def register_trial(
+    body: TrialRegister,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: DatabaseManager = Depends(get_db),
+):
+    """Register a 24-hour Telegram trial subscription.
+
+    The confirmation message and activity log entry go out after the
+    response, so registering never waits on Telegram.
+    """
     if not body.chat_id.strip():
         raise HTTPException(status_code=400, detail="Chat ID tidak boleh kosong")
 
     if not body.location_code.strip():
         raise HTTPException(status_code=400, detail="Kode lokasi tidak boleh kosong")
 
-    # Check for existing active trial for this chat_id
-    existing = await db.fetch_one(
+    # Existing active trial for this chat_id, and registrations from this IP
+    # in the last hour, in one round trip
+    ip = _client_ip(request)
+    guard = await db.fetch_one(
         """
-        SELECT id FROM trial_subscriptions
-        WHERE telegram_chat_id = ? AND expires_at > CURRENT_TIMESTAMP
+        SELECT
+            EXISTS (
+                SELECT 1 FROM trial_subscriptions
+                WHERE telegram_chat_id = ? AND expires_at > CURRENT_TIMESTAMP
+            ) AS has_active,
+            (
+                SELECT COUNT(*) FROM trial_subscriptions
+                WHERE ip_address = ? AND registered_at > datetime('now', '-1 hour')
+            ) AS ip_count
         """,
-        (body.chat_id,),
+        (body.chat_id, ip),
     )
-    if existing:
+    if guard["has_active"]:
         raise HTTPException(
             status_code=409,
             detail="Anda sudah memiliki trial aktif. Tunggu hingga berakhir atau hentikan terlebih dahulu.",
         )
 
     # Rate limit: max registrations per IP in the last hour
-    ip = _client_ip(request)
-    ip_count = await db.fetch_one(
-        """
-        SELECT COUNT(*) as cnt FROM trial_subscriptions
-        WHERE ip_address = ? AND registered_at > datetime('now', '-1 hour')
-        """,
-        (ip,),
-    )
-    if ip_count and ip_count["cnt"] >= MAX_REGISTRATIONS_PER_IP:
+    if guard["ip_count"] >= MAX_REGISTRATIONS_PER_IP:
         raise HTTPException(
             status_code=429,
             detail="Terlalu banyak registrasi dari IP ini. Coba lagi nanti.",
@@ -98,12 +144,13 @@ async def register_trial(body: TrialRegister, request: Request):
     expires_at = datetime.now(timezone.utc) + timedelta(hours=TRIAL_DURATION_HOURS)
     expires_str = expires_at.strftime("%Y-%m-%d %H:%M:%S")
 
-    cursor = await db.execute(
+    (inserted,) = await db.execute_returning(
         """
         INSERT INTO trial_subscriptions
             (telegram_chat_id, subdistrict_code, subdistrict_name, district_name, province_name,
              severity_threshold, expires_at, ip_address)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING id
         """,
         (
             body.chat_id,
@@ -116,26 +163,21 @@ async def register_trial(body: TrialRegister, request: Request):
             ip,
         ),
     )
-    trial_id = cursor.lastrowid
+    trial_id = inserted["id"]
 
     # Send confirmation via Telegram
     location_label = body.location_name
     if body.district_name:
         location_label += f", {body.district_name}"
 
-    confirm_msg = (
-        "<b>Trial BMKG Alert Aktif!</b>\n\n"
-        f"Lokasi: {location_label}\n"
-        f"Severity: {body.severity_min}\n"
-        f"Berlaku: {TRIAL_DURATION_HOURS} jam\n\n"
-        "Anda akan menerima notifikasi peringatan cuaca BMKG "
-        "untuk lokasi ini selama masa trial.\n\n"
-        "<i>BMKG Alert System</i>"
+    confirm_msg = _CONFIRM_TEMPLATE.format_map(
+        {"location_label": location_label, "severity_min": body.severity_min}
     )
-    await _send_trial_message(body.chat_id, confirm_msg)
+    background_tasks.add_task(_send_trial_message, body.chat_id, confirm_msg)
 
     # Log activity
-    await db.execute(
+    background_tasks.add_task(
+        db.execute,
         "INSERT INTO activity_log (event_type, message) VALUES (?, ?)",
         ("trial_registered", f"Trial registered for chat {body.chat_id}: {location_label}"),
     )
@@ -148,10 +190,8 @@ async def register_trial(body: TrialRegister, request: Request):
 
 
 @router.get("/status/{chat_id}")
-async def get_trial_status(chat_id: str):
+async def get_trial_status(chat_id: str, db: DatabaseManager = Depends(get_db)):
     """Get active trial status for a chat ID."""
-    db = get_database()
-
     row = await db.fetch_one(
         """
         SELECT id, telegram_chat_id, subdistrict_code, subdistrict_name,
@@ -181,10 +221,13 @@ async def get_trial_status(chat_id: str):
 
 
 @router.delete("/{trial_id}")
-async def cancel_trial(trial_id: int, chat_id: str = Query(..., description="Chat ID pemilik trial")):
+async def cancel_trial(
+    trial_id: int,
+    background_tasks: BackgroundTasks,
+    chat_id: str = Query(..., description="Chat ID pemilik trial"),
+    db: DatabaseManager = Depends(get_db),
+):
     """Cancel an active trial subscription. Requires the owner's chat_id for verification."""
-    db = get_database()
-
     row = await db.fetch_one(
         "SELECT telegram_chat_id, subdistrict_name FROM trial_subscriptions WHERE id = ?",
         (trial_id,),
@@ -202,19 +245,11 @@ async def cancel_trial(trial_id: int, chat_id: str = Query(..., description="Cha
     )
 
     # Send cancellation message
-    cancel_msg = (
-        "<b>Trial BMKG Alert Dihentikan</b>\n\n"
-        "Trial Anda telah dihentikan. "
-        "Terima kasih sudah mencoba BMKG Alert!\n\n"
-        "Untuk mendapatkan notifikasi secara permanen, silakan cek di "
-        "<a href=\"https://github.com/dhanyyudi/bmkg-alert\">github.com/dhanyyudi/bmkg-alert</a> "
-        "atau hubungi <a href=\"https://dhanypedia.com\">dhanypedia.com</a>\n\n"
-        "<i>BMKG Alert System</i>"
-    )
-    await _send_trial_message(row["telegram_chat_id"], cancel_msg)
+    background_tasks.add_task(_send_trial_message, row["telegram_chat_id"], _CANCEL_MSG)
 
     # Log activity
-    await db.execute(
+    background_tasks.add_task(
+        db.execute,
         "INSERT INTO activity_log (event_type, message) VALUES (?, ?)",
         ("trial_cancelled", f"Trial cancelled for chat {row['telegram_chat_id']}"),
     )
@@ -222,17 +257,12 @@ async def cancel_trial(trial_id: int, chat_id: str = Query(..., description="Cha
     return {"success": True}
 
 
-@router.get("/bot-info")
-async def get_bot_info():
-    """Return the Telegram bot username so the UI can tell users which bot to /start."""
-    bot_token = settings.telegram_bot_token
-    if not bot_token:
-        return {"available": False}
-
-    url = f"https://api.telegram.org/bot{bot_token}/getMe"
+async def _fetch_bot_info(bot_token: str) -> dict | None:
+    # Same keep-alive pool as the senders, so getMe reuses their
+    # connection to api.telegram.org
+    url = f"{TELEGRAM_API_BASE}/bot{bot_token}/getMe"
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(url)
+        resp = await get_notification_client().get(url, timeout=5.0)
         data = resp.json()
         if resp.status_code == 200 and data.get("ok"):
             result = data["result"]
@@ -243,14 +273,23 @@ async def get_bot_info():
             }
     except Exception:
         pass
-    return {"available": False}
+    return None
+
+
+@router.get("/bot-info")
+async def get_bot_info():
+    """Return the Telegram bot username so the UI can tell users which bot to /start."""
+    bot_token = settings.telegram_bot_token
+    if not bot_token:
+        return {"available": False}
+
+    info = await _bot_info_memo.get_or_fill(bot_token, lambda: _fetch_bot_info(bot_token))
+    return info or {"available": False}
 
 
 @router.post("/{trial_id}/test-message")
-async def send_test_message(trial_id: int):
+async def send_test_message(trial_id: int, db: DatabaseManager = Depends(get_db)):
     """Send a test Telegram message so the user can verify the bot can reach them."""
-    db = get_database()
-
     row = await db.fetch_one(
         """
         SELECT telegram_chat_id FROM trial_subscriptions
@@ -261,13 +300,7 @@ async def send_test_message(trial_id: int):
     if not row:
         raise HTTPException(status_code=404, detail="Trial tidak ditemukan atau sudah berakhir")
 
-    test_msg = (
-        "✅ <b>Pesan Tes — BMKG Alert</b>\n\n"
-        "Bot berhasil menghubungi Anda! Anda akan menerima notifikasi peringatan "
-        "cuaca BMKG secara otomatis ketika ada peringatan untuk lokasi yang dipilih.\n\n"
-        "<i>BMKG Alert System</i>"
-    )
-    success = await _send_trial_message(row["telegram_chat_id"], test_msg)
+    success = await _send_trial_message(row["telegram_chat_id"], _TEST_MSG)
     if not success:
         raise HTTPException(
             status_code=502,
@@ -2,22 +2,24 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 
 from app.dependencies import get_bmkg_client
+from app.engine.bmkg_client import HttpBMKGClient
 
 router = APIRouter(prefix="/wilayah", tags=["wilayah"])
 
 
 @router.get("/search")
-async def search_wilayah(q: str = Query(..., min_length=2)):
+async def search_wilayah(
+    q: str = Query(..., min_length=2),
+    client: HttpBMKGClient = Depends(get_bmkg_client),
+):
     """Search for administrative areas (kecamatan, kabupaten, provinsi)."""
-    client = get_bmkg_client()
     return await client.search_wilayah(q)
 
 
 @router.get("/provinces")
-async def get_provinces():
+async def get_provinces(client: HttpBMKGClient = Depends(get_bmkg_client)):
     """Get list of all provinces."""
-    client = get_bmkg_client()
     return await client.get_provinces()
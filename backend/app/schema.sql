@@ -50,7 +50,7 @@ CREATE TABLE IF NOT EXISTS alerts (
     effective TIMESTAMP,
     expires TIMESTAMP,
     infographic_url TEXT,
-    polygon_data TEXT,
+    polygon_data BLOB,  -- JSONB on SQLite 3.45+, JSON text otherwise
     matched_location_id INTEGER REFERENCES locations(id),
     match_type TEXT,
     matched_text TEXT,
@@ -95,11 +95,19 @@ CREATE TABLE IF NOT EXISTS activity_log (
 );
 
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status);
+-- (status, created_at) serves status lookups and status-filtered listings
+-- newest first; it replaces the old status-only index.
+DROP INDEX IF EXISTS idx_alerts_status;
+CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts(status, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_alerts_code ON alerts(bmkg_alert_code);
+CREATE INDEX IF NOT EXISTS idx_alerts_active_expiry ON alerts(expires) WHERE status = 'active';
 CREATE INDEX IF NOT EXISTS idx_trials_expires ON trial_subscriptions(expires_at);
-CREATE INDEX IF NOT EXISTS idx_trials_chat ON trial_subscriptions(telegram_chat_id);
+-- (telegram_chat_id, expires_at) answers "active trial for this chat" from the
+-- index alone and replaces the chat-only index.
+DROP INDEX IF EXISTS idx_trials_chat;
+CREATE INDEX IF NOT EXISTS idx_trials_chat_expires ON trial_subscriptions(telegram_chat_id, expires_at);
+CREATE INDEX IF NOT EXISTS idx_trials_ip_registered ON trial_subscriptions(ip_address, registered_at);
 CREATE INDEX IF NOT EXISTS idx_activity_created ON activity_log(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_deliveries_alert ON alert_deliveries(alert_id);
 
@@ -1,32 +1,43 @@
 from typing import Union
+import importlib
 import logging
-from app.services.notifications.base import NotificationProvider, NotificationMessage
-from app.services.notifications.discord import DiscordProvider
-from app.services.notifications.slack import SlackProvider
-from app.services.notifications.webhook import WebhookProvider
-from app.services.notifications.email import EmailProvider
-from app.services.notifications.telegram import TelegramProvider
+from app.services.notifications.base import NotificationProvider, NotificationMessage, RenderedMessage
 from app.models.nowcast import Warning
 from app.models.earthquake import Earthquake
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Longest a dispatch may take, so a dead provider cannot stall the poll loop
+DISPATCH_TIMEOUT = 15.0
+
+# name -> (module, class) of each notification provider
+PROVIDERS: dict[str, tuple[str, str]] = {
+    "discord": ("app.services.notifications.discord", "DiscordProvider"),
+    "slack": ("app.services.notifications.slack", "SlackProvider"),
+    "webhook": ("app.services.notifications.webhook", "WebhookProvider"),
+    "email": ("app.services.notifications.email", "EmailProvider"),
+    "telegram": ("app.services.notifications.telegram", "TelegramProvider"),
+}
+
 class NotificationService:
     """Service to deliver notifications across multiple channels."""
     
     def __init__(self):
-        self.providers: list[NotificationProvider] = [
-            DiscordProvider(),
-            SlackProvider(),
-            WebhookProvider(),
-            WebhookProvider(),
-            EmailProvider(),
-            TelegramProvider(),
+        constructed: list[NotificationProvider] = [
+            getattr(importlib.import_module(module), class_name)()
+            for module, class_name in PROVIDERS.values()
         ]
+        # Each provider decides from its own settings whether it is usable
+        self.providers = [provider for provider in constructed if provider.enabled]
+        logger.info(f"Notification providers enabled: {[p.name for p in self.providers]}")
     
     async def dispatch(self, alert: Union[Warning, Earthquake]):
         """Dispatch an alert to all configured providers."""
+        providers = [provider for provider in self.providers if provider.enabled]
+        if not providers:
+            return
+
         if isinstance(alert, Warning):
             message = self._create_message_from_warning(alert)
         elif isinstance(alert, Earthquake):
@@ -36,12 +47,40 @@ class NotificationService:
             return
 
         logger.info(f"Dispatching alert: {message.title}")
+        rendered = self._render(message)
         
-        # Send to all providers in parallel
-        tasks = [provider.send(message) for provider in self.providers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.info(f"Notification Results: {results}")
+        # Send to all providers in parallel, logging each as it finishes
+        tasks = {
+            asyncio.create_task(self._send(provider, rendered)): provider.name
+            for provider in providers
+        }
+        try:
+            async with asyncio.timeout(DISPATCH_TIMEOUT):
+                for next_done in asyncio.as_completed(tasks):
+                    name, ok = await next_done
+                    logger.info(f"{name} notification {'sent' if ok else 'not sent'}: {message.title}")
+        except TimeoutError:
+            unfinished = [name for task, name in tasks.items() if not task.done()]
+            for task in tasks:
+                task.cancel()
+            logger.warning(
+                f"Notification dispatch timed out after {DISPATCH_TIMEOUT}s "
+                f"waiting on {', '.join(unfinished)}: {message.title}"
+            )
+
+    @staticmethod
+    async def _send(provider: NotificationProvider, message: RenderedMessage) -> tuple[str, bool]:
+        try:
+            return provider.name, await provider.send(message)
+        except Exception as e:
+            logger.warning(f"{provider.name} notification failed: {e!r}")
+            return provider.name, False
         
+    @staticmethod
+    def _render(message: NotificationMessage) -> RenderedMessage:
+        """Serialize the message once for all providers."""
+        return RenderedMessage.from_message(message)
+
     def _create_message_from_warning(self, warning: Warning) -> NotificationMessage:
         """Convert Warning model to NotificationMessage."""
         severity = warning.severity.value if hasattr(warning.severity, 'value') else str(warning.severity)
@@ -1,8 +1,18 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, ClassVar, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
+import httpx
+
+# Per-post bound for webhook providers, so one hung endpoint cannot hold
+# up a dispatch
+POST_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
 class NotificationMessage(BaseModel):
     """Unified notification message model."""
     title: str
@@ -12,16 +22,76 @@ class NotificationMessage(BaseModel):
     url: Optional[str] = None
     original_data: Optional[dict[str, Any]] = None  # Original alert data
 
+# severity -> (Discord embed colour, Slack attachment colour); anything
+# unlisted gets the default pair
+_SEVERITY_COLORS: dict[str, tuple[int, str]] = {
+    "Critical": (0xe74c3c, "#danger"),  # Red
+    "High": (0xe67e22, "#danger"),  # Orange
+    "Medium": (0xf1c40f, "#warning"),  # Yellow
+}
+_DEFAULT_COLORS = (0x3498db, "#36a64f")  # Blue (Info) / Green (Good)
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedMessage:
+    """A message with the parts every provider needs computed once."""
+    title: str
+    body: str
+    severity: str
+    timestamp: datetime
+    url: Optional[str]
+    iso_ts: str
+    unix_ts: float
+    json_body: bytes
+    color_discord: int
+    color_slack: str
+
+    @classmethod
+    def from_message(cls, message: NotificationMessage) -> "RenderedMessage":
+        color_discord, color_slack = _SEVERITY_COLORS.get(message.severity, _DEFAULT_COLORS)
+        return cls(
+            title=message.title,
+            body=message.body,
+            severity=message.severity,
+            timestamp=message.timestamp,
+            url=message.url,
+            iso_ts=message.timestamp.isoformat(),
+            unix_ts=message.timestamp.timestamp(),
+            json_body=message.model_dump_json().encode(),
+            color_discord=color_discord,
+            color_slack=color_slack,
+        )
+
 class NotificationProvider(ABC):
     """Abstract base class for notification providers."""
     
+    # Provider name (e.g. 'discord', 'email')
+    name: ClassVar[str]
+    # Whether the provider's settings are present; read once at construction
+    enabled: bool = False
+    # Most sends per rate_period seconds the destination accepts; None is
+    # unthrottled
+    rate_limit: Optional[int] = None
+    rate_period: float = 1.0
+
+    def __init__(self):
+        self._sent_at: deque[float] = deque()
+        self._throttle_lock = asyncio.Lock()
+
+    async def throttle(self) -> None:
+        """Wait until another send fits in the provider's sliding window."""
+        if self.rate_limit is None:
+            return
+        async with self._throttle_lock:
+            now = time.monotonic()
+            while self._sent_at and now - self._sent_at[0] >= self.rate_period:
+                self._sent_at.popleft()
+            if len(self._sent_at) >= self.rate_limit:
+                await asyncio.sleep(self.rate_period - (now - self._sent_at[0]))
+                self._sent_at.popleft()
+            self._sent_at.append(time.monotonic())
+
     @abstractmethod
-    async def send(self, message: NotificationMessage) -> bool:
+    async def send(self, message: RenderedMessage) -> bool:
         """Send a notification. Returns True if successful."""
         pass
-    
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Provider name (e.g. 'discord', 'email')."""
-        pass
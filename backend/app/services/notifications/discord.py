@@ -1,43 +1,51 @@
-import httpx
-from app.services.notifications.base import NotificationProvider, NotificationMessage
+import logging
+
+import orjson
+
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.services.notifications.base import POST_TIMEOUT, NotificationProvider, RenderedMessage
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class DiscordProvider(NotificationProvider):
     """Discord Webhook Provider."""
+
+    name = "discord"
     
-    @property
-    def name(self) -> str:
-        return "discord"
-    
-    async def send(self, message: NotificationMessage) -> bool:
-        webhook_url = settings.discord_webhook_url
+    # Discord webhooks allow 5 posts per 5 seconds
+    rate_limit = 5
+    rate_period = 5.0
+
+    def __init__(self):
+        super().__init__()
+        self.webhook_url = settings.discord_webhook_url
+        self.enabled = bool(self.webhook_url)
+
+    async def send(self, message: RenderedMessage) -> bool:
+        webhook_url = self.webhook_url
         if not webhook_url:
             return False
             
-        color = 0x3498db  # Blue (Info)
-        if message.severity == "Critical":
-            color = 0xe74c3c  # Red
-        elif message.severity == "High":
-            color = 0xe67e22  # Orange
-        elif message.severity == "Medium":
-            color = 0xf1c40f  # Yellow
-
         payload = {
             "embeds": [{
                 "title": message.title,
                 "description": message.body,
-                "color": color,
-                "timestamp": message.timestamp.isoformat(),
+                "color": message.color_discord,
+                "timestamp": message.iso_ts,
                 "footer": {"text": "BMKG Alert System"},
                 "url": message.url or "https://bmkg.go.id"
             }]
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(webhook_url, json=payload)
-                resp.raise_for_status()
-                return True
-            except Exception as e:
-                print(f"Failed to send Discord notification: {e}")
-                return False
+        try:
+            await self.throttle()
+            resp = await post_with_retry(
+                webhook_url, content=orjson.dumps(payload), headers=JSON_HEADERS,
+                timeout=POST_TIMEOUT,
+            )
+            resp.raise_for_status()
+            return True
+        except Exception:
+            logger.exception("Failed to send %s notification", self.name)
+            return False
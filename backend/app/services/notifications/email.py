@@ -1,17 +1,23 @@
-import aiosmtplib
+import logging
 from email.message import EmailMessage
-from app.services.notifications.base import NotificationProvider, NotificationMessage
+from email.utils import parseaddr
+from app.notifications.email import send_pooled
+from app.services.notifications.base import NotificationProvider, RenderedMessage
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class EmailProvider(NotificationProvider):
     """Email Provider using SMTP."""
+
+    name = "email"
     
-    @property
-    def name(self) -> str:
-        return "email"
-    
-    async def send(self, message: NotificationMessage) -> bool:
-        if not settings.smtp_host or not settings.smtp_user:
+    def __init__(self):
+        super().__init__()
+        self.enabled = bool(settings.smtp_host and settings.smtp_user)
+
+    async def send(self, message: RenderedMessage) -> bool:
+        if not self.enabled:
             return False
             
         msg = EmailMessage()
@@ -21,15 +27,20 @@ class EmailProvider(NotificationProvider):
         msg.set_content(f"{message.body}\n\nTimestamp: {message.timestamp}\nMore info: {message.url}")
         
         try:
-            await aiosmtplib.send(
-                msg,
-                hostname=settings.smtp_host,
-                port=settings.smtp_port,
-                username=settings.smtp_user,
-                password=settings.smtp_password,
-                use_tls=True
+            # Shares the alert system's pooled SMTP sessions, so repeat sends
+            # skip the TLS + AUTH handshake
+            await send_pooled(
+                {
+                    "host": settings.smtp_host,
+                    "port": settings.smtp_port,
+                    "user": settings.smtp_user,
+                    "password": settings.smtp_password,
+                },
+                parseaddr(settings.smtp_from)[1],
+                [settings.smtp_user],
+                msg.as_bytes(),
             )
             return True
-        except Exception as e:
-            print(f"Failed to send Email notification: {e}")
+        except Exception:
+            logger.exception("Failed to send %s notification", self.name)
             return False
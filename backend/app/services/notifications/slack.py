@@ -1,44 +1,53 @@
-import httpx
-from app.services.notifications.base import NotificationProvider, NotificationMessage
+import logging
+
+import orjson
+
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.services.notifications.base import POST_TIMEOUT, NotificationProvider, RenderedMessage
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class SlackProvider(NotificationProvider):
     """Slack Webhook Provider."""
+
+    name = "slack"
     
-    @property
-    def name(self) -> str:
-        return "slack"
-    
-    async def send(self, message: NotificationMessage) -> bool:
-        webhook_url = settings.slack_webhook_url
+    # Slack incoming webhooks allow about one post a second
+    rate_limit = 1
+    rate_period = 1.0
+
+    def __init__(self):
+        super().__init__()
+        self.webhook_url = settings.slack_webhook_url
+        self.enabled = bool(self.webhook_url)
+
+    async def send(self, message: RenderedMessage) -> bool:
+        webhook_url = self.webhook_url
         if not webhook_url:
             return False
             
-        # Map severity to Slack colors
-        color = "#36a64f" # Green/Good
-        if message.severity in ["Critical", "High"]:
-             color = "#danger"
-        elif message.severity == "Medium":
-             color = "#warning"
-
         payload = {
             "attachments": [
                 {
-                    "color": color,
+                    "color": message.color_slack,
                     "title": message.title,
                     "title_link": message.url,
                     "text": message.body,
                     "footer": "BMKG Alert System",
-                    "ts": message.timestamp.timestamp()
+                    "ts": message.unix_ts
                 }
             ]
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(webhook_url, json=payload)
-                resp.raise_for_status()
-                return True
-            except Exception as e:
-                print(f"Failed to send Slack notification: {e}")
-                return False
+        try:
+            await self.throttle()
+            resp = await post_with_retry(
+                webhook_url, content=orjson.dumps(payload), headers=JSON_HEADERS,
+                timeout=POST_TIMEOUT,
+            )
+            resp.raise_for_status()
+            return True
+        except Exception:
+            logger.exception("Failed to send %s notification", self.name)
+            return False
@@ -1,20 +1,25 @@
 import logging
-import httpx
 from typing import Any
 
+import orjson
+
 from app.config import settings
-from app.services.notifications.base import NotificationProvider, NotificationMessage
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.services.notifications.base import NotificationProvider, RenderedMessage
 
 logger = logging.getLogger(__name__)
 
 class TelegramProvider(NotificationProvider):
     """Telegram Bot notification provider."""
+
+    name = "Telegram"
     
-    @property
-    def name(self) -> str:
-        return "Telegram"
-        
+    # The Bot API allows about one message a second per chat
+    rate_limit = 1
+    rate_period = 1.0
+
     def __init__(self):
+        super().__init__()
         self.bot_token = settings.telegram_bot_token
         self.chat_id = settings.telegram_chat_id
         self.enabled = bool(self.bot_token and self.chat_id)
@@ -24,7 +29,7 @@ class TelegramProvider(NotificationProvider):
         else:
             logger.info("Telegram provider disabled (missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID)")
             
-    async def send(self, message: NotificationMessage) -> bool:
+    async def send(self, message: RenderedMessage) -> bool:
         """Send notification via Telegram Bot API."""
         if not self.enabled:
             return False
@@ -50,9 +55,11 @@ class TelegramProvider(NotificationProvider):
                 "disable_web_page_preview": False
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, timeout=10.0)
-                response.raise_for_status()
+            await self.throttle()
+            response = await post_with_retry(
+                url, content=orjson.dumps(payload), headers=JSON_HEADERS, timeout=10.0
+            )
+            response.raise_for_status()
                 
             logger.info(f"Telegram notification sent: {message.title}")
             return True
@@ -1,26 +1,33 @@
-import httpx
-from app.services.notifications.base import NotificationProvider, NotificationMessage
+import logging
+
+from app.notifications.client import JSON_HEADERS, post_with_retry
+from app.services.notifications.base import POST_TIMEOUT, NotificationProvider, RenderedMessage
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class WebhookProvider(NotificationProvider):
     """Generic Webhook Provider."""
+
+    name = "webhook"
     
-    @property
-    def name(self) -> str:
-        return "webhook"
-    
-    async def send(self, message: NotificationMessage) -> bool:
-        webhook_url = settings.generic_webhook_url
+    def __init__(self):
+        super().__init__()
+        self.webhook_url = settings.generic_webhook_url
+        self.enabled = bool(self.webhook_url)
+
+    async def send(self, message: RenderedMessage) -> bool:
+        webhook_url = self.webhook_url
         if not webhook_url:
             return False
             
-        payload = message.model_dump(mode='json')
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(webhook_url, json=payload)
-                resp.raise_for_status()
-                return True
-            except Exception as e:
-                print(f"Failed to send Webhook notification: {e}")
-                return False
+        try:
+            resp = await post_with_retry(
+                webhook_url, content=message.json_body, headers=JSON_HEADERS,
+                timeout=POST_TIMEOUT,
+            )
+            resp.raise_for_status()
+            return True
+        except Exception:
+            logger.exception("Failed to send %s notification", self.name)
+            return False
@@ -2,24 +2,89 @@
 
 import hashlib
 import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+import orjson
+
 from app.cache import cache
 from app.services.notification_service import notification_service
 from app.config import settings
+from app.etag import body_etag
 from app.http_client import get_http_client
 from app.models.nowcast import ActiveProvince, Warning, LocationCheckResult, NowcastDetailResponse
 from app.parsers.rss_parser import parse_rss_feed
 from app.parsers.cap_parser import parse_cap_xml
 
 
+# Datetimes render as ISO 8601 with "Z" for UTC; naive values are taken as UTC
+JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def utc_stamp() -> str:
+    """Current UTC time as an ISO 8601 string with a ``Z`` suffix."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec="seconds") + "Z"
+
+
+# Rendered bodies kept before expired ones are swept on the next store
+_RENDERED_SWEEP_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedBody:
+    """A serialized JSON response body and its strong ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
 class NowcastService:
     """Service for nowcast (weather warning) data operations."""
     
     def __init__(self):
         """Initialize nowcast service."""
         self.base_url = settings.bmkg_nowcast_base_url
+        self._rendered: dict[tuple[str, ...], RenderedBody] = {}
+    
+    async def get_rendered(
+        self,
+        key: tuple[str, ...],
+        build: Callable[[], Awaitable[tuple[dict | None, bool, int]]],
+    ) -> tuple[RenderedBody | None, bool, int]:
+        """Get a memoized response body, rendering it on a miss.
+        
+        The body is kept for as long as the data it was built from stays
+        cached, so repeat reads skip the model round-trip and JSON encoding.
+        
+        Args:
+            key: Memo key, e.g. ``("active", lang)``
+            build: Coroutine returning ``(payload, from_cache, ttl)``; a
+                ``None`` payload is passed through and not memoized
+            
+        Returns:
+            Tuple of (rendered body or None, from_cache, ttl)
+        """
+        now = time.monotonic()
+        rendered = self._rendered.get(key)
+        if rendered is not None and now < rendered.expires_at:
+            return rendered, True, int(rendered.expires_at - now)
+        
+        payload, from_cache, ttl = await build()
+        if payload is None:
+            return None, from_cache, ttl
+        
+        body = orjson.dumps(payload, option=JSON_OPTIONS)
+        rendered = RenderedBody(body, body_etag(body), now + ttl)
+        if len(self._rendered) >= _RENDERED_SWEEP_SIZE:
+            self._rendered = {
+                k: v for k, v in self._rendered.items() if now < v.expires_at
+            }
+        self._rendered[key] = rendered
+        return rendered, from_cache, ttl
     
     def _make_cache_key(self, endpoint: str, params: dict | None = None) -> str:
         """Generate cache key for endpoint."""
@@ -104,6 +169,7 @@ class NowcastService:
         # Store in cache (serialize to dict)
         cache_data = [p.model_dump(mode='json') for p in provinces]
         await cache.set(cache_key, cache_data, ttl)
+        await cache.set(f"{cache_key}:fetched_at", utc_stamp(), ttl)
         
         return provinces, False
     
@@ -138,9 +204,24 @@ class NowcastService:
         if warning:
             # Store in cache (serialize to dict)
             await cache.set(cache_key, warning.model_dump(mode='json'), ttl)
+            await cache.set(f"{cache_key}:fetched_at", utc_stamp(), ttl)
         
         return warning, False
     
+    async def _fetched_at(self, cache_key: str) -> str:
+        """When the entry under ``cache_key`` was fetched from BMKG."""
+        return await cache.get(f"{cache_key}:fetched_at") or utc_stamp()
+    
+    async def rss_fetched_at(self, language: str = "id") -> str:
+        """When the RSS feed for ``language`` was last fetched."""
+        return await self._fetched_at(self._make_cache_key("rss", {"lang": language}))
+    
+    async def cap_fetched_at(self, alert_code: str, language: str = "id") -> str:
+        """When the CAP document for ``alert_code`` was last fetched."""
+        return await self._fetched_at(
+            self._make_cache_key("cap", {"code": alert_code, "lang": language})
+        )
+    
     async def get_active_provinces(
         self,
         language: str = "id",
@@ -322,6 +403,7 @@ class NowcastService:
         current.append(warning.model_dump(mode='json'))
         # Set 5 minute TTL for simulations
         await cache.set(key, current, ttl=300) 
+        self._rendered.clear()
         
         # Dispatch notification
         await notification_service.dispatch(warning) 
@@ -329,6 +411,7 @@ class NowcastService:
     async def clear_simulations(self):
         """Clear all active simulations."""
         await cache.delete("simulation:warnings")
+        self._rendered.clear()
 
 # Global service instance
 nowcast_service = NowcastService()
@@ -9,12 +9,22 @@ from app.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Poll cadence while BMKG is healthy; failures double the wait up to the cap
+# and each success brings it back down by a step
+POLL_INTERVAL = 60.0
+MAX_POLL_INTERVAL = 600.0
+POLL_INTERVAL_STEP = 5.0
+
 class SchedulerService:
     """Background scheduler for periodic tasks."""
     
     def __init__(self):
-        self._tasks = []
+        self._tg: asyncio.TaskGroup | None = None
+        self._poll_task: asyncio.Task | None = None
         self._running = False
+        self._interval = POLL_INTERVAL
+        # Latest earthquake this worker has seen, checked before the shared cache
+        self._last_id: str | None = None
         
     @property
     def running(self):
@@ -24,58 +34,69 @@ class SchedulerService:
     @property
     def jobs(self):
         """Get active tasks."""
-        return self._tasks
+        return [self._poll_task] if self._poll_task is not None else []
         
     async def start(self):
         """Start scheduler."""
         self._running = True
-        self._tasks.append(asyncio.create_task(self._poll_latest_earthquake()))
+        # Entered here and exited in stop(), so the poller's lifetime is
+        # bounded by the app lifespan that calls both
+        self._tg = asyncio.TaskGroup()
+        await self._tg.__aenter__()
+        self._poll_task = self._tg.create_task(self._poll_latest_earthquake())
         logger.info("Scheduler started")
         
     async def stop(self):
         """Stop scheduler."""
         self._running = False
-        for task in self._tasks:
-            task.cancel()
-        await asyncio.gather(*self._tasks, return_exceptions=True)
-        self._tasks = []
+        if self._tg is not None:
+            # The poller may be asleep for minutes; wake it to exit now
+            self._poll_task.cancel()
+            await self._tg.__aexit__(None, None, None)
+            self._tg = None
+            self._poll_task = None
         logger.info("Scheduler stopped")
         
+    def _record_poll(self, ok: bool) -> None:
+        """Adjust the poll interval: additive recovery, multiplicative backoff."""
+        if ok:
+            self._interval = max(POLL_INTERVAL, self._interval - POLL_INTERVAL_STEP)
+        else:
+            self._interval = min(MAX_POLL_INTERVAL, self._interval * 2)
+
     async def _poll_latest_earthquake(self):
-        """Poll for latest earthquake every 60 seconds."""
+        """Poll for latest earthquake, every 60 seconds while BMKG is healthy."""
         logger.info("Starting earthquake poller...")
         while self._running:
             try:
-                # 1. Fetch latest earthquake
-                # We use internal method or just modify get_latest to not use cache validation logic here
-                # But get_latest uses cache. We need to force fetch or check if changed.
-                
-                # Simple strategy:
-                # Get latest from BMKG (this updates cache if TTL expired)
-                # Compare with last processed ID
-                
-                eq, _, _ = await earthquake_service.get_latest()
-                
-                # Check if we already processed this earthquake
-                last_processed_id = await cache.get("scheduler:last_processed_eq")
-                
-                # Identify earthquake by datetime string (as it is unique per event)
-                current_id = eq.occurred_at.isoformat()
-                
-                if last_processed_id != current_id:
-                    logger.info(f"New earthquake detected: {eq.region} {eq.magnitude}")
-                    
-                    # Store as processed
-                    await cache.set("scheduler:last_processed_eq", current_id, ttl=86400) # 24h
-                    
-                    # Dispatch notification
-                    await notification_service.dispatch(eq)
-                
+                await self._check_latest_earthquake()
+                self._record_poll(True)
             except Exception as e:
-                logger.error(f"Error in earthquake poller: {e}")
+                self._record_poll(False)
+                logger.error(f"Error in earthquake poller: {e} (next poll in {self._interval:.0f}s)")
+            
+            await asyncio.sleep(self._interval)
+
+    async def _check_latest_earthquake(self):
+        """Dispatch the latest earthquake if no replica has claimed it yet."""
+        # Get latest from BMKG (this updates cache if TTL expired)
+        eq, _, _ = await earthquake_service.get_latest()
+        
+        # Identify earthquake by datetime string (as it is unique per event)
+        current_id = eq.occurred_at.isoformat()
+        
+        # Unchanged since this worker's last poll: the common case, decided
+        # without a cache round-trip
+        if current_id == self._last_id:
+            return
+        
+        # Claim the earthquake atomically, so only one replica dispatches it
+        if await cache.set_nx(f"scheduler:seen:{current_id}", True, ttl=86400): # 24h
+            logger.info(f"New earthquake detected: {eq.region} {eq.magnitude}")
             
-            # Wait 60 seconds
-            await asyncio.sleep(60)
+            # Dispatch notification
+            await notification_service.dispatch(eq)
+        self._last_id = current_id
 
 # Global scheduler
 scheduler = SchedulerService()
@@ -0,0 +1,265 @@
+"""Tests for the alert-system routes rendered with ORJSONResponse."""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.database import DatabaseManager
+from app.routes import activity, alerts, channels, config, engine, health, locations
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"), readers=1)
+    await db.connect()
+    await db.init_schema()
+    app = FastAPI()
+    app.state.db = db
+    for module in (alerts, locations, activity, engine, channels, config, health):
+        app.include_router(module.router)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c, db, app
+    await db.close()
+
+
+class TestAlertRoutes:
+    """List and detail endpoints serialise rows with orjson."""
+
+    @pytest.mark.asyncio
+    async def test_alert_list_and_detail(self, client):
+        c, db, _ = client
+        await db.execute(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', 'Alian')"
+        )
+        polygon = [{"name": "Kec. Alian", "polygon": [[-7.6, 109.6]]}]
+        await db.execute(
+            "INSERT INTO alerts (bmkg_alert_code, matched_location_id, polygon_data)"
+            " VALUES ('CODE', 1, ?)",
+            (orjson.dumps(polygon).decode(),),
+        )
+
+        response = await c.get("/alerts")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["total"] == 1
+        assert body["data"][0]["polygon_data"] == polygon
+
+        active = (await c.get("/alerts/active")).json()
+        assert active["count"] == 1
+
+        detail = (await c.get("/alerts/1")).json()
+        assert detail["data"]["bmkg_alert_code"] == "CODE"
+        assert detail["deliveries"] == []
+
+        assert (await c.get("/alerts/99")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_pagination_total_and_stats(self, client):
+        c, db, _ = client
+        for code in ("A", "B", "C"):
+            await db.execute(
+                "INSERT INTO alerts (bmkg_alert_code) VALUES (?)", (code,)
+            )
+
+        page = (await c.get("/alerts", params={"page_size": 2})).json()
+        assert page["total"] == 3
+        assert len(page["data"]) == 2
+        assert "total_count" not in page["data"][0]
+        past_end = (await c.get("/alerts", params={"page": 5})).json()
+        assert (past_end["total"], past_end["data"]) == (3, [])
+        filtered = (await c.get("/alerts", params={"status": "resolved"})).json()
+        assert filtered["total"] == 0
+
+        assert (await c.get("/alerts/stats")).json() == {
+            "total_alerts": 3,
+            "alerts_this_month": 3,
+            "monitored_locations": 0,
+            "active_channels": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_ndjson_streams_one_alert_per_line(self, client):
+        c, db, _ = client
+        polygon = [{"name": "Kec. Alian", "polygon": [[-7.6, 109.6]]}]
+        for code in ("A", "B", "C"):
+            await db.execute(
+                "INSERT INTO alerts (bmkg_alert_code, polygon_data) VALUES (?, ?)",
+                (code, orjson.dumps(polygon).decode()),
+            )
+
+        response = await c.get("/alerts", params={"format": "ndjson", "page_size": 2})
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [orjson.loads(line) for line in response.content.splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["polygon_data"] == polygon
+
+        active = await c.get("/alerts/active", params={"format": "ndjson"})
+        assert len(active.content.splitlines()) == 3
+        assert (await c.get("/alerts", params={"format": "xml"})).status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_location_and_activity_lists(self, client):
+        c, db, _ = client
+        await db.execute(
+            "INSERT INTO activity_log (event_type, message) VALUES ('poll', 'ok')"
+        )
+
+        assert (await c.get("/locations")).json() == {"data": []}
+        [entry] = (await c.get("/activity")).json()["data"]
+        assert entry["message"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_engine_status(self, client):
+        c, _, app = client
+        assert (await c.get("/engine/status")).json()["running"] is False
+
+        class FakeEngine:
+            def get_status(self):
+                return {"running": True, "last_poll": None, "last_poll_result": "ok"}
+
+        app.state.engine = FakeEngine()
+        first = await c.get("/engine/status")
+        body = first.json()
+        assert first.headers["content-type"] == "application/json"
+        assert body["running"] is True
+        assert body["last_poll_result"] == "ok"
+        assert "demo_mode" in body
+        rendered = engine._rendered_status[1]
+        assert rendered == first.content
+        await c.get("/engine/status")
+        assert engine._rendered_status[1] is rendered
+
+        del app.state.engine
+        assert (await c.get("/engine/status")).json()["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_channel_config_round_trip(self, client):
+        c, db, _ = client
+        config = {"webhook_url": "https://hooks.test/x", "headers": {"X-Nama": "Hujan ☔"}}
+
+        created = await c.post(
+            "/channels", json={"channel_type": "webhook", "enabled": True, "config": config}
+        )
+        assert created.status_code == 201
+        channel_id = created.json()["data"]["id"]
+        assert created.json()["data"]["config"] == config
+
+        assert (await c.get(f"/channels/{channel_id}")).json()["data"]["config"] == config
+        [listed] = (await c.get("/channels")).json()["data"]
+        assert listed["config"] == config
+
+        patched = await c.patch(f"/channels/{channel_id}", json={"config": {"webhook_url": "u"}})
+        assert patched.json()["data"]["config"] == {"webhook_url": "u"}
+
+        exported = (await c.post("/config/export")).json()
+        assert exported["channels"][0]["config"] == {"webhook_url": "u"}
+        assert (await c.patch("/channels/999", json={"enabled": False})).status_code == 404
+        assert (await c.patch("/channels/999", json={"config": {}})).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_channel_config_validated_on_ingress(self, client):
+        c, _, _ = client
+        created = await c.post(
+            "/channels",
+            json={"channel_type": "telegram", "config": {"bot_token": "t", "chat_id": -100}},
+        )
+        assert created.status_code == 201
+        assert created.json()["data"]["config"] == {"bot_token": "t", "chat_id": "-100"}
+
+        missing = await c.post("/channels", json={"channel_type": "slack", "config": {}})
+        assert missing.status_code == 422
+        unknown = await c.post("/channels", json={"channel_type": "sms", "config": {}})
+        assert unknown.status_code == 422
+
+        channel_id = created.json()["data"]["id"]
+        bad = await c.patch(f"/channels/{channel_id}", json={"config": {"bot_token": "t"}})
+        assert bad.status_code == 422
+        assert bad.json()["detail"][0]["loc"] == ["chat_id"]
+        assert (await c.patch("/channels/999", json={})).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_channel_test_send(self, client, monkeypatch):
+        from app.notifications import client as notification_client
+
+        c, _, _ = client
+        posted = []
+
+        def handler(request):
+            posted.append(orjson.loads(request.content))
+            return httpx.Response(200, text="ok")
+
+        mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(notification_client, "_client", mock)
+        monkeypatch.setattr(notification_client, "_breakers", {})
+
+        slack = await c.post(
+            "/channels",
+            json={"channel_type": "slack", "config": {"webhook_url": "https://hooks.test/s"}},
+        )
+        sent = await c.post(f"/channels/{slack.json()['data']['id']}/test")
+        assert sent.json() == {"status": "sent", "channel_type": "slack"}
+        assert posted[0]["text"].startswith("\U0001f9ea Test Notifikasi")
+        assert (await c.get(f"/channels/{slack.json()['data']['id']}")).json()["data"][
+            "last_success_at"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_location_writes_return_row(self, client):
+        c, _, _ = client
+        created = await c.post("/locations", json={
+            "label": "Rumah",
+            "province_code": "31", "province_name": "DKI Jakarta",
+            "district_code": "31.71", "district_name": "Jakarta Pusat",
+            "subdistrict_code": "31.71.01", "subdistrict_name": "Gambir",
+        })
+        assert created.status_code == 201
+        location = created.json()["data"]
+        assert location["label"] == "Rumah" and location["enabled"] == 1
+
+        patched = await c.patch(f"/locations/{location['id']}", json={"enabled": False})
+        assert patched.json()["data"]["enabled"] == 0
+        assert patched.json()["data"]["label"] == "Rumah"
+        assert (await c.patch("/locations/999", json={"label": "x"})).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_config_bulk_writes(self, client):
+        c, _, _ = client
+
+        updated = await c.put("/config", json={"settings": {"poll_interval": "60", "x": "1"}})
+        assert updated.json()["data"]["poll_interval"] == "60"
+        assert updated.json()["data"]["x"] == "1"
+        assert list(updated.json()["data"]) == sorted(updated.json()["data"])
+        unchanged = await c.put("/config", json={"settings": {}})
+        assert unchanged.json() == updated.json()
+
+        await c.post("/config/import", json={"config": {"x": "2", "y": "3"}})
+        data = (await c.get("/config")).json()["data"]
+        assert (data["x"], data["y"]) == ("2", "3")
+
+        await c.post("/config/reset")
+        assert (await c.get("/config")).json()["data"]["poll_interval"] == "300"
+
+    @pytest.mark.asyncio
+    async def test_health_does_not_wait_on_slow_bmkg(self, client, monkeypatch):
+        c, db, app = client
+        await db.execute("INSERT INTO notification_channels (channel_type, enabled, config) VALUES ('slack', 1, '{}')")
+
+        class SlowBMKG:
+            async def check_health(self):
+                await asyncio.sleep(60)
+                return True
+
+        monkeypatch.setattr(health, "_BMKG_PROBE_TIMEOUT", 0.01)
+        app.state.bmkg_client = SlowBMKG()
+        body = (await c.get("/health")).json()
+        assert body["bmkg_api_status"] == "unreachable"
+        assert body["active_channels"] == ["slack"]
+        assert body["monitored_locations"] == 0
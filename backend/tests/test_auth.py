@@ -0,0 +1,41 @@
+"""Tests for admin password checks."""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.config import settings
+from app.dependencies import _is_admin
+from app.routes import auth
+
+
+def _request(*headers: tuple[bytes, bytes]) -> Request:
+    return Request({"type": "http", "headers": list(headers)})
+
+
+class TestAdminChecks:
+    """Passwords are compared as fixed-size digests."""
+
+    def test_header_schemes(self):
+        password = settings.admin_password.encode()
+        assert _is_admin(_request((b"x-admin-token", password)))
+        assert _is_admin(_request((b"authorization", b"Bearer " + password)))
+        assert not _is_admin(_request((b"authorization", password)))
+        assert not _is_admin(_request((b"x-admin-token", password + b"x")))
+        assert not _is_admin(_request((b"x-admin-token", b"")))
+        assert not _is_admin(_request())
+
+    @pytest.mark.asyncio
+    async def test_login(self):
+        app = FastAPI()
+        app.include_router(auth.router)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            ok = await c.post("/auth/login", json={"password": settings.admin_password})
+            wrong = await c.post("/auth/login", json={"password": "wrong"})
+            non_ascii = await c.post("/auth/login", json={"password": "kata sandi ☔"})
+
+        assert ok.json()["authenticated"] is True
+        assert wrong.status_code == 401
+        assert non_ascii.status_code == 401
@@ -0,0 +1,69 @@
+"""Tests for the in-process TTL memo."""
+
+import asyncio
+
+import pytest
+
+from app.cache import TTLMemo
+
+
+class TestTTLMemo:
+    """Results are shared per key and bounded in number."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fill(self):
+        memo = TTLMemo(ttl=60)
+        calls = []
+
+        async def fill():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(memo.get_or_fill("k", fill) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_other_keys_not_blocked(self):
+        memo = TTLMemo(ttl=60)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        pending = asyncio.ensure_future(memo.get_or_fill("a", slow))
+        assert await asyncio.wait_for(memo.get_or_fill("b", fast), 1) == "fast"
+        release.set()
+        assert await pending == "slow"
+
+    @pytest.mark.asyncio
+    async def test_maxsize_drops_oldest(self):
+        memo = TTLMemo(ttl=60, maxsize=2)
+        for key in "abc":
+            await memo.get_or_fill(key, lambda key=key: asyncio.sleep(0, key))
+
+        calls = []
+
+        async def refill():
+            calls.append(1)
+            return "again"
+
+        assert await memo.get_or_fill("c", refill) == "c"
+        assert await memo.get_or_fill("a", refill) == "again"
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_are_not_kept(self):
+        memo = TTLMemo(ttl=60)
+
+        async def broken():
+            raise RuntimeError("upstream")
+
+        with pytest.raises(RuntimeError):
+            await memo.get_or_fill("k", broken)
+        assert await memo.get_or_fill("k", lambda: asyncio.sleep(0, "ok")) == "ok"
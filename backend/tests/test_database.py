@@ -0,0 +1,325 @@
+"""Tests for the SQLite layer — database manager, transactions and state row mapping."""
+
+from datetime import datetime, timezone
+
+import orjson
+
+import pytest
+import pytest_asyncio
+
+from app.database import DatabaseManager
+from app.engine.state import StateManager
+from app.models import Area, Location, MatchResult, WarningInfo
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "test.db"), readers=2)
+    await manager.connect()
+    await manager.init_schema()
+    yield manager
+    await manager.close()
+
+
+class TestDatabaseManager:
+    """Test the writer/reader split."""
+
+    @pytest.mark.asyncio
+    async def test_pragmas_applied(self, db):
+        """WAL and server-tuned PRAGMAs are active on the writer."""
+        conn = await db.get_connection()
+        cursor = await conn.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await conn.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+    @pytest.mark.asyncio
+    async def test_reads_see_committed_writes(self, db):
+        """Rows written through the writer are visible to readers."""
+        await db.execute(
+            "INSERT INTO config (key, value) VALUES (?, ?)", ("test_key", "v1")
+        )
+        row = await db.fetch_one("SELECT value FROM config WHERE key = ?", ("test_key",))
+        assert row["value"] == "v1"
+
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, db):
+        """Reader connections reject writes."""
+        async with db.acquire_reader() as reader:
+            with pytest.raises(Exception):
+                await reader.execute(
+                    "INSERT INTO config (key, value) VALUES ('x', 'y')"
+                )
+
+    @pytest.mark.asyncio
+    async def test_idle_reads_reuse_last_reader(self, db):
+        """The most recently returned reader is handed out next."""
+        async with db.acquire_reader() as first:
+            pass
+        async with db.acquire_reader() as second:
+            assert second is first
+            async with db.acquire_reader() as other:
+                assert other is not first
+
+    @pytest.mark.asyncio
+    async def test_transaction_commits_once(self, db):
+        """Writes inside a transaction are visible inside it and committed together."""
+        async with db.transaction():
+            await db.execute("INSERT INTO config (key, value) VALUES ('a', '1')")
+            await db.execute("INSERT INTO config (key, value) VALUES ('b', '2')")
+            row = await db.fetch_one("SELECT value FROM config WHERE key = 'b'")
+            assert row["value"] == "2"
+        rows = await db.fetch_all(
+            "SELECT key FROM config WHERE key IN ('a', 'b') ORDER BY key"
+        )
+        assert [r["key"] for r in rows] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_on_error(self, db):
+        """An exception inside the block discards every write in it."""
+        with pytest.raises(RuntimeError):
+            async with db.transaction():
+                await db.execute("INSERT INTO config (key, value) VALUES ('c', '3')")
+                raise RuntimeError("boom")
+        assert await db.fetch_one("SELECT 1 FROM config WHERE key = 'c'") is None
+
+    @pytest.mark.asyncio
+    async def test_alert_hot_queries_use_indexes(self, db):
+        """Dedup and expiry lookups are index probes, not table scans."""
+        conn = await db.get_connection()
+        cursor = await conn.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM alerts "
+            "WHERE bmkg_alert_code = ? AND matched_location_id = ? LIMIT 1",
+            ("code", 1),
+        )
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert "COVERING INDEX sqlite_autoindex_alerts" in plan
+
+        cursor = await conn.execute(
+            "EXPLAIN QUERY PLAN UPDATE alerts INDEXED BY idx_alerts_active_expiry "
+            "SET status = 'expired' "
+            "WHERE status = 'active' AND expires != '' AND expires < ?",
+            ("2026-01-01",),
+        )
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert "idx_alerts_active_expiry" in plan
+
+    @pytest.mark.asyncio
+    async def test_status_listing_walks_index(self, db):
+        """Status-filtered newest-first listings need no sort pass."""
+        conn = await db.get_connection()
+        cursor = await conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id, (SELECT COUNT(*) FROM alerts WHERE status = ?) "
+            "FROM alerts WHERE status = ? ORDER BY created_at DESC LIMIT 20",
+            ("active", "active"),
+        )
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        assert "idx_alerts_status_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_truncates_wal(self, db, tmp_path):
+        """checkpoint() folds the WAL back and leaves an empty -wal file."""
+        await db.execute("INSERT INTO config (key, value) VALUES ('w', '1')")
+        wal = tmp_path / "test.db-wal"
+        assert wal.stat().st_size > 0
+        await db.checkpoint()
+        assert wal.stat().st_size == 0
+
+
+def _bulk_warning() -> WarningInfo:
+    now = datetime.now(timezone.utc)
+    return WarningInfo(
+        identifier="w", event="Hujan", severity="Moderate", urgency="Immediate",
+        certainty="Observed", effective=now, expires=now, headline="",
+        description="", sender="BMKG", is_expired=False, areas=[],
+    )
+
+
+def _bulk_pending(warning: WarningInfo, keys: list[tuple[str, int]]) -> list:
+    return [
+        (warning, MatchResult(location=Location(id=loc), match_type="kecamatan", matched_text=""), code)
+        for code, loc in keys
+    ]
+
+
+class TestStateRowMapping:
+    """StateManager builds models from rows without validation."""
+
+    @pytest.mark.asyncio
+    async def test_locations_and_alerts_from_rows(self, db):
+        state = StateManager(db)
+        await db.execute(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', 'Alian')"
+        )
+        await db.execute(
+            "INSERT INTO alerts (bmkg_alert_code, matched_location_id, expires)"
+            " VALUES ('CODE', 1, '2000-01-01T00:00:00+00:00')"
+        )
+
+        [location] = await state.get_enabled_locations()
+        assert location.enabled is True
+        assert location.subdistrict_name_lower == "alian"
+
+        [alert] = await state.get_active_alerts()
+        assert alert.expired_notified is False
+        assert alert.bmkg_alert_code == "CODE"
+
+        [expired] = await state.mark_expired_alerts()
+        assert expired.status == "expired"
+        assert await state.get_active_alerts() == []
+
+    @pytest.mark.asyncio
+    async def test_dedup_keys_include_expired(self, db):
+        state = StateManager(db)
+        await db.execute(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', 'Alian')"
+        )
+        await db.execute_many(
+            "INSERT INTO alerts (bmkg_alert_code, matched_location_id, status)"
+            " VALUES (?, 1, ?)",
+            [("A", "active"), ("B", "expired"), ("C", "active")],
+        )
+
+        assert await state.get_dedup_keys(["A", "B", "X"]) == {("A", 1), ("B", 1)}
+        assert await state.get_dedup_keys([]) == set()
+
+    @pytest.mark.asyncio
+    async def test_expire_trials_marks_notified(self, db):
+        state = StateManager(db)
+        await db.execute_many(
+            "INSERT INTO trial_subscriptions (telegram_chat_id, subdistrict_code,"
+            " subdistrict_name, district_name, province_name, expires_at)"
+            " VALUES (?, 'c', 's', 'd', 'p', ?)",
+            [("1", "2000-01-01 00:00:00"), ("2", "2000-01-01 00:00:00"), ("3", "2999-01-01 00:00:00")],
+        )
+
+        expired = await state.expire_trials()
+        assert sorted(t["telegram_chat_id"] for t in expired) == ["1", "2"]
+        assert await state.expire_trials() == []
+
+    @pytest.mark.asyncio
+    async def test_polygon_data_round_trip(self, db):
+        """Polygons read back as JSON text whether or not JSONB is used."""
+        state = StateManager(db)
+        await db.execute(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', 'Alian')"
+        )
+        now = datetime.now(timezone.utc)
+        warning = WarningInfo(
+            identifier="w", event="Hujan", severity="Moderate", urgency="Immediate",
+            certainty="Observed", effective=now, expires=now, headline="",
+            description="", sender="BMKG", is_expired=False,
+            areas=[Area(name="Kec. Alian", polygon=[[-7.6, 109.6], [-7.7, 109.7]])],
+        )
+        match = MatchResult(
+            location=Location(id=1), match_type="kecamatan", matched_text="Alian"
+        )
+        await state.store_alert(warning, match, "CODE")
+
+        [alert] = await state.get_active_alerts()
+        assert orjson.loads(alert.polygon_data) == [
+            {"name": "Kec. Alian", "polygon": [[-7.6, 109.6], [-7.7, 109.7]]}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_store_alerts_bulk_returns_ids_in_order(self, db):
+        state = StateManager(db)
+        await db.execute_many(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', ?)",
+            [("Alian",), ("Gombong",)],
+        )
+        await db.execute(
+            "INSERT INTO alerts (bmkg_alert_code, matched_location_id) VALUES ('A', 1)"
+        )
+        warning = _bulk_warning()
+        pending = _bulk_pending(warning, [("B", 2), ("A", 2), ("B", 1)])
+
+        ids = [alert_id for alert_id, _, _ in await state.store_alerts_bulk(pending)]
+
+        rows = await db.fetch_all(
+            "SELECT id, bmkg_alert_code, matched_location_id FROM alerts WHERE id IN (?, ?, ?)",
+            tuple(ids),
+        )
+        by_id = {row[0]: (row[1], row[2]) for row in rows}
+        assert [by_id[i] for i in ids] == [("B", 2), ("A", 2), ("B", 1)]
+        assert await state.store_alerts_bulk([]) == []
+
+    @pytest.mark.asyncio
+    async def test_store_alerts_bulk_skips_stored_duplicate(self, db):
+        state = StateManager(db)
+        await db.execute_many(
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', '330501', ?)",
+            [("Alian",), ("Gombong",)],
+        )
+        # Stored by a concurrent cycle after this one read its dedup keys
+        await db.execute(
+            "INSERT INTO alerts (bmkg_alert_code, matched_location_id) VALUES ('A', 1)"
+        )
+        pending = _bulk_pending(_bulk_warning(), [("A", 1), ("A", 2), ("B", 1)])
+
+        stored = await state.store_alerts_bulk(pending)
+
+        assert [m.location.id for _, _, m in stored] == [2, 1]
+        rows = await db.fetch_all(
+            "SELECT bmkg_alert_code, matched_location_id FROM alerts ORDER BY id"
+        )
+        assert [tuple(row) for row in rows] == [("A", 1), ("A", 2), ("B", 1)]
+
+    @pytest.mark.asyncio
+    async def test_enabled_channels_parse_config(self, db):
+        state = StateManager(db)
+        await db.execute_many(
+            "INSERT INTO notification_channels (channel_type, enabled, config) VALUES (?, ?, ?)",
+            [
+                ("webhook", 1, '{"webhook_url": "https://x.test", "headers": {"A": "1"}}'),
+                ("slack", 0, '{"webhook_url": "https://y.test"}'),
+            ],
+        )
+        assert await state.get_enabled_channels() == [
+            {
+                "id": 1,
+                "channel_type": "webhook",
+                "config": {"webhook_url": "https://x.test", "headers": {"A": "1"}},
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enabled_locations_cached_until_invalidated(self, db):
+        state = StateManager(db)
+        insert = (
+            "INSERT INTO locations (province_code, province_name, district_code,"
+            " district_name, subdistrict_code, subdistrict_name)"
+            " VALUES ('33', 'Jawa Tengah', '3305', 'Kebumen', ?, ?)"
+        )
+        await db.execute(insert, ("330501", "Alian"))
+        assert len(await state.get_enabled_locations()) == 1
+
+        await db.execute(insert, ("330502", "Sempor"))
+        assert len(await state.get_enabled_locations()) == 1
+
+        state.invalidate_locations()
+        assert len(await state.get_enabled_locations()) == 2
+
+    @pytest.mark.asyncio
+    async def test_enabled_channels_cached_until_invalidated(self, db):
+        state = StateManager(db)
+        insert = "INSERT INTO notification_channels (channel_type, enabled, config) VALUES ('slack', 1, '{}')"
+        await db.execute(insert)
+        assert len(await state.get_enabled_channels()) == 1
+
+        await db.execute(insert)
+        assert len(await state.get_enabled_channels()) == 1
+
+        state.invalidate_channels()
+        assert len(await state.get_enabled_channels()) == 2
@@ -0,0 +1,235 @@
+"""Tests for the notification dispatcher fan-out."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models import Location, MatchResult, WarningInfo
+from app.notifications import dispatcher as dispatcher_module
+from app.notifications.dispatcher import NotificationDispatcher
+from app.notifications.telegram import pack_messages
+
+
+def _warning(severity: str = "Moderate") -> WarningInfo:
+    return WarningInfo(
+        identifier="w", event="Hujan Lebat", severity=severity,
+        urgency="Immediate", certainty="Observed",
+        effective="2026-02-17T19:55:00+07:00", expires="2026-02-17T23:00:00+07:00",
+        headline="", description="", sender="BMKG", areas=[], is_expired=False,
+    )
+
+
+_MATCH = MatchResult(location=Location(id=1), match_type="kecamatan", matched_text="")
+_CHANNELS = [
+    {"id": 1, "channel_type": "slack", "config": {}},
+    {"id": 2, "channel_type": "discord", "config": {}},
+    {"id": 3, "channel_type": "pager", "config": {}},
+]
+
+
+def _state(quiet: bool = False) -> AsyncMock:
+    state = AsyncMock()
+    values = {
+        "quiet_hours_enabled": "true" if quiet else "false",
+        "quiet_hours_override_severe": "false",
+        "quiet_hours_start": "22:00",
+        "quiet_hours_end": "06:00",
+    }
+    state.get_config_value.side_effect = lambda key, default="": values.get(key, default)
+    return state
+
+
+class TestSendMany:
+    """One alert fans out to every channel concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_channels_sent_concurrently_in_order(self):
+        state = _state()
+        dispatcher = NotificationDispatcher(state)
+        in_flight = 0
+        peak = 0
+
+        async def fake_send(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        dispatcher._slack.send = fake_send
+        dispatcher._discord.send = fake_send
+
+        results = await dispatcher.send_many(1, _warning(), _MATCH, _CHANNELS)
+
+        assert results == [True, True, False]
+        assert peak == 2
+        statuses = [call.args[2] for call in state.log_delivery.await_args_list]
+        assert sorted(statuses) == ["failed", "sent", "sent"]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_sends_bounded(self, monkeypatch):
+        monkeypatch.setattr(dispatcher_module, "_MAX_IN_FLIGHT", 3)
+        dispatcher = NotificationDispatcher(_state())
+        in_flight = 0
+        peak = 0
+
+        async def fake_send(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        dispatcher._slack.send = fake_send
+        channels = [{"id": i, "channel_type": "slack", "config": {}} for i in range(10)]
+
+        results = await dispatcher.send_many(1, _warning(), _MATCH, channels)
+
+        assert results == [True] * 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_quiet_hours_checked_once(self, monkeypatch):
+        class _Night(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                # 23:00 in Jakarta (UTC+7)
+                return datetime(2026, 2, 17, 16, 0, tzinfo=timezone.utc)
+
+        monkeypatch.setattr(dispatcher_module, "datetime", _Night)
+        state = _state(quiet=True)
+        dispatcher = NotificationDispatcher(state)
+        dispatcher._slack.send = AsyncMock(return_value=True)
+
+        results = await dispatcher.send_many(1, _warning(), _MATCH, _CHANNELS)
+
+        assert results == [False, False, False]
+        dispatcher._slack.send.assert_not_awaited()
+        keys = [call.args[0] for call in state.get_config_value.await_args_list]
+        assert keys.count("quiet_hours_enabled") == 1
+        assert [call.args[2] for call in state.log_delivery.await_args_list] == [
+            "skipped_quiet_hours"
+        ] * 3
+
+
+class TestSendBatch:
+    """Several alerts go out per channel, coalesced where supported."""
+
+    @pytest.mark.asyncio
+    async def test_telegram_coalesced_others_per_alert(self):
+        state = _state()
+        dispatcher = NotificationDispatcher(state)
+        telegram_texts: list[str] = []
+
+        async def fake_send_message(bot_token, chat_id, text):
+            telegram_texts.append(text)
+            return True
+
+        dispatcher._telegram._send_message = fake_send_message
+        dispatcher._slack.send = AsyncMock(return_value=True)
+        channels = [
+            {"id": 1, "channel_type": "telegram", "config": {"bot_token": "t", "chat_id": "c"}},
+            {"id": 2, "channel_type": "slack", "config": {}},
+        ]
+        alerts = [(10, _warning(), _MATCH), (11, _warning(), _MATCH)]
+
+        results = await dispatcher.send_batch(alerts, channels)
+
+        assert results == [[True, True], [True, True]]
+        assert len(telegram_texts) == 1
+        assert telegram_texts[0].count("Peringatan Cuaca") == 2
+        assert dispatcher._slack.send.await_count == 2
+        logged = sorted(call.args[:3] for call in state.log_delivery.await_args_list)
+        assert logged == [(10, 1, "sent"), (10, 2, "sent"), (11, 1, "sent"), (11, 2, "sent")]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_recorded_per_alert(self):
+        state = _state()
+        dispatcher = NotificationDispatcher(state)
+        dispatcher._telegram.send_batch = AsyncMock(side_effect=RuntimeError("boom"))
+        channels = [{"id": 1, "channel_type": "telegram", "config": {}}]
+        alerts = [(10, _warning(), _MATCH), (11, _warning(), _MATCH)]
+
+        results = await dispatcher.send_batch(alerts, channels)
+
+        assert results == [[False], [False]]
+        assert [call.args[2:] for call in state.log_delivery.await_args_list] == [
+            ("failed", "boom"), ("failed", "boom")
+        ]
+
+
+    @pytest.mark.asyncio
+    async def test_quiet_hours_skip_every_channel(self, monkeypatch):
+        class _Night(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 2, 17, 16, 0, tzinfo=timezone.utc)
+
+        monkeypatch.setattr(dispatcher_module, "datetime", _Night)
+        state = _state(quiet=True)
+        dispatcher = NotificationDispatcher(state)
+        dispatcher._telegram.send_batch = AsyncMock(return_value=[True])
+        dispatcher._slack.send = AsyncMock(return_value=True)
+        channels = [
+            {"id": 1, "channel_type": "telegram", "config": {}},
+            {"id": 2, "channel_type": "slack", "config": {}},
+        ]
+        alerts = [(10, _warning(), _MATCH), (11, _warning(), _MATCH)]
+
+        results = await dispatcher.send_batch(alerts, channels)
+
+        assert results == [[False, False], [False, False]]
+        dispatcher._telegram.send_batch.assert_not_awaited()
+        dispatcher._slack.send.assert_not_awaited()
+        logged = sorted(call.args[:3] for call in state.log_delivery.await_args_list)
+        assert logged == [
+            (10, 1, "skipped_quiet_hours"), (10, 2, "skipped_quiet_hours"),
+            (11, 1, "skipped_quiet_hours"), (11, 2, "skipped_quiet_hours"),
+        ]
+
+
+class TestPackMessages:
+    """Telegram messages are joined whole up to the length limit."""
+
+    def test_greedy_in_order(self):
+        assert pack_messages(["a" * 4, "b" * 4, "c" * 4], limit=10) == [
+            ["a" * 4, "b" * 4], ["c" * 4]
+        ]
+
+    def test_oversized_message_alone(self):
+        assert pack_messages(["a" * 20, "b"], limit=10) == [["a" * 20], ["b"]]
+
+    def test_counts_utf16_units(self):
+        # Each emoji is two UTF-16 code units
+        assert pack_messages(["🔴🔴", "🔴🔴"], limit=9) == [["🔴🔴"], ["🔴🔴"]]
+        assert pack_messages(["🔴🔴", "🔴🔴"], limit=10) == [["🔴🔴", "🔴🔴"]]
+
+
+class TestQuietHoursCache:
+    """Quiet-hours config is read once per TTL window."""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self):
+        state = _state()
+        dispatcher = NotificationDispatcher(state)
+
+        assert await dispatcher._is_quiet_hours("Moderate") is False
+        assert await dispatcher._is_quiet_hours("Moderate") is False
+        assert state.get_config_value.await_count == 4
+
+        dispatcher.invalidate_quiet_hours()
+        await dispatcher._is_quiet_hours("Moderate")
+        assert state.get_config_value.await_count == 8
+
+    @pytest.mark.asyncio
+    async def test_unparseable_hours_never_quiet(self):
+        state = AsyncMock()
+        values = {"quiet_hours_enabled": "true", "quiet_hours_start": "late"}
+        state.get_config_value.side_effect = lambda key, default="": values.get(key, default)
+        dispatcher = NotificationDispatcher(state)
+
+        assert await dispatcher._is_quiet_hours("Moderate") is False
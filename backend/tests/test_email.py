@@ -0,0 +1,122 @@
+"""Tests for EmailSender message building and pooled SMTP sessions."""
+
+import email
+import email.policy
+
+import aiosmtplib
+import pytest
+import pytest_asyncio
+
+from app.notifications import email as email_module
+from app.notifications.email import EmailSender
+
+_CONFIG = {"smtp_host": "smtp.test", "smtp_port": 587, "smtp_user": "u", "smtp_password": "p"}
+
+
+class FakeSMTP:
+    """Stands in for ``aiosmtplib.SMTP``; records every instance created."""
+
+    instances: list["FakeSMTP"] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_connected = False
+        self.sent: list[str] = []
+        self.fail_next: Exception | None = None
+        self.quit_called = False
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def sendmail(self, sender, recipients, message):
+        if self.fail_next is not None:
+            exc, self.fail_next = self.fail_next, None
+            raise exc
+        self.sent.append(email.message_from_bytes(message)["Subject"])
+
+    def close(self):
+        self.is_connected = False
+
+    async def quit(self):
+        self.quit_called = True
+        self.is_connected = False
+
+
+@pytest_asyncio.fixture
+async def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(email_module.aiosmtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_module, "_connections", {})
+    monkeypatch.setattr(email_module, "_locks", {})
+    yield FakeSMTP
+    await email_module.close_smtp_connections()
+
+
+class TestBuildMessage:
+    """Raw messages parse back to the same headers and body."""
+
+    def test_round_trip_non_ascii(self):
+        body = "<p>Hujan lebat — Kec. Alian ☔</p>" + "x" * 2000
+        raw = email_module._build_message(
+            "BMKG Alert <alert@x.test>", "a@x.test",
+            "[BMKG Alert] Severe: Hujan — Alian\nBcc: evil@x.test", body, "html",
+        )
+
+        assert raw.isascii()
+        assert all(len(line) <= 998 for line in raw.split(b"\r\n"))
+        msg = email.message_from_bytes(raw, policy=email.policy.default)
+        assert msg["From"] == "BMKG Alert <alert@x.test>"
+        assert msg["To"] == "a@x.test"
+        assert msg["Subject"] == "[BMKG Alert] Severe: Hujan — Alian Bcc: evil@x.test"
+        assert msg["Bcc"] is None
+        assert msg.get_content_type() == "text/html"
+        assert msg.get_content() == body
+
+    def test_plain_ascii(self):
+        raw = email_module._build_message("a@x.test", "b@x.test", "Test", "hello", "plain")
+        msg = email.message_from_bytes(raw, policy=email.policy.default)
+        assert msg["Subject"] == "Test"
+        assert msg.get_content_type() == "text/plain"
+        assert msg.get_content() == "hello"
+
+
+class TestSmtpPool:
+    """Sends reuse one session per server and recover from dropped ones."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_across_senders(self, fake_smtp):
+        assert await EmailSender().send_raw("a@x.test", "one", "body", _CONFIG)
+        assert await EmailSender().send_raw("b@x.test", "two", "body", _CONFIG)
+
+        [session] = fake_smtp.instances
+        assert session.sent == ["one", "two"]
+        assert session.kwargs["start_tls"] is True
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_server_disconnect(self, fake_smtp):
+        assert await EmailSender().send_raw("a@x.test", "one", "body", _CONFIG)
+        fake_smtp.instances[0].fail_next = aiosmtplib.SMTPServerDisconnected("idle")
+
+        assert await EmailSender().send_raw("a@x.test", "two", "body", _CONFIG)
+
+        first, second = fake_smtp.instances
+        assert not first.is_connected
+        assert second.sent == ["two"]
+
+    @pytest.mark.asyncio
+    async def test_other_errors_drop_session_and_report_failure(self, fake_smtp):
+        assert await EmailSender().send_raw("a@x.test", "one", "body", _CONFIG)
+        fake_smtp.instances[0].fail_next = aiosmtplib.SMTPDataError(554, "rejected")
+
+        assert not await EmailSender().send_raw("a@x.test", "two", "body", _CONFIG)
+        assert email_module._connections == {}
+
+    @pytest.mark.asyncio
+    async def test_close_quits_sessions(self, fake_smtp):
+        assert await EmailSender().send_raw("a@x.test", "one", "body", _CONFIG)
+
+        await email_module.close_smtp_connections()
+
+        assert fake_smtp.instances[0].quit_called
+        assert email_module._connections == {}
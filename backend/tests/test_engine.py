@@ -1,16 +1,24 @@
 """Tests for the alert engine — full poll cycle with mocked BMKG client."""
 
+import asyncio
 import json
+from datetime import datetime, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
+from app.config import settings
+from app.engine.bmkg_client import HttpBMKGClient
+from app.engine import matcher, worker
 from app.engine.worker import AlertEngine
 from app.models import (
+    Area,
     Location,
     NowcastDetailResponse,
     NowcastListResponse,
+    WarningInfo,
 )
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -51,9 +59,13 @@ class TestAlertEnginePollCycle:
             )
         ]
         state.get_enabled_channels.return_value = []
-        state.is_duplicate.return_value = False
-        state.store_alert.return_value = 1
+        state.get_dedup_keys.return_value = set()
+        state.store_alerts_bulk.side_effect = lambda pending: [
+            (alert_id, warning, match)
+            for alert_id, (warning, match, _) in enumerate(pending, 1)
+        ]
         state.mark_expired_alerts.return_value = []
+        state.expire_trials.return_value = []
         state.get_config_value.return_value = "300"
         state.log_activity.return_value = None
         return state
@@ -74,12 +86,14 @@ class TestAlertEnginePollCycle:
         assert result["warnings_fetched"] == 2
         assert result["matches_found"] >= 1
         assert result["new_alerts"] >= 1
-        mock_state.store_alert.assert_called()
+        mock_state.store_alerts_bulk.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_poll_cycle_dedup(self, engine, mock_state):
         """Duplicate alerts are skipped."""
-        mock_state.is_duplicate.return_value = True
+        mock_state.get_dedup_keys.side_effect = lambda codes: {
+            (code, 1) for code in codes
+        }
 
         result = await engine.check_now()
 
@@ -126,3 +140,241 @@ class TestAlertEnginePollCycle:
         assert status["running"] is True
 
         await engine.stop()
+
+
+class TestPollCycleFailures:
+    """A failed step costs only itself, and trial expiry is claimed late."""
+
+    @pytest.fixture
+    def engine(self):
+        now = datetime.now(timezone.utc)
+        warning = WarningInfo(
+            identifier="w", event="Hujan Lebat", severity="Moderate",
+            urgency="Immediate", certainty="Observed", effective=now,
+            expires=now, headline="", description="Kec. Alian", sender="BMKG",
+            areas=[Area(name="Kab. Kebumen")], is_expired=False,
+        )
+        bmkg = AsyncMock()
+        bmkg.get_nowcast_list.return_value = SimpleNamespace(data=[SimpleNamespace(code="C1")])
+        bmkg.get_nowcast_details.return_value = [SimpleNamespace(warnings=[warning])]
+        state = AsyncMock()
+        state.get_enabled_locations.return_value = [
+            Location(id=1, district_name="Kebumen", subdistrict_name="Alian")
+        ]
+        state.get_enabled_channels.return_value = []
+        state.get_dedup_keys.return_value = set()
+        state.store_alerts_bulk.side_effect = lambda pending: [
+            (alert_id, w, m) for alert_id, (w, m, _) in enumerate(pending, 1)
+        ]
+        state.mark_expired_alerts.return_value = []
+        state.expire_trials.return_value = []
+        return AlertEngine(bmkg, state, AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_failed_read_does_not_drop_cycle(self, engine):
+        engine._state.get_dedup_keys.side_effect = Exception("database is locked")
+        engine._state.mark_expired_alerts.side_effect = Exception("database is locked")
+
+        result = await engine.check_now()
+
+        assert result["new_alerts"] == 1
+        assert [e.split(":")[0] for e in result["errors"]] == ["dedup_keys", "mark_expired"]
+        engine._state.expire_trials.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_trials_not_claimed_when_cycle_fails(self, engine, monkeypatch):
+        async def fail(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(engine, "_process_trials", fail)
+
+        await engine.check_now()
+
+        engine._state.expire_trials.assert_not_awaited()
+
+
+class TestNowcastDetailBatch:
+    """Test concurrent detail fetching on the HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_details_bounded_and_ordered(self):
+        """Fetches run concurrently up to the cap; results keep input order."""
+        client = HttpBMKGClient("http://bmkg.test")
+        in_flight = 0
+        peak = 0
+
+        async def fake_detail(code):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if code == "bad":
+                raise RuntimeError("boom")
+            return code
+
+        client.get_nowcast_detail = fake_detail
+        codes = [f"c{i}" for i in range(20)] + ["bad"]
+        results = await client.get_nowcast_details(codes)
+        await client.close()
+
+        assert results[:20] == codes[:20]
+        assert isinstance(results[20], RuntimeError)
+        assert peak == settings.max_concurrent_details
+
+    @pytest.mark.asyncio
+    async def test_cancel_cancels_outstanding_fetches(self):
+        client = HttpBMKGClient("http://bmkg.test")
+        started = asyncio.Event()
+        cancelled = 0
+
+        async def slow_detail(code):
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+
+        client.get_nowcast_detail = slow_detail
+        batch = asyncio.create_task(client.get_nowcast_details(["a", "b", "c"]))
+        await started.wait()
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+        await client.close()
+
+        assert cancelled == 3
+
+
+class TestTrialMatching:
+    """Test trial subscriber matching within a poll cycle."""
+
+    @staticmethod
+    def _warning(description: str, areas: list[str], severity: str = "Moderate"):
+        now = datetime.now(timezone.utc)
+        return WarningInfo(
+            identifier="w", event="Hujan Lebat", severity=severity,
+            urgency="Immediate", certainty="Observed", effective=now,
+            expires=now, headline="", description=description, sender="BMKG",
+            areas=[Area(name=a) for a in areas], is_expired=False,
+        )
+
+    @staticmethod
+    def _trial(chat_id: str, sub: str, dist: str, threshold: str = "all") -> dict:
+        return {
+            "telegram_chat_id": chat_id,
+            "subdistrict_name": sub,
+            "district_name": dist,
+            "severity_threshold": threshold,
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_automaton", [True, False], ids=["automaton", "fallback"])
+    async def test_matches_by_subdistrict_district_and_severity(
+        self, monkeypatch, use_automaton
+    ):
+        if use_automaton and not matcher.AHOCORASICK_AVAILABLE:
+            pytest.skip("pyahocorasick not installed")
+        monkeypatch.setattr(matcher, "AHOCORASICK_AVAILABLE", use_automaton)
+        monkeypatch.setattr(settings, "telegram_bot_token", "token")
+        sent: list[str] = []
+
+        async def fake_send_raw(self, bot_token, chat_id, message):
+            sent.append(chat_id)
+            return True
+
+        monkeypatch.setattr(
+            "app.engine.worker.TelegramSender.send_raw", fake_send_raw
+        )
+        trials = [
+            self._trial("1", "Alian", "Kebumen"),
+            self._trial("2", "Gombong", "Bantul"),
+            self._trial("3", "Sempor", "Cilacap"),
+            self._trial("4", "Alian", "Kebumen", threshold="severe"),
+        ]
+        engine = AlertEngine(bmkg_client=AsyncMock(), state=AsyncMock(), notification_dispatcher=None)
+        detail = SimpleNamespace(
+            warnings=[self._warning("Kec. Alian, Kec. Karanganyar", ["Kab. Bantul"])]
+        )
+
+        count = await engine._process_trials(
+            {"A": detail, "B": RuntimeError("fetch failed")}, trials
+        )
+
+        assert count == 2
+        assert sent == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_skips_indexing_when_no_trial_can_match(self, monkeypatch):
+        """Thresholds above every warning's severity short-circuit the pass."""
+        monkeypatch.setattr(settings, "telegram_bot_token", "token")
+
+        def fail_build(trials):
+            raise AssertionError("index should not be built")
+
+        monkeypatch.setattr(worker._TrialIndex, "build", fail_build)
+        engine = AlertEngine(bmkg_client=AsyncMock(), state=AsyncMock(), notification_dispatcher=None)
+        detail = SimpleNamespace(warnings=[self._warning("Kec. Alian", [])])
+
+        count = await engine._process_trials(
+            {"A": detail}, [self._trial("1", "Alian", "Kebumen", threshold="severe")]
+        )
+
+        assert count == 0
+
+    @pytest.mark.asyncio
+    async def test_telegram_batch_bounded(self, monkeypatch):
+        """Sends run concurrently up to the cap; failures come back in place."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_send_raw(self, bot_token, chat_id, message):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if chat_id == "bad":
+                raise RuntimeError("boom")
+            return True
+
+        monkeypatch.setattr(
+            "app.engine.worker.TelegramSender.send_raw", fake_send_raw
+        )
+        sends = [(str(i), "msg") for i in range(30)] + [("bad", "msg")]
+        results = await worker._send_telegram_batch("token", sends)
+
+        assert results[:30] == [True] * 30
+        assert isinstance(results[30], RuntimeError)
+        assert peak == worker._TELEGRAM_CONCURRENCY
+
+
+class TestPollInterval:
+    """Test caching of the poll_interval config value."""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self):
+        state = AsyncMock()
+        state.get_config_value.return_value = "120"
+        engine = AlertEngine(bmkg_client=AsyncMock(), state=state, notification_dispatcher=None)
+
+        assert await engine._get_poll_interval() == 120
+        state.get_config_value.return_value = "60"
+        assert await engine._get_poll_interval() == 120
+        assert state.get_config_value.await_count == 1
+
+        engine.invalidate_poll_interval()
+        assert await engine._get_poll_interval() == 60
+
+    @pytest.mark.asyncio
+    async def test_read_error_keeps_last_value(self):
+        state = AsyncMock()
+        state.get_config_value.return_value = "120"
+        engine = AlertEngine(bmkg_client=AsyncMock(), state=state, notification_dispatcher=None)
+        assert await engine._get_poll_interval() == 120
+
+        engine.invalidate_poll_interval()
+        state.get_config_value.side_effect = RuntimeError("db locked")
+        assert await engine._get_poll_interval() == 120
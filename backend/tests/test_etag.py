@@ -0,0 +1,26 @@
+"""Tests for the shared ETag helpers."""
+
+import pytest
+
+from app.etag import body_etag, etag_matches
+
+
+class TestEtagMatches:
+    """If-None-Match uses weak comparison over a comma-separated list."""
+
+    @pytest.mark.parametrize("header, matches", [
+        (None, False),
+        ("", False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+    ])
+    def test_matches(self, header, matches):
+        assert etag_matches(header, '"abc"') is matches
+
+    def test_body_etag_is_stable_and_quoted(self):
+        etag = body_etag(b"{}")
+        assert etag == body_etag(b"{}") != body_etag(b"[]")
+        assert etag.startswith('"') and etag.endswith('"')
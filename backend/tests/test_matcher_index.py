@@ -0,0 +1,155 @@
+"""Tests for the Aho–Corasick matcher index."""
+
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.engine import matcher
+from app.engine.matcher import MatcherIndex, get_matcher_index, match_locations
+from app.models import Area, Location, WarningInfo
+
+
+def _location(id: int, subdistrict: str, district: str, enabled: bool = True) -> Location:
+    return Location(
+        id=id,
+        district_name=district,
+        subdistrict_name=subdistrict,
+        enabled=enabled,
+    )
+
+
+def _warning(description: str, area_names: list[str]) -> WarningInfo:
+    now = datetime.now(timezone.utc)
+    return WarningInfo(
+        identifier="test",
+        event="Hujan Lebat",
+        severity="Moderate",
+        urgency="Immediate",
+        certainty="Observed",
+        effective=now,
+        expires=now,
+        headline="",
+        description=description,
+        sender="BMKG",
+        areas=[Area(name=name) for name in area_names],
+        is_expired=False,
+    )
+
+
+LOCATIONS = [
+    _location(1, "Alian", "Kebumen"),
+    _location(2, "Sempor", "Kebumen"),
+    _location(3, "Bantul", "Bantul"),
+    _location(4, "Alian", "Kebumen", enabled=False),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["automaton", "fallback"])
+def ahocorasick_mode(request, monkeypatch):
+    if request.param and not matcher.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(matcher, "AHOCORASICK_AVAILABLE", request.param)
+    monkeypatch.setattr(matcher, "_cached_index", None)
+
+
+class TestMatcherIndex:
+    """Automaton and fallback paths give identical results."""
+
+    def test_kecamatan_and_kabupaten(self, ahocorasick_mode):
+        warning = _warning("Hujan di Kec. Alian, Kec. Gombong", ["Kab. Bantul"])
+        results = match_locations(warning, LOCATIONS)
+        assert [(r.location.id, r.match_type) for r in results] == [
+            (1, "kecamatan"),
+            (3, "kabupaten"),
+        ]
+
+    def test_no_match(self, ahocorasick_mode):
+        warning = _warning("Hujan di Kec. Gombong", ["Kab. Cilacap"])
+        assert match_locations(warning, LOCATIONS) == []
+
+    def test_district_does_not_span_areas(self, ahocorasick_mode):
+        locations = [_location(1, "", "Ban Tul")]
+        warning = _warning("", ["Kab. Ban", "Tul"])
+        assert match_locations(warning, locations) == []
+
+    def test_overlapping_names(self, ahocorasick_mode):
+        """Names that prefix or contain each other all match, as with ``in``."""
+        locations = [
+            _location(1, "Ali", "X"),
+            _location(2, "Alian", "X"),
+            _location(3, "Lian", "X"),
+            _location(4, "Anta", "X"),
+        ]
+        warning = _warning("Kec. Aliant", ["Kab. Y"])
+        assert [r.location.id for r in match_locations(warning, locations)] == [1, 2, 3]
+
+
+class TestIndexCache:
+    """The index is rebuilt only when the location set changes."""
+
+    def test_reused_for_same_locations(self, monkeypatch):
+        monkeypatch.setattr(matcher, "_cached_index", None)
+        first = get_matcher_index(LOCATIONS)
+        assert get_matcher_index(list(LOCATIONS)) is first
+
+    def test_rebuilt_on_change(self, monkeypatch):
+        monkeypatch.setattr(matcher, "_cached_index", None)
+        first = get_matcher_index(LOCATIONS)
+        changed = LOCATIONS[:-1] + [_location(4, "Alian", "Kebumen", enabled=True)]
+        second = get_matcher_index(changed)
+        assert second is not first
+        assert isinstance(second, MatcherIndex)
+
+    def test_reused_index_returns_current_locations(self, monkeypatch):
+        monkeypatch.setattr(matcher, "_cached_index", None)
+        warning = _warning("Hujan di Kec. Alian", ["Kab. Kebumen"])
+        before = [_location(1, "Alian", "Kebumen").model_copy(update={"label": "Rumah"})]
+        match_locations(warning, before)
+
+        after = [before[0].model_copy(update={"label": "Kantor"})]
+        (result,) = match_locations(warning, after)
+        assert result.location.label == "Kantor"
+
+
+class TestLoweredFields:
+    """Lowercased copies are computed once per model and never serialized."""
+
+    def test_warning_lowered_once(self):
+        warning = _warning("Kec. ALIAN", ["Kab. KEBUMEN", "Kab. Bantul"])
+        assert warning.description_lower == "kec. alian"
+        assert warning.area_names_lower == ("kab. kebumen", "kab. bantul")
+        assert warning.description_lower is warning.description_lower
+        assert warning.area_names_lower is warning.area_names_lower
+        assert "description_lower" not in warning.model_dump()
+
+    def test_warning_severity_rank(self):
+        warning = _warning("", [])
+        assert warning.severity_rank == 1
+        assert "severity_rank" not in warning.model_dump()
+        for severity, rank in [("Extreme", 3), ("Minor", 0), ("Unknown", 0)]:
+            data = {**warning.model_dump(), "severity": severity}
+            assert WarningInfo(**data).severity_rank == rank
+
+    def test_warning_summaries(self):
+        warning = _warning("x" * 600, [])
+        assert warning.summary_short == "x" * 297 + "..."
+        assert warning.summary_long == "x" * 497 + "..."
+        assert warning.summary_long is warning.summary_long
+        assert "summary_short" not in warning.model_dump()
+
+        short = _warning("Kec. Alian", [])
+        assert short.summary_short == short.summary_long == "Kec. Alian"
+
+    def test_location_lowered_once(self):
+        location = _location(1, "ALIAN", "KEBUMEN")
+        assert location.subdistrict_name_lower == "alian"
+        assert location.district_name_lower is location.district_name_lower
+        assert "district_name_lower" not in location.model_dump()
+
+    def test_location_frozen(self):
+        location = _location(1, "ALIAN", "KEBUMEN")
+        assert location.subdistrict_name_lower == "alian"
+        with pytest.raises(ValidationError):
+            location.subdistrict_name = "Sempor"
+        assert location.subdistrict_name_lower == "alian"
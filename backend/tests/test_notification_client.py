@@ -0,0 +1,220 @@
+"""Tests for the shared notification HTTP client."""
+
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+import pytest
+
+from app.notifications import client as notification_client
+from app.notifications.discord import DiscordSender
+from app.notifications.telegram import TelegramSender, _is_ok
+from app.notifications.slack import SlackSender
+from app.notifications.webhook import WebhookSender
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Route the shared client through a mock transport and record requests."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="ok")
+
+    mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(notification_client, "_client", mock)
+    monkeypatch.setattr(notification_client, "_breakers", {})
+    return requests
+
+
+class TestSharedClient:
+    """Senders post through one client with orjson-encoded bodies."""
+
+    @pytest.mark.asyncio
+    async def test_senders_share_client(self, captured):
+        shared = notification_client.get_notification_client()
+
+        assert await SlackSender().send_raw("https://hooks.test/a", "Hujan ☔")
+        assert await WebhookSender().send_raw("https://hooks.test/b", {"n": 1})
+
+        assert notification_client.get_notification_client() is shared
+        assert [str(r.url) for r in captured] == [
+            "https://hooks.test/a",
+            "https://hooks.test/b",
+        ]
+        assert orjson.loads(captured[0].content) == {"text": "Hujan ☔"}
+        assert captured[0].headers["content-type"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_webhook_encodes_datetimes_and_keeps_custom_headers(self, captured):
+        when = datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc)
+
+        ok = await WebhookSender().send_raw(
+            "https://hooks.test/c", {"effective": when}, {"X-Token": "t"}
+        )
+
+        assert ok
+        assert orjson.loads(captured[0].content) == {
+            "effective": "2026-02-17T12:00:00+00:00"
+        }
+        assert captured[0].headers["x-token"] == "t"
+
+    @pytest.mark.asyncio
+    async def test_close_resets_client(self, captured):
+        first = notification_client.get_notification_client()
+        await notification_client.close_notification_client()
+        assert first.is_closed
+        assert notification_client._client is None
+
+
+def _scripted(monkeypatch, script):
+    """Serve responses (or raise exceptions) from ``script`` in order."""
+    calls: list[httpx.Request] = []
+    delays: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        step = script[len(calls) - 1]
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(notification_client, "_client", mock)
+    monkeypatch.setattr(notification_client.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(notification_client, "_breakers", {})
+    return calls, delays
+
+
+class TestRetry:
+    """Transient failures are retried with backoff; permanent ones are not."""
+
+    @pytest.mark.asyncio
+    async def test_retries_5xx_and_transport_errors(self, monkeypatch):
+        calls, delays = _scripted(monkeypatch, [
+            httpx.Response(503),
+            httpx.ConnectError("refused"),
+            httpx.Response(200),
+        ])
+
+        assert await WebhookSender().send_raw("https://hooks.test/r", {"n": 1})
+        assert len(calls) == 3
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_honours_telegram_retry_after(self, monkeypatch):
+        calls, delays = _scripted(monkeypatch, [
+            httpx.Response(429, json={"ok": False, "parameters": {"retry_after": 3}}),
+            httpx.Response(200, json={"ok": True}),
+        ])
+
+        assert await TelegramSender().send_raw("token", "1", "hi")
+        assert delays == [3.0]
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_not_waited(self, monkeypatch):
+        calls, delays = _scripted(monkeypatch, [
+            httpx.Response(429, headers={"Retry-After": "120"}),
+        ])
+
+        assert not await WebhookSender().send_raw("https://hooks.test/r", {})
+        assert len(calls) == 1
+        assert delays == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [400, 401, 403, 404])
+    async def test_client_errors_not_retried(self, monkeypatch, status):
+        calls, delays = _scripted(monkeypatch, [httpx.Response(status)])
+
+        assert not await WebhookSender().send_raw("https://hooks.test/r", {})
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, monkeypatch):
+        calls, delays = _scripted(monkeypatch, [httpx.Response(502)] * 3)
+
+        assert not await WebhookSender().send_raw("https://hooks.test/r", {})
+        assert len(calls) == notification_client._MAX_ATTEMPTS
+
+
+class TestCircuitBreaker:
+    """A failing host is cut off after repeated failures, then probed."""
+
+    @pytest.mark.asyncio
+    async def test_opens_then_probes(self, monkeypatch):
+        threshold = notification_client._BREAKER_THRESHOLD
+        cooldown = notification_client._BREAKER_COOLDOWN
+        calls, _ = _scripted(
+            monkeypatch,
+            [httpx.Response(500)] * threshold
+            + [httpx.Response(204), httpx.Response(500), httpx.Response(200)],
+        )
+        clock = [1000.0]
+        monkeypatch.setattr(notification_client.time, "monotonic", lambda: clock[0])
+        sender = WebhookSender()
+
+        for _ in range(threshold):
+            assert not await sender.send_raw("https://down.test/a", {})
+        with pytest.raises(notification_client.CircuitOpenError):
+            await notification_client.post_with_retry("https://down.test/b")
+        assert len(calls) == threshold
+
+        # Other hosts are unaffected
+        assert await sender.send_raw("https://up.test/", {})
+
+        # Half-open: a failed probe re-opens for another cooldown
+        clock[0] += cooldown
+        assert not await sender.send_raw("https://down.test/a", {})
+        assert not await sender.send_raw("https://down.test/a", {})
+        assert len(calls) == threshold + 2
+
+        # A successful probe closes the circuit
+        clock[0] += cooldown
+        assert await sender.send_raw("https://down.test/a", {})
+        assert notification_client._breakers["down.test"].failures == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sender", [DiscordSender(), SlackSender()], ids=["discord", "slack"])
+    async def test_chat_webhooks_share_breaker(self, monkeypatch, sender):
+        threshold = notification_client._BREAKER_THRESHOLD
+        calls, _ = _scripted(monkeypatch, [httpx.Response(500)] * threshold)
+        for _ in range(threshold):
+            assert not await WebhookSender().send_raw("https://down.test/a", {})
+
+        assert not await sender.send_raw("https://down.test/hook", "hi")
+        assert len(calls) == threshold
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_count(self, monkeypatch):
+        threshold = notification_client._BREAKER_THRESHOLD
+        calls, _ = _scripted(monkeypatch, [httpx.Response(401)] * (threshold + 1))
+
+        for _ in range(threshold + 1):
+            assert not await TelegramSender().send_raw("bad", "1", "hi")
+        assert len(calls) == threshold + 1
+
+
+class TestTelegramOk:
+    """Bot API success is read from the body prefix when possible."""
+
+    @pytest.mark.parametrize("body, ok", [
+        (b'{"ok":true,"result":{"message_id":1}}', True),
+        (b'{ "ok": true }', True),
+        (b'{"result":{},"ok":true}', True),
+        (b'{"ok":false,"description":"Bad Request"}', False),
+        (b'<html>bad gateway</html>', False),
+        (b'[true]', False),
+    ])
+    def test_is_ok(self, body, ok):
+        assert _is_ok(body) is ok
+
+    @pytest.mark.asyncio
+    async def test_non_json_200_is_failure(self, monkeypatch):
+        _scripted(monkeypatch, [httpx.Response(200, text="<html></html>")])
+
+        assert not await TelegramSender().send_raw("token", "1", "hi")
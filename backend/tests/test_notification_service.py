@@ -0,0 +1,250 @@
+"""Tests for the BMKG API notification service and its providers."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+import pytest
+
+from app.config import settings
+from app.models.earthquake import Earthquake
+from app.notifications import client as notification_client
+from app.notifications import email as email_module
+from app.services import notification_service as service_module
+from app.services.notifications.base import NotificationMessage, RenderedMessage
+from app.services.notifications.discord import DiscordProvider
+from app.services.notifications.email import EmailProvider
+from app.services.notifications.slack import SlackProvider
+from app.services.notifications.webhook import WebhookProvider
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    """Route the shared notification client through a mock transport."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(notification_client, "_client", mock)
+    monkeypatch.setattr(notification_client, "_breakers", {})
+    return requests
+
+
+def _message(severity: str = "High") -> NotificationMessage:
+    return NotificationMessage(
+        title="Hujan Lebat - Jawa Barat",
+        body="Waspada hujan lebat disertai petir.",
+        severity=severity,
+        timestamp=datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc),
+        url="https://bmkg-alert.com",
+    )
+
+
+class TestProviders:
+    """Providers post through the shared notification client."""
+
+    @pytest.mark.asyncio
+    async def test_webhook_providers_share_client(self, posted, monkeypatch):
+        monkeypatch.setattr(settings, "discord_webhook_url", "https://hooks.test/discord")
+        monkeypatch.setattr(settings, "slack_webhook_url", "https://hooks.test/slack")
+        monkeypatch.setattr(settings, "generic_webhook_url", "https://hooks.test/generic")
+
+        rendered = RenderedMessage.from_message(_message())
+        for provider in (DiscordProvider(), SlackProvider(), WebhookProvider()):
+            assert await provider.send(rendered)
+
+        assert [r.url.path for r in posted] == ["/discord", "/slack", "/generic"]
+        assert orjson.loads(posted[0].content)["embeds"][0]["color"] == 0xE67E22
+        assert orjson.loads(posted[1].content)["attachments"][0]["color"] == "#danger"
+        assert orjson.loads(posted[2].content)["title"] == "Hujan Lebat - Jawa Barat"
+        assert all(r.headers["content-type"] == "application/json" for r in posted)
+
+    def test_render_colors_by_severity(self):
+        rendered = RenderedMessage.from_message(_message("Info"))
+        assert (rendered.color_discord, rendered.color_slack) == (0x3498DB, "#36a64f")
+        assert rendered.iso_ts == "2026-02-17T12:00:00+00:00"
+        assert orjson.loads(rendered.json_body)["severity"] == "Info"
+
+    @pytest.mark.asyncio
+    async def test_failed_post_logged_with_traceback(self, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "generic_webhook_url", "https://hooks.test/generic")
+        monkeypatch.setattr(notification_client, "_breakers", {})
+        mock = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(400)))
+        monkeypatch.setattr(notification_client, "_client", mock)
+
+        assert not await WebhookProvider().send(RenderedMessage.from_message(_message()))
+        (record,) = [r for r in caplog.records if r.name.endswith("notifications.webhook")]
+        assert record.getMessage() == "Failed to send webhook notification"
+        assert record.exc_info is not None
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_provider_does_not_post(self, posted, monkeypatch):
+        monkeypatch.setattr(settings, "slack_webhook_url", None)
+
+        assert not await SlackProvider().send(RenderedMessage.from_message(_message()))
+        assert posted == []
+
+
+def _earthquake() -> Earthquake:
+    return Earthquake(
+        occurred_at=datetime(2026, 2, 16, 6, 15, 30),
+        magnitude=5.4,
+        depth_km=10.0,
+        lat=-6.89,
+        lon=109.67,
+        lat_text="6.89 LS",
+        lon_text="109.67 BT",
+        region="Test Region",
+        tsunami_potential=None,
+        felt_report=None,
+        shakemap_url=None,
+    )
+
+
+class _Recording:
+    name = "recording"
+    enabled = True
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[NotificationMessage] = []
+
+    async def send(self, message):
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+        return True
+
+
+class TestDispatch:
+    """Dispatch fans out to providers within a bounded time."""
+
+    def test_one_provider_per_channel(self, monkeypatch):
+        monkeypatch.setattr(settings, "discord_webhook_url", "https://hooks.test/discord")
+        monkeypatch.setattr(settings, "slack_webhook_url", "https://hooks.test/slack")
+        monkeypatch.setattr(settings, "generic_webhook_url", "https://hooks.test/generic")
+        names = [p.name for p in service_module.NotificationService().providers]
+        assert len(names) >= 3
+        assert len(names) == len(set(names))
+
+    def test_only_enabled_providers_kept(self, monkeypatch):
+        monkeypatch.setattr(settings, "discord_webhook_url", None)
+        monkeypatch.setattr(settings, "slack_webhook_url", "https://hooks.test/slack")
+        monkeypatch.setattr(settings, "generic_webhook_url", None)
+        monkeypatch.setattr(settings, "smtp_host", None)
+        monkeypatch.setattr(settings, "telegram_bot_token", None)
+
+        providers = service_module.NotificationService().providers
+        assert [type(p) for p in providers] == [SlackProvider]
+
+    @pytest.mark.asyncio
+    async def test_hung_provider_bounded(self, monkeypatch):
+        monkeypatch.setattr(service_module, "DISPATCH_TIMEOUT", 0.05)
+        service = service_module.NotificationService()
+        fast, hung = _Recording(), _Recording(delay=60)
+        service.providers = [fast, hung]
+
+        await asyncio.wait_for(service.dispatch(_earthquake()), 1)
+
+        assert [m.severity for m in fast.sent] == ["High"]
+        assert hung.sent == []
+
+    @pytest.mark.asyncio
+    async def test_failing_provider_logged_others_sent(self, caplog):
+        service = service_module.NotificationService()
+        broken, ok = _Recording(), _Recording()
+        broken.name = "broken"
+
+        async def fail(message):
+            raise RuntimeError("boom")
+
+        broken.send = fail
+        service.providers = [broken, ok]
+
+        with caplog.at_level("INFO", logger=service_module.__name__):
+            await service.dispatch(_earthquake())
+
+        assert len(ok.sent) == 1
+        assert "broken notification failed: RuntimeError('boom')" in caplog.text
+        assert "recording notification sent" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_disabled_providers_skipped(self):
+        service = service_module.NotificationService()
+        on, off = _Recording(), _Recording()
+        off.enabled = False
+        service.providers = [on, off]
+
+        await service.dispatch(_earthquake())
+
+        assert len(on.sent) == 1
+        assert off.sent == []
+
+    @pytest.mark.asyncio
+    async def test_no_enabled_provider_builds_nothing(self, monkeypatch):
+        service = service_module.NotificationService()
+        off = _Recording()
+        off.enabled = False
+        service.providers = [off]
+
+        def unexpected(alert):
+            raise AssertionError("message built with no provider enabled")
+
+        monkeypatch.setattr(service, "_create_message_from_earthquake", unexpected)
+        await service.dispatch(_earthquake())
+
+
+class TestThrottle:
+    """Providers stay within their destination's published rate limit."""
+
+    @pytest.mark.asyncio
+    async def test_sends_beyond_limit_wait_for_window(self, monkeypatch):
+        monkeypatch.setattr(settings, "slack_webhook_url", "https://hooks.test/slack")
+        provider = SlackProvider()
+        provider.rate_limit, provider.rate_period = 2, 0.05
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(3):
+            await provider.throttle()
+        assert loop.time() - started >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_post_retried_after_reset(self, monkeypatch):
+        monkeypatch.setattr(settings, "discord_webhook_url", "https://hooks.test/discord")
+        monkeypatch.setattr(notification_client, "_breakers", {})
+        responses = [
+            httpx.Response(429, headers={"X-RateLimit-Reset-After": "0.01"}),
+            httpx.Response(204),
+        ]
+        mock = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: responses.pop(0)))
+        monkeypatch.setattr(notification_client, "_client", mock)
+
+        assert await DiscordProvider().send(RenderedMessage.from_message(_message()))
+        assert responses == []
+
+
+class TestEmail:
+    """The email provider reuses the pooled SMTP session."""
+
+    @pytest.mark.asyncio
+    async def test_sends_share_one_session(self, monkeypatch):
+        from tests.test_email import FakeSMTP
+
+        FakeSMTP.instances = []
+        monkeypatch.setattr(email_module.aiosmtplib, "SMTP", FakeSMTP)
+        monkeypatch.setattr(email_module, "_connections", {})
+        monkeypatch.setattr(email_module, "_locks", {})
+        monkeypatch.setattr(settings, "smtp_host", "smtp.test")
+        monkeypatch.setattr(settings, "smtp_user", "ops@bmkg-alert.test")
+        provider = EmailProvider()
+
+        for severity in ("High", "Low"):
+            assert await provider.send(RenderedMessage.from_message(_message(severity)))
+
+        (session,) = FakeSMTP.instances
+        assert session.sent == ["[High] Hujan Lebat - Jawa Barat", "[Low] Hujan Lebat - Jawa Barat"]
+        await email_module.close_smtp_connections()
@@ -225,3 +225,115 @@ class TestModelSerialization:
         assert data["identifier"] == "TEST-001"
         assert data["severity"] == "Moderate"
         assert data["is_expired"] is False
+
+
+class TestRenderedBodies:
+    """Nowcast bodies are serialized once per cache lifetime."""
+
+    @pytest.mark.asyncio
+    async def test_memoized_until_expiry(self):
+        from app.services.nowcast_service import NowcastService
+
+        service = NowcastService()
+        builds = []
+
+        async def build():
+            builds.append(1)
+            return {"data": [1], "meta": {"fetched_at": len(builds)}}, False, 60
+
+        first, from_cache, _ = await service.get_rendered(("active", "id"), build)
+        again, from_cache_again, ttl = await service.get_rendered(("active", "id"), build)
+
+        assert len(builds) == 1
+        assert again is first
+        assert (from_cache, from_cache_again) == (False, True)
+        assert 0 < ttl <= 60
+        assert first.body == b'{"data":[1],"meta":{"fetched_at":1}}'
+        assert first.etag.startswith('"') and len(first.etag) == 34
+
+        await service.clear_simulations()
+        rebuilt, _, _ = await service.get_rendered(("active", "id"), build)
+        assert len(builds) == 2
+        assert rebuilt.etag != first.etag
+
+    @pytest.mark.asyncio
+    async def test_missing_payload_not_memoized(self):
+        from app.services.nowcast_service import NowcastService
+
+        service = NowcastService()
+
+        async def build():
+            return None, False, 60
+
+        assert (await service.get_rendered(("detail", "X", "id"), build))[0] is None
+        assert service._rendered == {}
+
+    @pytest.mark.asyncio
+    async def test_route_returns_304_for_matching_etag(self, monkeypatch):
+        import httpx
+        from fastapi import FastAPI
+
+        from app.dependencies import limiter
+        from app.routers import nowcast
+        from app.services.nowcast_service import NowcastService
+
+        service = NowcastService()
+        calls = []
+
+        async def get_active_provinces(lang):
+            calls.append(lang)
+            return [ActiveProvince(
+                code="CBT20260216004",
+                province="Banten",
+                description="Hujan lebat",
+                published_at=datetime(2026, 2, 16, 13, 0, tzinfo=timezone.utc),
+                detail_url="/v1/nowcast/CBT20260216004",
+            )], False, 120
+
+        monkeypatch.setattr(service, "get_active_provinces", get_active_provinces)
+        monkeypatch.setattr(nowcast, "nowcast_service", service)
+        app = FastAPI()
+        app.state.limiter = limiter
+        app.include_router(nowcast.router)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            first = await c.get("/v1/nowcast")
+            etag = first.headers["etag"]
+            cached = await c.get("/v1/nowcast", headers={"If-None-Match": etag})
+            stale = await c.get("/v1/nowcast", headers={"If-None-Match": '"other"'})
+
+        assert calls == ["id"]
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+        assert first.headers["cache-control"] == "public, max-age=120"
+        assert first.headers["x-cache"] == "MISS"
+        assert first.json()["data"][0]["province"] == "Banten"
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["x-cache"] == "HIT"
+        assert stale.status_code == 200
+        assert stale.content == first.content
+
+    @pytest.mark.asyncio
+    async def test_fetched_at_stamped_once_per_fetch(self, monkeypatch, load_fixture):
+        from app.cache import InMemoryCache
+        from app.services import nowcast_service as module
+
+        fetches = []
+
+        async def fetch_rss(language):
+            fetches.append(language)
+            return load_fixture("rss_active.xml")
+
+        monkeypatch.setattr(module, "cache", InMemoryCache())
+        service = module.NowcastService()
+        monkeypatch.setattr(service, "_fetch_rss_feed", fetch_rss)
+
+        await service.get_active_provinces("id")
+        stamp = await service.rss_fetched_at("id")
+        await service.get_active_provinces("id")
+
+        assert fetches == ["id"]
+        assert await service.rss_fetched_at("id") == stamp
+        assert stamp.endswith("Z") and len(stamp) == 20
+        datetime.fromisoformat(stamp.removesuffix("Z"))
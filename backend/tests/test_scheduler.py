@@ -0,0 +1,133 @@
+"""Tests for the BMKG API background scheduler."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.cache import Cache, InMemoryCache
+from app.models.earthquake import Earthquake
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import SchedulerService
+
+
+def _earthquake(magnitude: float) -> Earthquake:
+    return Earthquake(
+        occurred_at=datetime(2026, 2, 16, 6, 15, 30),
+        magnitude=magnitude,
+        depth_km=10.0,
+        lat=-6.89,
+        lon=109.67,
+        lat_text="6.89 LS",
+        lon_text="109.67 BT",
+        region="Test Region",
+        tsunami_potential=None,
+        felt_report=None,
+        shakemap_url=None,
+    )
+
+
+def _fallback_connect(cache: Cache):
+    async def connect():
+        cache._use_fallback = True
+        cache._fallback = InMemoryCache()
+
+    return connect
+
+
+def _recorder(dispatched: list):
+    async def dispatch(alert):
+        dispatched.append(alert)
+
+    return dispatch
+
+
+class TestPollInterval:
+    """The poll interval backs off on failure and recovers gradually."""
+
+    def test_failures_double_up_to_cap(self):
+        service = SchedulerService()
+        for _ in range(3):
+            service._record_poll(False)
+        assert service._interval == scheduler_module.POLL_INTERVAL * 8
+
+        for _ in range(10):
+            service._record_poll(False)
+        assert service._interval == scheduler_module.MAX_POLL_INTERVAL
+
+    def test_successes_step_back_to_base(self):
+        service = SchedulerService()
+        service._record_poll(False)
+        service._record_poll(True)
+        assert service._interval == 2 * scheduler_module.POLL_INTERVAL - scheduler_module.POLL_INTERVAL_STEP
+
+        for _ in range(50):
+            service._record_poll(True)
+        assert service._interval == scheduler_module.POLL_INTERVAL
+
+
+class TestLatestCheck:
+    """An unchanged latest earthquake is recognised without the shared cache."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_id_skips_cache(self, monkeypatch):
+        eq = _earthquake(5.1)
+        claims = []
+
+        async def get_latest():
+            return eq, None, None
+
+        async def set_nx(key, value, ttl):
+            claims.append(key)
+            return True
+
+        monkeypatch.setattr(scheduler_module.earthquake_service, "get_latest", get_latest)
+        monkeypatch.setattr(scheduler_module.cache, "set_nx", set_nx)
+        dispatched = []
+        service = SchedulerService()
+        monkeypatch.setattr(scheduler_module.notification_service, "dispatch", _recorder(dispatched))
+
+        for _ in range(3):
+            await service._check_latest_earthquake()
+
+        assert claims == ["scheduler:seen:2026-02-16T06:15:30"]
+        assert dispatched == [eq]
+
+    @pytest.mark.asyncio
+    async def test_only_one_replica_claims_event(self, monkeypatch):
+        eq = _earthquake(5.1)
+
+        async def get_latest():
+            return eq, None, None
+
+        monkeypatch.setattr(scheduler_module.earthquake_service, "get_latest", get_latest)
+        monkeypatch.setattr(scheduler_module, "cache", Cache())
+        monkeypatch.setattr(scheduler_module.cache, "connect", _fallback_connect(scheduler_module.cache))
+        dispatched = []
+        replicas = [SchedulerService(), SchedulerService()]
+        monkeypatch.setattr(scheduler_module.notification_service, "dispatch", _recorder(dispatched))
+
+        await asyncio.gather(*(r._check_latest_earthquake() for r in replicas))
+        assert dispatched == [eq]
+
+
+class TestLifecycle:
+    """start() and stop() bound the poller's lifetime."""
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_sleeping_poller(self, monkeypatch):
+        polls = []
+
+        async def check():
+            polls.append(1)
+
+        service = SchedulerService()
+        monkeypatch.setattr(service, "_check_latest_earthquake", check)
+        await service.start()
+        await asyncio.sleep(0)
+        (task,) = service.jobs
+
+        await asyncio.wait_for(service.stop(), 1)
+        assert polls == [1]
+        assert task.cancelled()
+        assert service.jobs == []
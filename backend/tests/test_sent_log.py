@@ -0,0 +1,51 @@
+"""Tests for aggregated notification success logging."""
+
+import asyncio
+
+import pytest
+from structlog.testing import capture_logs
+
+from app.notifications import sent_log
+from app.notifications.sent_log import SentLog
+
+
+class TestSentLog:
+    """Successful sends are summarised once per window."""
+
+    @pytest.mark.asyncio
+    async def test_burst_logged_once(self, monkeypatch):
+        monkeypatch.setattr(sent_log, "_WINDOW", 0.01)
+        log = SentLog("slack_message_sent", "slack_messages_sent")
+
+        with capture_logs() as logs:
+            for _ in range(5):
+                log.record()
+            await asyncio.sleep(0.03)
+
+        summaries = [e for e in logs if e["log_level"] == "info"]
+        assert [e["event"] for e in summaries] == ["slack_messages_sent"]
+        assert summaries[0]["count"] == 5
+        assert sum(e["log_level"] == "debug" for e in logs) == 5
+
+    @pytest.mark.asyncio
+    async def test_flush_is_idempotent(self):
+        log = SentLog("email_sent", "emails_sent")
+
+        with capture_logs() as logs:
+            log.record(to="a@x.test")
+            log.flush()
+            log.flush()
+
+        assert [e["count"] for e in logs if e["log_level"] == "info"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_stale_window_flushed_on_next_record(self, monkeypatch):
+        monkeypatch.setattr(sent_log, "_WINDOW", 0.0)
+        log = SentLog("webhook_sent", "webhooks_sent")
+
+        with capture_logs() as logs:
+            log.record()
+            log.record()
+
+        assert [e["count"] for e in logs if e["log_level"] == "info"] == [1]
+        log.flush()
@@ -0,0 +1,179 @@
+"""Tests for the demo trial routes."""
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.config import settings
+from app.database import DatabaseManager
+from app.notifications import client as notification_client
+from app.routes import trial
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / "test.db"), readers=1)
+    await db.connect()
+    await db.init_schema()
+    app = FastAPI()
+    app.state.db = db
+    app.include_router(trial.router)
+    monkeypatch.setattr(trial, "_bot_info_memo", trial.TTLMemo(ttl=300.0))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c, db
+    await db.close()
+
+
+class TestBotInfo:
+    """getMe is asked once per token and TTL."""
+
+    @pytest.mark.asyncio
+    async def test_bot_info_memoized_per_token(self, client, monkeypatch):
+        c, _ = client
+        calls = []
+
+        async def fetch(bot_token):
+            calls.append(bot_token)
+            return {"available": True, "username": f"bot_{bot_token}", "name": "BMKG"}
+
+        monkeypatch.setattr(trial, "_fetch_bot_info", fetch)
+        monkeypatch.setattr(settings, "telegram_bot_token", "a")
+        assert (await c.get("/trial/bot-info")).json()["username"] == "bot_a"
+        assert (await c.get("/trial/bot-info")).json()["username"] == "bot_a"
+
+        monkeypatch.setattr(settings, "telegram_bot_token", "b")
+        assert (await c.get("/trial/bot-info")).json()["username"] == "bot_b"
+        assert calls == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_failure_not_memoized(self, client, monkeypatch):
+        c, _ = client
+        calls = []
+
+        async def fetch(bot_token):
+            calls.append(bot_token)
+            return None
+
+        monkeypatch.setattr(trial, "_fetch_bot_info", fetch)
+        monkeypatch.setattr(settings, "telegram_bot_token", "a")
+        assert (await c.get("/trial/bot-info")).json() == {"available": False}
+        assert (await c.get("/trial/bot-info")).json() == {"available": False}
+        assert calls == ["a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_get_me_uses_shared_client(self, monkeypatch):
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(
+                200, json={"ok": True, "result": {"username": "bmkg_bot", "first_name": "BMKG"}}
+            )
+
+        mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(notification_client, "_client", mock)
+
+        info = await trial._fetch_bot_info("123:abc")
+        assert info == {"available": True, "username": "bmkg_bot", "name": "BMKG"}
+        assert seen == ["https://api.telegram.org/bot123:abc/getMe"]
+
+
+def _registration(chat_id: str) -> dict:
+    return {
+        "chat_id": chat_id,
+        "location_code": "31.71.01",
+        "location_name": "Gambir",
+        "district_name": "Jakarta Pusat",
+    }
+
+
+class TestRegister:
+    """Registration is guarded per chat and rate-limited per IP."""
+
+    @pytest_asyncio.fixture
+    async def sent(self, monkeypatch):
+        messages = []
+
+        async def send(chat_id, text):
+            messages.append((chat_id, text))
+            return True
+
+        monkeypatch.setattr(trial, "_send_trial_message", send)
+        return messages
+
+    @pytest.mark.asyncio
+    async def test_duplicate_chat_conflicts(self, client, sent):
+        c, _ = client
+        first = await c.post("/trial/register", json=_registration("100"))
+        assert first.status_code == 200
+        assert first.json()["success"] is True
+
+        second = await c.post("/trial/register", json=_registration("100"))
+        assert second.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_ip_rate_limited(self, client, sent):
+        c, _ = client
+        for n in range(trial.MAX_REGISTRATIONS_PER_IP):
+            response = await c.post("/trial/register", json=_registration(str(n)))
+            assert response.status_code == 200
+
+        limited = await c.post("/trial/register", json=_registration("extra"))
+        assert limited.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_messages_and_log_follow_response(self, client, sent):
+        c, db = client
+        registered = (await c.post("/trial/register", json=_registration("100"))).json()
+        row = await db.fetch_one(
+            "SELECT telegram_chat_id FROM trial_subscriptions WHERE id = ?",
+            (registered["id"],),
+        )
+        assert row["telegram_chat_id"] == "100"
+
+        cancelled = await c.delete(f"/trial/{registered['id']}", params={"chat_id": "100"})
+        assert cancelled.json() == {"success": True}
+
+        assert [chat for chat, _ in sent] == ["100", "100"]
+        assert "Aktif" in sent[0][1] and "Dihentikan" in sent[1][1]
+        logged = await db.fetch_all("SELECT event_type FROM activity_log ORDER BY id")
+        assert [r["event_type"] for r in logged] == ["trial_registered", "trial_cancelled"]
+
+    @pytest.mark.asyncio
+    async def test_guard_lookups_use_indexes(self, client):
+        _, db = client
+        plan = await db.fetch_all(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM trial_subscriptions "
+            "WHERE telegram_chat_id = ? AND expires_at > CURRENT_TIMESTAMP",
+            ("1",),
+        )
+        assert "idx_trials_chat_expires" in plan[0]["detail"]
+        plan = await db.fetch_all(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM trial_subscriptions "
+            "WHERE ip_address = ? AND registered_at > datetime('now', '-1 hour')",
+            ("1",),
+        )
+        assert "idx_trials_ip_registered" in plan[0]["detail"]
+
+
+class TestClientIp:
+    """Only a well-formed first X-Forwarded-For entry is trusted."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("203.0.113.7", "203.0.113.7"),
+        (" 203.0.113.7 , 10.0.0.1", "203.0.113.7"),
+        ("2001:db8::1, 10.0.0.1", "2001:db8::1"),
+        ("evil<script>, 10.0.0.1", "127.0.0.9"),
+        ("1" * 10_000, "127.0.0.9"),
+        ("", "127.0.0.9"),
+    ])
+    def test_client_ip(self, header, expected):
+        scope = {
+            "type": "http",
+            "headers": [(b"x-forwarded-for", header.encode())] if header else [],
+            "client": ("127.0.0.9", 1234),
+        }
+        assert trial._client_ip(Request(scope)) == expected
@@ -255,3 +255,44 @@ class TestWilayahAPI:
         data = response.json()
         assert len(data["data"]) == 5
         assert data["meta"]["limit"] == 5
+
+
+class TestWilayahCaching:
+    """Rendered bodies are memoized and revalidated by ETag."""
+
+    def test_provinces_etag_round_trip(self, client):
+        first = client.get("/api/v1/wilayah/provinces")
+        etag = first.headers["etag"]
+
+        again = client.get("/api/v1/wilayah/provinces")
+        revalidated = client.get(
+            "/api/v1/wilayah/provinces", headers={"If-None-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "public, max-age=86400"
+        assert again.content == first.content
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
+    def test_search_memoized_per_query_and_limit(self, client, monkeypatch):
+        from app.cache import TTLMemo
+        from app.routers import wilayah as wilayah_router
+
+        calls = []
+        search = wilayah_router.wilayah_service.search
+
+        def counting_search(query, limit=50):
+            calls.append((query, limit))
+            return search(query, limit=limit)
+
+        monkeypatch.setattr(wilayah_router, "_search_memo", TTLMemo(ttl=600))
+        monkeypatch.setattr(wilayah_router.wilayah_service, "search", counting_search)
+
+        first = client.get("/api/v1/wilayah/search?q=gambir&limit=5")
+        second = client.get("/api/v1/wilayah/search?q=gambir&limit=5")
+        client.get("/api/v1/wilayah/search?q=gambir&limit=6")
+
+        assert first.json()["meta"]["query"] == "gambir"
+        assert second.content == first.content
+        assert calls == [("gambir", 5), ("gambir", 6)]